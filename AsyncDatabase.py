@@ -0,0 +1,70 @@
+# AsyncDatabase.py
+from __future__ import annotations
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from Database import Database
+
+
+class AsyncDatabase:
+    """
+    asyncio counterpart of Database. Every public Database method is available
+    as a coroutine with the same name and arguments, e.g.
+
+        orders = await AsyncDatabase().query_order_history(customer_id)
+
+    Calls run on a private thread pool. In pooled mode (Database.configure_pool)
+    each worker borrows its own connection, so up to max_size calls overlap;
+    with the single shared connection they are serialized but still never block
+    the event loop.
+    """
+
+    # Database members that only make sense synchronously
+    _NOT_OFFLOADED = {"transaction", "connect", "close"}
+
+    def __init__(self, db: Database | None = None, max_workers: int | None = None) -> None:
+        self.db = db or Database()
+        if max_workers is None:
+            pool = Database._pool
+            max_workers = pool.max_size if pool is not None else 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AsyncDatabase")
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run any blocking callable (e.g. a controller method) on the database threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self.db, name)
+        if name.startswith("_") or name in self._NOT_OFFLOADED or not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def offloaded(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        setattr(self, name, offloaded)  # Build each wrapper once
+        return offloaded
+
+    async def close(self) -> None:
+        """Wait for running calls and stop the worker threads."""
+        await asyncio.get_running_loop().run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+# Example: overlap a batch of history lookups
+if __name__ == "__main__":
+    async def main():
+        Database.configure_pool(max_size=8)
+        async with AsyncDatabase() as db:
+            histories = await asyncio.gather(*(db.query_order_history(customer_id) for customer_id in range(1, 21)))
+            print(f"Fetched {sum(len(history or []) for history in histories)} delivered orders for 20 customers")
+
+    asyncio.run(main())
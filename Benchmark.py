@@ -0,0 +1,376 @@
+# Benchmark.py
+from __future__ import annotations
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from Database import Database
+from QueryInstrumentation import QueryInstrumentation, percentile
+from StatisticsRollup import StatisticsRollup
+
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# A scenario regresses when its p95 grows by more than this share over the baseline
+LATENCY_TOLERANCE = 0.25
+
+
+class QueryCounter:
+    """Counts the statements reported by QueryInstrumentation while it is installed."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        QueryInstrumentation.add_listener(self._on_query)
+
+    def uninstall(self) -> None:
+        QueryInstrumentation.remove_listener(self._on_query)
+
+    def _on_query(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self.count += event["statements"]
+
+
+class BenchmarkSuite:
+    """
+    Drives the non-GUI entry points of the controllers against a seeded
+    database (see DatasetGenerator.py) and records latency percentiles and
+    queries per call. Ordering and assignment scenarios write to the
+    database, so run the suite against a disposable copy.
+    """
+
+    def __init__(self, db: Database | None = None, iterations: int = 50, warmup: int = 5,
+                 seed: int = 1) -> None:
+        self.db = db or Database()
+        self.iterations = iterations
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.counter = QueryCounter()
+
+    # ----------  RUN  ----------
+    def run(self, only: List[str] | None = None) -> Dict[str, Dict[str, float]]:
+        """Runs every scenario (or those named in `only`); returns {name: metrics}."""
+        scenarios = self.scenarios()
+        results = {}
+        self.counter.install()
+        try:
+            for name, call in scenarios.items():
+                if only and name not in only:
+                    continue
+                results[name] = self.measure(call)
+                print(f"{name}: p50={results[name]['p50_ms']:.2f}ms p95={results[name]['p95_ms']:.2f}ms "
+                      f"queries={results[name]['queries_per_call']:.1f}")
+        finally:
+            self.counter.uninstall()
+        return results
+
+    def measure(self, call: Callable[[int], Any]) -> Dict[str, float]:
+        for i in range(self.warmup):
+            call(i)
+
+        samples = []
+        queries_before = self.counter.count
+        for i in range(self.iterations):
+            started = time.perf_counter()
+            call(i)
+            samples.append((time.perf_counter() - started) * 1000)
+        queries = self.counter.count - queries_before
+
+        return {
+            "n": len(samples),
+            "mean_ms": sum(samples) / len(samples) if samples else 0.0,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+            "max_ms": max(samples, default=0.0),
+            "queries_per_call": queries / len(samples) if samples else 0.0,
+        }
+
+    # ----------  SCENARIOS  ----------
+    def scenarios(self) -> Dict[str, Callable[[int], Any]]:
+        from order_controller import OrderController
+        from PendingOrdersController import PendingOrdersController
+        from DeliveryController import DeliveryController
+        from StatisticsReportController import StatisticsReportController
+        from InventoryDetailController import InventoryDetailController
+        from CredentialController import CredentialController
+        from MenuController import MenuController
+        from FoodRequest import FoodRequest
+
+        order_controller = OrderController()
+        pending_controller = PendingOrdersController()
+        delivery_controller = DeliveryController()
+        statistics_controller = StatisticsReportController(self.db)
+        inventory_controller = InventoryDetailController()
+        credential_controller = CredentialController()
+        menu_controller = MenuController()
+
+        customers, agents, credentials, items = self._sample_data()
+        short_history, long_history = self._history_extremes()
+
+        def submit_order(i):
+            # OrderController.submit_order without the confirmation/warning screens
+            cart = {item: 1 for item in self.rng.sample(items, min(3, len(items)))}
+            address = f"Benchmark street {i}"
+            if order_controller.validate_info(2, address, cart):
+                order_controller.db.reserve_order(FoodRequest(self.rng.choice(customers), address, 2, None, cart))
+
+        def assign_request(i):
+            available = delivery_controller.list_available_requests()
+            if available:
+                delivery_controller.assign_request(available[0]["request_id"], self.rng.choice(agents))
+
+        def login(i):
+            email, password = credentials[i % len(credentials)]
+            credential_controller.login(email, password)
+
+        return {
+            "order.submit_order": submit_order,
+            "database.query_order_history": lambda i: self.db.query_order_history(self.rng.choice(customers)),
+            "database.query_order_history.short": lambda i: self.db.query_order_history(short_history),
+            "database.query_order_history.long": lambda i: self.db.query_order_history(long_history),
+            "pending_orders.get_all_pending_orders": lambda i: pending_controller.get_all_pending_orders(),
+            "delivery.list_available_requests": lambda i: delivery_controller.list_available_requests(),
+            "delivery.assign_request": assign_request,
+            "statistics.collect_kpis": lambda i: statistics_controller.collect_kpis(),
+            "inventory.get_all_categories_summary": lambda i: inventory_controller.get_all_categories_summary(),
+            "inventory.get_inventory_overview": lambda i: inventory_controller.get_inventory_overview(),
+            "credentials.login": login,
+            "menu.open_first_page": lambda i: (menu_controller.count_available(),
+                                               menu_controller.get_available_page()),
+        }
+
+    def _sample_data(self) -> Tuple[List[int], List[int], List[Tuple[str, str]], List[str]]:
+        def column(sql):
+            return [row[0] for row in self.db.execute_query(sql) or []]
+
+        customers = column("SELECT id FROM users WHERE role = 'customer' LIMIT 1000")
+        agents = column("SELECT id FROM users WHERE role = 'dropoffagent' LIMIT 100")
+        items = column("SELECT item_name FROM inventory WHERE quantity > 0 LIMIT 500")
+        credentials = [tuple(row) for row in self.db.execute_query("SELECT email, password FROM users LIMIT 100") or []]
+        if not (customers and agents and items and credentials):
+            raise RuntimeError("The database needs customers, drop-off agents, stock and users; "
+                               "seed it with DatasetGenerator.py first")
+        return customers, agents, credentials, items
+
+    def _history_extremes(self) -> Tuple[int, int]:
+        """Customers with the shortest and the longest delivered order history."""
+        rows = self.db.execute_query(
+            "SELECT customer_id, COUNT(*) FROM food_requests WHERE status = 'delivered' "
+            "GROUP BY customer_id ORDER BY COUNT(*)") or [(0, 0)]
+        return rows[0][0], rows[-1][0]
+
+    # ----------  STRESS  ----------
+    def reservation_stress(self, threads: int = 16, orders_per_thread: int = 20,
+                           stock: int = 100) -> Dict[str, Any]:
+        """
+        Concurrent customers ordering the same item: `stock` units are put on a
+        dedicated item and threads * orders_per_thread single-unit orders race for
+        them. Needs pooled mode so every thread gets its own connection.
+        """
+        from FoodRequest import FoodRequest
+
+        if Database._pool is None:
+            raise RuntimeError("Reservation stress needs Database.configure_pool()")
+
+        item = "Benchmark stress item"
+        customer = self._sample_data()[0][0]
+        self.db.execute_query("DELETE FROM inventory WHERE item_name = %s", (item,))
+        self.db.execute_query(
+            "INSERT INTO inventory (item_name, description, category, quantity) VALUES (%s, %s, %s, %s)",
+            (item, "Reserved by Benchmark.py", "benchmark", stock))
+
+        outcomes = {"reserved": 0, "rejected": 0}
+        samples: List[float] = []
+        lock = threading.Lock()
+
+        def worker():
+            db = Database()
+            for _ in range(orders_per_thread):
+                started = time.perf_counter()
+                order_id = db.reserve_order(FoodRequest(customer, "Benchmark street", 1, None, {item: 1}))
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    samples.append(elapsed)
+                    outcomes["reserved" if order_id is not None else "rejected"] += 1
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        rows = self.db.execute_query("SELECT quantity FROM inventory WHERE item_name = %s", (item,))
+        remaining = rows[0][0] if rows else None
+        return {
+            "threads": threads,
+            "orders": threads * orders_per_thread,
+            "reserved": outcomes["reserved"],
+            "rejected": outcomes["rejected"],
+            "remaining_stock": remaining,
+            "oversold": remaining is None or remaining < 0 or outcomes["reserved"] != stock - remaining,
+            "orders_per_s": threads * orders_per_thread / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+        }
+
+    def claim_stress(self, threads: int = 16, requests: int = 400, batch: int = 1) -> Dict[str, Any]:
+        """
+        Drop-off agents racing for the same requests: `requests` fresh pending
+        requests are created and every thread claims them `batch` at a time,
+        all starting from the same (oldest) one, until none is left. Checks
+        that no request was claimed twice. Needs pooled mode.
+        """
+        if Database._pool is None:
+            raise RuntimeError("Claim stress needs Database.configure_pool()")
+
+        requests = min(requests, Database.IN_CLAUSE_CHUNK_SIZE)
+        customers, agents = self._sample_data()[:2]
+        request_ids = []
+        track_stats = StatisticsRollup.enabled(self.db)
+        with self.db.transaction() as cursor:
+            for _ in range(requests):
+                cursor.execute(
+                    "INSERT INTO food_requests (customer_id, delivery_address, number_of_people, status) "
+                    "VALUES (%s, %s, %s, 'pending')", (customers[0], "Benchmark claim street", 1))
+                request_ids.append(cursor.lastrowid)
+            if track_stats:
+                StatisticsRollup.record(cursor, {"requests.created": requests, "requests.status.pending": requests})
+
+        outcomes = {"claimed": 0, "calls": 0, "empty": 0}
+        samples: List[float] = []
+        lock = threading.Lock()
+
+        def worker(agent_id):
+            db = Database()
+            while True:
+                started = time.perf_counter()
+                won = db.claim_requests(agent_id, batch, request_ids)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    samples.append(elapsed)
+                    outcomes["calls"] += 1
+                    outcomes["claimed"] += len(won)
+                    outcomes["empty"] += not won
+                if not won:
+                    return
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker, args=(agents[i % len(agents)],)) for i in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        placeholders = ", ".join(["%s"] * len(request_ids))
+        rows = self.db.execute_query(
+            f"SELECT request_id, COUNT(*) FROM deliveries WHERE request_id IN ({placeholders}) GROUP BY request_id",
+            tuple(request_ids)) or []
+        return {
+            "threads": threads,
+            "requests": requests,
+            "batch": batch,
+            "claimed": outcomes["claimed"],
+            "double_claimed": sum(1 for _, deliveries in rows if deliveries > 1),
+            "unclaimed": requests - len(rows),
+            "calls": outcomes["calls"],
+            "claims_per_s": outcomes["claimed"] / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+        }
+
+
+# ----------  BASELINE  ----------
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path, encoding="utf-8") as baseline:
+            return json.load(baseline)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    with open(path, "w", encoding="utf-8") as baseline:
+        json.dump(results, baseline, indent=2, sort_keys=True)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = LATENCY_TOLERANCE) -> List[str]:
+    """Regressions against `baseline`: slower p95 beyond `tolerance`, or more queries per call."""
+    regressions = []
+    for name, metrics in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if metrics["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.2f}ms -> {metrics['p95_ms']:.2f}ms")
+        if metrics["queries_per_call"] > previous["queries_per_call"]:
+            regressions.append(f"{name}: queries/call {previous['queries_per_call']:.1f} -> "
+                               f"{metrics['queries_per_call']:.1f}")
+    return regressions
+
+
+# Run against a seeded database: python Benchmark.py [--save-baseline] [--stress]
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark the FoodShare controller entry points")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=LATENCY_TOLERANCE)
+    parser.add_argument("--stress", action="store_true",
+                        help="Also run the concurrent reservation and request claiming stress tests")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--claim-batch", type=int, default=1, help="Requests claimed per call in the claim stress test")
+    parser.add_argument("--skip-plans", action="store_true",
+                        help="Do not EXPLAIN the statements of the app (see Migrations.check_query_plans)")
+    args = parser.parse_args()
+
+    if args.stress:
+        Database.configure_pool(max_size=args.threads)
+
+    suite = BenchmarkSuite(iterations=args.iterations, warmup=args.warmup)
+    results = suite.run(args.only)
+
+    failed = False
+    if args.stress:
+        stress = suite.reservation_stress(threads=args.threads)
+        print("reservation_stress: " + ", ".join(f"{key}={value}" for key, value in stress.items()))
+        failed = stress["oversold"]
+        claims = suite.claim_stress(threads=args.threads, batch=args.claim_batch)
+        print("claim_stress: " + ", ".join(f"{key}={value}" for key, value in claims.items()))
+        failed = failed or claims["double_claimed"] > 0 or claims["unclaimed"] > 0 or claims["claimed"] != claims["requests"]
+
+    if not args.skip_plans:
+        from Migrations import MigrationRunner
+
+        # Runs the app's queries inside Database.rolled_back(), so it writes nothing
+        runner = MigrationRunner(suite.db)
+        full_scans = [problem for problem in runner.check_query_plans() if problem["table"] is not None]
+        for problem in full_scans:
+            print(f"FULL SCAN {problem['query']} reads all of {problem['table']}")
+        print(f"query_plans: statements={runner.statements_checked}, full_scans={len(full_scans)}")
+        failed = failed or bool(full_scans)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+    else:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        failed = failed or bool(regressions)
+
+    sys.exit(1 if failed else 0)
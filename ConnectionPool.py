@@ -0,0 +1,211 @@
+# ConnectionPool.py
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections.
+    Connections are created through `factory`, validated on borrow and
+    reaped when they have been idle for longer than `idle_timeout`.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        idle_timeout: float = 300.0,
+        health_check: Callable[[Any], bool] | None = None,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check or self._default_health_check
+
+        self._idle: deque = deque()  # (connection, returned_at) pairs, most recent on the right
+        self._size = 0               # open connections (idle + in use)
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        # Metrics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._failed_checks = 0
+        self._reaped = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+
+    # ----------  CHECKOUT  ----------
+    def acquire(self, timeout: float | None = None) -> Any:
+        """Borrow a healthy connection, waiting up to `timeout` seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    self._in_use += 1
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1  # reserve the slot before connecting outside the lock
+                    self._in_use += 1
+                    conn = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No connection available within {timeout:.1f}s "
+                        f"({self._in_use}/{self.max_size} in use)")
+                self._cond.wait(remaining)
+
+        try:
+            if conn is None:
+                conn = self.factory()
+            elif not self._is_healthy(conn):
+                with self._cond:
+                    self._failed_checks += 1
+                self._discard(conn)
+                conn = self.factory()
+        except Exception:
+            # Give the reserved slot back so waiters are not starved
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        """Return a borrowed connection; broken connections should be discarded."""
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._discard(conn)
+        self.reap_idle()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None):
+        """Context manager that borrows a connection and always returns it."""
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            broken = not self._is_healthy(conn)
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    # ----------  MAINTENANCE  ----------
+    def reap_idle(self) -> int:
+        """Close connections idle for longer than `idle_timeout`, keeping `min_size` open."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._cond:
+            # Oldest idle connections sit on the left of the deque
+            while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                expired.append(conn)
+            self._reaped += len(expired)
+
+        for conn in expired:
+            self._discard(conn)
+        return len(expired)
+
+    def close(self) -> None:
+        """Close every idle connection; in-use connections are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the pool metrics."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "failed_health_checks": self._failed_checks,
+                "reaped": self._reaped,
+                "wait_total_s": self._wait_total,
+                "wait_avg_s": self._wait_total / self._checkouts if self._checkouts else 0.0,
+                "wait_max_s": self._wait_max,
+            }
+
+    # ----------  HELPERS  ----------
+    def _open(self) -> Any:
+        conn = self.factory()
+        with self._cond:
+            self._size += 1
+        return conn
+
+    def _is_healthy(self, conn: Any) -> bool:
+        try:
+            return bool(self.health_check(conn))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _default_health_check(conn: Any) -> bool:
+        # mysql.connector exposes is_connected(), which pings the server
+        if hasattr(conn, "is_connected"):
+            return conn.is_connected()
+        return True
+
+    @staticmethod
+    def _discard(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
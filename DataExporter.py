@@ -0,0 +1,168 @@
+# DataExporter.py
+from __future__ import annotations
+import csv
+import gzip
+import json
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+from Database import Database
+
+
+# dataset -> (table, key column, exported columns, columns that can be filtered on)
+DATASETS: Dict[str, Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]] = {
+    "inventory": ("inventory", "item_id",
+                  ("item_id", "item_name", "description", "category", "quantity"),
+                  ("category",)),
+    "requests": ("food_requests", "id",
+                 ("id", "customer_id", "delivery_address", "number_of_people", "status", "delivery_status",
+                  "created_at"),
+                 ("customer_id", "status", "delivery_status")),
+    "deliveries": ("deliveries", "id",
+                   ("id", "request_id", "agent_id", "status", "eta"),
+                   ("agent_id", "status")),
+    "donations": ("donations", "id",
+                  ("id", "donor_id", "item_name", "quantity", "donation_date"),
+                  ("donor_id",)),
+}
+FORMATS = ("csv", "jsonl")
+# Columns exported only when the schema has them: dataset -> (columns, Database method telling whether it does)
+OPTIONAL_COLUMNS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "deliveries": (("assigned_at", "completed_at"), "has_delivery_times"),  # Migration 5
+}
+
+
+class DataExporter:
+    """
+    Streams whole tables to CSV or JSON Lines files, optionally gzip compressed.
+
+    Rows are read in chunks of `chunk_size` with keyset pagination on the
+    primary key (WHERE key > last key ORDER BY key LIMIT n), and every chunk is
+    written before the next one is read, so memory stays the same whatever the
+    table size. Between chunks the connection is released, so the app keeps
+    working while a large export runs. Request exports carry their items: one
+    CSV line per item, or an "items" list per JSON line.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, db: Database | None = None, chunk_size: int = CHUNK_SIZE) -> None:
+        self.db = db or Database()
+        self.chunk_size = chunk_size
+
+    def export(self, dataset: str, path: str, fmt: str | None = None, **filters) -> int:
+        """
+        Write `dataset` to `path`; the format comes from the extension (.csv,
+        .jsonl, either with .gz) unless `fmt` is given. `filters` are column
+        values to match, e.g. category="fruits". Returns the number of records.
+        """
+        compressed = path.endswith(".gz")
+        fmt = fmt or _format_of(path[:-3] if compressed else path)
+        opener = gzip.open if compressed else open
+        with opener(path, "wt", encoding="utf-8", newline="") as stream:
+            return self.write(dataset, stream, fmt, **filters)
+
+    def write(self, dataset: str, stream: TextIO, fmt: str = "csv", **filters) -> int:
+        """Write `dataset` to an open text stream. Returns the number of records."""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {FORMATS}")
+        columns = self.columns(dataset)
+        count = 0
+
+        if fmt == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(columns + (("item_name", "item_quantity") if dataset == "requests" else ()))
+            for record in self.records(dataset, **filters):
+                row = [_text(record[column]) for column in columns]
+                if dataset == "requests":
+                    # One line per item; requests without items still get a line
+                    lines = [row + [item_name, quantity] for item_name, quantity in record["items"].items()]
+                    writer.writerows(lines or [row + ["", ""]])
+                else:
+                    writer.writerow(row)
+                count += 1
+        else:
+            for record in self.records(dataset, **filters):
+                if dataset == "requests":
+                    record["items"] = [{"item_name": item_name, "quantity": quantity}
+                                       for item_name, quantity in record["items"].items()]
+                stream.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def records(self, dataset: str, **filters) -> Iterator[Dict[str, Any]]:
+        """Every row of `dataset` as a dict, read chunk by chunk."""
+        for chunk in self.chunks(dataset, **filters):
+            yield from chunk
+
+    def chunks(self, dataset: str, **filters) -> Iterator[List[Dict[str, Any]]]:
+        """Lists of at most chunk_size records, in primary key order."""
+        table, key, columns, filterable = self._spec(dataset)
+        unknown = set(filters) - set(filterable)
+        if unknown:
+            raise ValueError(f"{dataset} cannot be filtered on {sorted(unknown)}; use {list(filterable)}")
+
+        conditions = [f"{column} = %s" for column in filters]
+        query = (f"SELECT {', '.join(columns)} FROM {table} WHERE {' AND '.join(conditions + [f'{key} > %s'])} "
+                 f"ORDER BY {key} LIMIT %s")
+        last_key = None
+        while True:
+            # AUTO_INCREMENT ids start at 1, so the first chunk starts after 0
+            rows = self.db.execute_query(query, tuple(filters.values()) + (last_key or 0, self.chunk_size))
+            if rows is None:
+                raise RuntimeError(f"Reading {table} failed; the export is incomplete")
+            if not rows:
+                return
+            chunk = [dict(zip(columns, row)) for row in rows]
+            last_key = chunk[-1][key]
+            if dataset == "requests":
+                items = self.db.get_items_for_requests([record["id"] for record in chunk])
+                for record in chunk:
+                    record["items"] = items.get(record["id"], {})
+            yield chunk
+            if len(rows) < self.chunk_size:
+                return
+
+    def columns(self, dataset: str) -> Tuple[str, ...]:
+        return self._spec(dataset)[2]
+
+    def _spec(self, dataset: str) -> Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]:
+        try:
+            table, key, columns, filterable = DATASETS[dataset]
+        except KeyError:
+            raise ValueError(f"Unknown dataset {dataset!r}; expected one of {sorted(DATASETS)}") from None
+        if dataset in OPTIONAL_COLUMNS:
+            extra, available = OPTIONAL_COLUMNS[dataset]
+            if getattr(self.db, available)():
+                columns += extra
+        return table, key, columns, filterable
+
+
+def _format_of(path: str) -> str:
+    extension = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the export format of {path!r}; use .csv or .jsonl (optionally .gz)")
+
+
+def _text(value: Any) -> Any:
+    return "" if value is None else value
+
+
+# Export commands: python DataExporter.py DATASET FILE [--chunk-size N] [--filter column=value ...]
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Stream FoodShare tables to CSV / JSON Lines")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("path", help="Output file: .csv or .jsonl, optionally followed by .gz")
+    parser.add_argument("--chunk-size", type=int, default=DataExporter.CHUNK_SIZE)
+    parser.add_argument("--filter", action="append", default=[], metavar="COLUMN=VALUE")
+    args = parser.parse_args()
+
+    filters = dict(condition.split("=", 1) for condition in args.filter)
+    start = time.perf_counter()
+    exported = DataExporter(chunk_size=args.chunk_size).export(args.dataset, args.path, **filters)
+    print(f"Exported {exported} {args.dataset} records to {args.path} in {time.perf_counter() - start:.1f}s")
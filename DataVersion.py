@@ -0,0 +1,55 @@
+# DataVersion.py
+from __future__ import annotations
+
+
+class DataVersion:
+    """
+    Change counters kept in the `data_versions` table, one row per tracked table.
+
+    Every writer of a tracked table bumps its counter in the same unit of work
+    as the change, so a reader that remembers the version it loaded can ask
+    "did anything move?" with a one-row primary key lookup instead of reading
+    the table again. Changes made outside the app (e.g. by hand in phpMyAdmin)
+    do not bump the counter; reload explicitly after those.
+    """
+
+    TABLE = "data_versions"
+    INVENTORY = "inventory"
+    _enabled: bool | None = None  # Cached "does the table exist" check
+
+    # ----------  WRITE PATH  ----------
+    @classmethod
+    def enabled(cls, db) -> bool:
+        """True once the counter table exists (checked once per process)."""
+        if cls._enabled is None:
+            cls._enabled = db.backend.table_exists(db, cls.TABLE)
+        return cls._enabled
+
+    @classmethod
+    def bump(cls, cursor, name: str) -> None:
+        """Advance the counter of `name`; call inside the transaction that changed it."""
+        from Database import Database  # Imported here because Database imports this module
+        cursor.execute(Database.backend.upsert_increment(cls.TABLE, ("name",), "version"), (name, 1))
+
+    # ----------  READ PATH  ----------
+    @classmethod
+    def current(cls, db, name: str) -> int | None:
+        """Current version of `name` (0 before its first change), or None if counters are not available."""
+        if not cls.enabled(db):
+            return None
+        rows = db.execute_query(f"SELECT version FROM {cls.TABLE} WHERE name = %s", (name,))
+        if rows is None:
+            return None  # Query failed; callers must treat the data as changed
+        return int(rows[0][0]) if rows else 0
+
+
+# Show the counters: python DataVersion.py
+if __name__ == "__main__":
+    from Database import Database
+
+    db = Database()
+    if not DataVersion.enabled(db):
+        print(f"The {DataVersion.TABLE} table does not exist yet; run python Migrations.py apply")
+    else:
+        for name, version in db.execute_query(f"SELECT name, version FROM {DataVersion.TABLE} ORDER BY name") or []:
+            print(f"{name}: {version}")
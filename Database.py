@@ -1,16 +1,42 @@
-import mysql.connector
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from ConnectionPool import ConnectionPool
+from DataVersion import DataVersion
+from DatabaseBackend import DatabaseError, backend_from_environment, create_backend
 from FoodRequest import FoodRequest
+from QueryInstrumentation import QueryInstrumentation
+from StatisticsRollup import StatisticsRollup
+
+
+class InsufficientStockError(Exception):
+    """Raised inside a transaction when a cart line cannot be reserved."""
 
 
 class Database:
+    backend = backend_from_environment() # MySQL unless FOODSHARE_DB_BACKEND says otherwise, see configure_backend()
     _connection = None # Class variable to hold the single instance so only one connection is created each time
+    _pool = None # Optional connection pool, enabled with Database.configure_pool()
+    _lock = threading.RLock() # Serializes access to the shared connection when no pool is configured
+    IN_CLAUSE_CHUNK_SIZE = 500 # Max ids bound into a single "IN (...)" lookup
+    CLAIM_OVERSELECT = 4 # Spare candidates claim_requests reads per request it still needs
+    _delivery_times = None # Cached: do deliveries have assigned_at / completed_at (migration 5)?
+    _rollback_only = False # Inside Database.rolled_back(): units of work are rolled back, not committed
+
     # Constructor to initialize the database connection
     def __init__(self, host="localhost", user="root", password="", database="foodshare"):
         self.host = host
         self.user = user
         self.password = password
         self.database = database
-        
+        self.lastrowid = None # Row id / row count of the last statement run through execute_query
+        self.rowcount = -1
+
+        if Database._pool is not None: # Pooled mode: every unit of work borrows its own connection
+            self.connection = None
+            self.cursor = None
+            return
+
         if Database._connection is None: # Check if a connection already exists
             Database._connection = self.connect()
         
@@ -20,28 +46,134 @@ class Database:
     # Create a new connection to the database
     def connect(self): 
         try:
-            connection = mysql.connector.connect(
+            connection = Database.backend.connect(
                 host=self.host,
                 user=self.user,
                 password=self.password,
                 database=self.database
             )
             return connection
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Error: {err}")
             return None
 
-   # Close the connection to the database 
+    # Select the storage engine used by every Database instance
+    @classmethod
+    def configure_backend(cls, name="mysql", **options):
+        """
+        name is "mysql" (options: host, user, password, database) or "sqlite"
+        (options: path, busy_timeout). Open connections and the pool are closed;
+        call configure_pool() again afterwards if pooling is wanted.
+        """
+        cls.shutdown()
+        cls.backend = create_backend(name, **options)
+        StatisticsRollup._enabled = None # The rollup and counter tables have to be looked up again
+        DataVersion._enabled = None
+        cls._delivery_times = None
+        return cls.backend
+
+    # Switch every Database instance to a pool of connections
+    @classmethod
+    def configure_pool(cls, host="localhost", user="root", password="", database="foodshare",
+                       min_size=1, max_size=10, timeout=5.0, idle_timeout=300.0):
+        """
+        Enables pooled mode. min_size/max_size bound the number of open connections,
+        timeout is the checkout wait in seconds and idle_timeout the age after which
+        idle connections above min_size are closed.
+        """
+        if cls._pool is not None:
+            cls._pool.close()
+
+        def factory():
+            return cls.backend.connect(host=host, user=user, password=password, database=database)
+
+        cls._pool = ConnectionPool(factory, min_size=min_size, max_size=max_size,
+                                   timeout=timeout, idle_timeout=idle_timeout)
+        return cls._pool
+
+    # Pool metrics (wait time, in-use count, ...) or None when pooling is off
+    @classmethod
+    def pool_stats(cls):
+        return cls._pool.stats() if cls._pool is not None else None
+
+    # Borrow a connection and a cursor for one unit of work
+    @contextmanager
+    def transaction(self):
+        """
+        Yields a cursor on a connection owned by the caller for the duration of the block.
+        Commits when the block finishes and rolls back if it raises.
+        """
+        if Database._pool is None:
+            with Database._lock:
+                yield from self._run_unit_of_work(self.connection)
+        else:
+            with Database._pool.connection() as connection:
+                yield from self._run_unit_of_work(connection)
+
+    # Run code against the database without keeping any of its writes
+    @classmethod
+    @contextmanager
+    def rolled_back(cls):
+        """
+        Every unit of work that finishes inside the block is rolled back instead
+        of committed, in every thread, so checks can exercise writing methods
+        on a real database. Statements with an implicit commit (DDL on MySQL)
+        are not covered.
+        """
+        cls._rollback_only = True
+        try:
+            yield
+        finally:
+            cls._rollback_only = False
+
+    @staticmethod
+    def _run_unit_of_work(connection):
+        cursor = connection.cursor()
+        if QueryInstrumentation.enabled: # Time and attribute every statement of this unit of work
+            cursor = QueryInstrumentation.wrap(cursor)
+        try:
+            yield cursor
+            if Database._rollback_only:
+                connection.rollback()
+            else:
+                connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+   # Release this instance's cursor. The shared connection stays open for the other
+   # screens and their background loads; it is closed once, on exit, by shutdown()
     def close(self):
-        self.cursor.close()
-        self.connection.close()
+        if self.connection is None: # Pooled connections are returned after every unit of work
+            return
+        with Database._lock: # Not while a unit of work is using the shared connection
+            if self.cursor is not None:
+                self.cursor.close()
+                self.cursor = None
+
+    # Close the shared connection and the pool when the application exits
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.close()
+                cls._pool = None
+            if cls._connection is not None:
+                cls._connection.close()
+                cls._connection = None # A later instance reconnects
 
     # Execute a query on the database
     def execute_query(self, query, params=None): 
         try:
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchall()
-        except mysql.connector.Error as err:
+            with self.transaction() as cursor:
+                cursor.execute(query, params or ())
+                self.lastrowid = cursor.lastrowid
+                self.rowcount = cursor.rowcount
+                # Statements without a result set (INSERT, UPDATE, ...) return an empty list
+                return cursor.fetchall() if cursor.description is not None else []
+        except DatabaseError as err:
             print(f"Error: {err}")
             return None
     
@@ -72,36 +204,113 @@ class Database:
 
     # Save the order to the database
     def save_order(self, food_request):
-        # Save the order to the database
-        query = "INSERT INTO food_requests (customer_id, delivery_address, number_of_people, status) VALUES (%s, %s, %s, %s)"
-        params = (food_request.customer_id, food_request.delivery_address, food_request.number_of_people, food_request.status)
-        self.execute_query(query, params)
-        self.connection.commit() # Commit the changes to the database
+        track_stats = StatisticsRollup.enabled(self)
+        try:
+            # The request and its items are written in the same unit of work
+            with self.transaction() as cursor:
+                query = "INSERT INTO food_requests (customer_id, delivery_address, number_of_people, status) VALUES (%s, %s, %s, %s)"
+                params = (food_request.customer_id, food_request.delivery_address, food_request.number_of_people, food_request.status)
+                cursor.execute(query, params)
+
+                # Get the order ID of the newly created order
+                order_id = cursor.lastrowid
 
-        # Get the order ID of the newly created order
-        order_id = self.cursor.lastrowid
+                #  Save the items in the order to the database
+                for item, quantity in food_request.items.items():
+                    query = "INSERT INTO food_request_items (request_id, item_name, quantity) VALUES (%s, %s, %s)"
+                    params = (order_id, item, quantity)
+                    cursor.execute(query, params)
 
-        #  Save the items in the order to the database
-        for item, quantity in food_request.items.items():
-            query = "INSERT INTO food_request_items (request_id, item_name, quantity) VALUES (%s, %s, %s)"
-            params = (order_id, item, quantity)
-            self.execute_query(query, params)
+                if track_stats:
+                    StatisticsRollup.record(cursor, self._new_request_stats(food_request))
 
-        self.connection.commit() # Commit the changes to the database
-        print(f"Order {order_id} saved successfully!")
+            food_request.request_id = order_id
+            print(f"Order {order_id} saved successfully!")
+        except DatabaseError as err:
+            print(f"Error saving order: {err}")
 
     # Update the quantities of the items in the database
     def update_quantities(self, items):
         # Update the quantities of the items in the database
-        for item, quantity in items.items():
-            query = "UPDATE inventory SET quantity = quantity - %s WHERE item_name = %s"
-            params = (quantity, item)
-            self.execute_query(query, params)
-
-        self.connection.commit()
+        track_version = DataVersion.enabled(self)
+        try:
+            with self.transaction() as cursor:
+                for item, quantity in items.items():
+                    query = "UPDATE inventory SET quantity = quantity - %s WHERE item_name = %s"
+                    params = (quantity, item)
+                    cursor.execute(query, params)
+                if track_version and items:
+                    DataVersion.bump(cursor, DataVersion.INVENTORY)
+        except DatabaseError as err:
+            print(f"Error updating quantities: {err}")
         # Clear the cart
         items.clear()
 
+    # Reserve the stock for an order and save it in a single transaction
+    def reserve_order(self, food_request):
+        """
+        Decrements the inventory for every cart line only if enough stock is left,
+        then inserts the request and its items. Everything commits together, so two
+        concurrent customers can never both take the last units of an item.
+        Returns the new request id, or None if any item is missing or short.
+        """
+        # Lock rows in a fixed order so concurrent reservations cannot deadlock
+        lines = sorted(food_request.items.items())
+        track_stats = StatisticsRollup.enabled(self)
+        track_version = DataVersion.enabled(self)
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "UPDATE inventory SET quantity = quantity - %s WHERE item_name = %s AND quantity >= %s",
+                    [(quantity, item, quantity) for item, quantity in lines])
+                if cursor.rowcount != len(lines): # Some line matched no row with enough stock
+                    raise InsufficientStockError()
+
+                cursor.execute(
+                    "INSERT INTO food_requests (customer_id, delivery_address, number_of_people, status) VALUES (%s, %s, %s, %s)",
+                    (food_request.customer_id, food_request.delivery_address, food_request.number_of_people, food_request.status))
+                order_id = cursor.lastrowid
+
+                cursor.executemany(
+                    "INSERT INTO food_request_items (request_id, item_name, quantity) VALUES (%s, %s, %s)",
+                    [(order_id, item, quantity) for item, quantity in lines])
+
+                if track_stats:
+                    StatisticsRollup.record(cursor, self._new_request_stats(food_request))
+                if track_version:
+                    DataVersion.bump(cursor, DataVersion.INVENTORY)
+
+            food_request.request_id = order_id
+            return order_id
+        except InsufficientStockError:
+            return None
+        except DatabaseError as err:
+            print(f"Error reserving order: {err}")
+            return None
+
+    # Rollup deltas for a newly created request
+    def _new_request_stats(self, food_request):
+        deltas = StatisticsRollup.status_change("requests.status", None, food_request.status)
+        deltas["requests.created"] = 1
+        return deltas
+
+    # Update the status of a food request
+    def update_request_status(self, request_id, new_status):
+        """Sets food_requests.status; database errors propagate to the caller."""
+        track_stats = StatisticsRollup.enabled(self)
+        with self.transaction() as cursor:
+            old_status = None
+            if track_stats:
+                cursor.execute("SELECT status FROM food_requests WHERE id = %s FOR UPDATE", (request_id,))
+                row = cursor.fetchone()
+                old_status = row[0] if row else None
+
+            cursor.execute("UPDATE food_requests SET status = %s WHERE id = %s", (new_status, request_id))
+
+            if track_stats and cursor.rowcount == 1: # Unchanged rows are not counted as a transition
+                StatisticsRollup.record(cursor, StatisticsRollup.status_change("requests.status", old_status, new_status))
+        return True
+
     # Check if the order exists in the database
     def query_order(self, customer_id):
         # Get the pending orders from the database for the customer
@@ -129,6 +338,7 @@ class Database:
             number_of_people=order_data[0][3],
             items=items,
             status=order_data[0][4],
+            request_id=order_data[0][0],
         )
 
         return food_request # Return the food request object
@@ -136,49 +346,97 @@ class Database:
     # Query the order history for a customer
     def query_order_history(self, customer_id):
 
-        # Get the order history from the database for the customer
-        query = "SELECT * FROM food_requests WHERE customer_id = %s and status = 'delivered'"
-        # Query to get all orders for a specific customer
+        # Get the delivered orders and all of their items in a single round trip
+        query = """
+            SELECT r.id, r.customer_id, r.delivery_address, r.number_of_people, r.status, r.created_at,
+                   i.item_name, i.quantity
+            FROM food_requests r
+            LEFT JOIN food_request_items i ON i.request_id = r.id
+            WHERE r.customer_id = %s AND r.status = 'delivered'
+            ORDER BY r.id
+        """
         params = (customer_id,)
-        order_data = self.execute_query(query, params)
+        rows = self.execute_query(query, params)
 
-        if not order_data:  # If no orders are found
+        if not rows:  # If no orders are found
             return None
 
-        # Get the order details from the database
-        order_history = []
-        for order in order_data:
-            request_id, customer_id, delivery_address, number_of_people, status, delivery_status, created_at = order
-
-            # Get the items for each order
-            items_query = "SELECT item_name, quantity FROM food_request_items WHERE request_id = %s"
-            items_results = self.execute_query(items_query, (request_id,))
-            items = {item: quantity for item, quantity in items_results}
-
-            # Append the order to the history
-            food_request = FoodRequest(
-                request_id=request_id,
-                customer_id=customer_id,
-                delivery_address=delivery_address,
-                number_of_people=number_of_people,
-                items=items,
-                status=status,
-                made=created_at
-            )
+        # Return the list of food requests
+        return self.build_food_requests(rows)
+
+    # Group joined request/item rows into FoodRequest objects
+    def build_food_requests(self, rows):
+        """
+        Each row is (id, customer_id, delivery_address, number_of_people, status, created_at,
+        item_name, quantity), as produced by a LEFT JOIN of food_requests with food_request_items.
+        Returns one FoodRequest per request, in the order the requests first appear.
+        """
+        food_requests = {}
+        for request_id, customer_id, delivery_address, number_of_people, status, created_at, item_name, quantity in rows:
+            food_request = food_requests.get(request_id)
+            if food_request is None:
+                food_request = FoodRequest(
+                    request_id=request_id,
+                    customer_id=customer_id,
+                    delivery_address=delivery_address,
+                    number_of_people=number_of_people,
+                    items={},
+                    status=status,
+                    made=created_at
+                )
+                food_requests[request_id] = food_request
 
-            order_history.append(food_request)
+            if item_name is not None:  # Requests without items still get an entry
+                food_request.items[item_name] = quantity
 
-        # Return the list of food requests
-        return order_history  # Return the list of food requests
-    
-        # NEW METHOD: Get user by email for login functionality
+        return list(food_requests.values())
     
+    # Get the items of many requests at once
+    def get_items_for_requests(self, request_ids):
+        """
+        Returns {request_id: {item_name: quantity}} for the given requests,
+        using one "IN (...)" query per IN_CLAUSE_CHUNK_SIZE ids.
+        """
+        items_by_request = {request_id: {} for request_id in request_ids}
+        for chunk in self._chunks(list(items_by_request)):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            query = f"SELECT request_id, item_name, quantity FROM food_request_items WHERE request_id IN ({placeholders})"
+            for request_id, item_name, quantity in self.execute_query(query, tuple(chunk)) or []:
+                items_by_request[request_id][item_name] = quantity
+        return items_by_request
+
+    # Get many users by ID at once
+    def get_users_by_ids(self, user_ids):
+        """
+        Returns {user_id: user_data} with the same fields as get_user_by_id.
+        Unknown ids are left out of the result.
+        """
+        users = {}
+        for chunk in self._chunks(list(dict.fromkeys(user_ids))):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            query = f"SELECT id, username, name, surname, email, phone, role FROM users WHERE id IN ({placeholders})"
+            for row in self.execute_query(query, tuple(chunk)) or []:
+                users[row[0]] = {
+                    'id': row[0],
+                    'username': row[1],
+                    'name': row[2],
+                    'surname': row[3],
+                    'email': row[4],
+                    'phone': row[5],
+                    'role': row[6]
+                }
+        return users
+
+    # Split a list of ids into IN-clause sized chunks
+    def _chunks(self, ids):
+        for start in range(0, len(ids), self.IN_CLAUSE_CHUNK_SIZE):
+            yield ids[start:start + self.IN_CLAUSE_CHUNK_SIZE]
+
     # Save the report in the database
     def create_report(self, report):
         query = "INSERT INTO reports (request_id, customer_id, description) VALUES (%s, %s, %s)"
         params = (report.request_id, report.customer_id, report.description)
         self.execute_query(query, params)
-        self.connection.commit()  # Commit the changes to the database
 
     # Create a new drop-off agent in the database
     def create_drop_off_agent(self, drop_off_agent):
@@ -193,10 +451,18 @@ class Database:
         else: # If the user does not exist, create a new drop-off agent
             query = "INSERT INTO users (name, surname, username, email, password, phone, role) VALUES (%s, %s, %s, %s, %s, %s, 'dropoffagent')"
             params = (drop_off_agent.name, drop_off_agent.surname, drop_off_agent.username, drop_off_agent.email, drop_off_agent.get_password(), drop_off_agent.phone_number)
-            self.execute_query(query, params)
-            self.connection.commit()
+            self._insert_user(query, params, 'dropoffagent')
             return True  # User created successfully
 
+    # Insert a user row and count it in the statistics rollup
+    def _insert_user(self, query, params, role):
+        track_stats = StatisticsRollup.enabled(self)
+        with self.transaction() as cursor:
+            cursor.execute(query, params)
+            if track_stats:
+                StatisticsRollup.record(cursor, {f"users.role.{role}": 1})
+            return cursor.lastrowid
+
     # Get user by email for login functionality - UPDATED to include username
     def get_user_by_email(self, email):
         """
@@ -222,7 +488,7 @@ class Database:
             else:
                 return None
                 
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in get_user_by_email: {err}")
             return None
     
@@ -250,7 +516,7 @@ class Database:
             else:
                 return None
                 
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in get_user_by_id: {err}")
             return None
     # MOVED FROM CREDENTIALCONTROLLER: Create customer user
@@ -275,21 +541,17 @@ class Database:
                 'customer'
             )
             
-            self.cursor.execute(query, params)
-            user_id = self.cursor.lastrowid
+            user_id = self._insert_user(query, params, 'customer')
             
             # If you have a separate customers table for customer-specific data:
             # customer_query = "INSERT INTO customers (user_id) VALUES (%s)"
-            # self.cursor.execute(customer_query, (user_id,))
-            
-            self.connection.commit()
+            # self.execute_query(customer_query, (user_id,))
             
             print(f"Customer user {customer_obj.email} created successfully with ID: {user_id}")
             return user_id
             
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in create_customer_user: {err}")
-            self.connection.rollback()
             return None
         # MOVED FROM CREDENTIALCONTROLLER: Create donor user
     def create_donor_user(self, donor_obj):
@@ -313,17 +575,13 @@ class Database:
                 'donor'
             )
             
-            self.cursor.execute(query, params)
-            user_id = self.cursor.lastrowid
-            
-            self.connection.commit()
+            user_id = self._insert_user(query, params, 'donor')
             
             print(f"Donor user {donor_obj.email} created successfully with ID: {user_id}")
             return user_id
             
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in create_donor_user: {err}")
-            self.connection.rollback()
             return None
 
     
@@ -340,7 +598,7 @@ class Database:
                 return True
             return False
                 
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in email_exists: {err}")
             return False
     
@@ -391,7 +649,6 @@ class Database:
 
             query = f"UPDATE users SET {', '.join(update_clauses)} WHERE id = %s"
             self.execute_query(query, tuple(values))
-            self.connection.commit()
             
             return True, "User info updated successfully."
             
@@ -415,10 +672,9 @@ class Database:
                 )
             """
             self.execute_query(query)
-            self.connection.commit()
             print("Donations table created/verified successfully!")
             
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Error creating donations table: {err}")
 
     def create_donation(self, donor_id, item_name, quantity, donation_date):
@@ -426,15 +682,19 @@ class Database:
         try:
             query = "INSERT INTO donations (donor_id, item_name, quantity, donation_date) VALUES (%s, %s, %s, %s)"
             params = (donor_id, item_name, quantity, donation_date)
-            self.execute_query(query, params)
-            self.connection.commit()
+            track_stats = StatisticsRollup.enabled(self)
+            with self.transaction() as cursor:
+                cursor.execute(query, params)
             
-            # Get the donation ID of the newly created donation
-            donation_id = self.cursor.lastrowid
+                # Get the donation ID of the newly created donation
+                donation_id = cursor.lastrowid
+
+                if track_stats:
+                    StatisticsRollup.record(cursor, {"donations": 1}, donation_date)
             print(f"Donation {donation_id} created successfully!")
             return donation_id
             
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Error creating donation: {err}")
             return None
 
@@ -457,7 +717,7 @@ class Database:
             else:
                 return None
                 
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in get_donation_by_id: {err}")
             return None
 
@@ -482,7 +742,7 @@ class Database:
             
             return donations
             
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in get_donations_by_donor: {err}")
             return []
 
@@ -507,34 +767,127 @@ class Database:
             
             return donations
             
-        except mysql.connector.Error as err:
+        except DatabaseError as err:
             print(f"Database error in get_all_donations: {err}")
             return []
     
-    def list_available_requests(self):
-        """Return rows (id, customer_id, delivery_address, number_of_people) where request is pending."""
-        return self.execute_query(
-            "SELECT id, customer_id, delivery_address, number_of_people "
-            "FROM food_requests WHERE status = 'pending' ORDER BY created_at")
+    def list_available_requests(self, limit=None):
+        """Return rows (id, customer_id, delivery_address, number_of_people) where request is pending, oldest first."""
+        query = ("SELECT id, customer_id, delivery_address, number_of_people "
+                 "FROM food_requests WHERE status = 'pending' ORDER BY created_at")
+        if limit is not None:
+            return self.execute_query(query + " LIMIT %s", (limit,))
+        return self.execute_query(query)
+
+    def get_open_delivery_loads(self):
+        """
+        {agent_id: number of deliveries not yet completed} for every drop-off
+        agent (agents without deliveries count 0), in one grouped query.
+        """
+        rows = self.execute_query(
+            "SELECT u.id, COUNT(d.id) FROM users u "
+            "LEFT JOIN deliveries d ON d.agent_id = u.id AND d.status != 'completed' "
+            "WHERE u.role = 'dropoffagent' GROUP BY u.id") or []
+        return {agent_id: int(load) for agent_id, load in rows}
 
 
     def assign_request_to_agent(self, request_id: int, agent_id: int):
-        """Atomically create a delivery and mark request as in_transit."""
+        """Atomically create a delivery and mark request as in_transit (False if another agent got it first)."""
         try:
-            # create delivery row
-            self.cursor.execute(
-                "INSERT INTO deliveries (request_id, agent_id) VALUES (%s, %s)",
-                (request_id, agent_id))
-            # update request status
-            self.cursor.execute(
-                "UPDATE food_requests SET status = 'in_transit' WHERE id = %s",
-                (request_id,))
-            self.connection.commit()
-            return True
+            return self.claim_request(request_id, agent_id)
         except Exception as err:
             print(f"DB‑error assign_request_to_agent: {err}")
-            self.connection.rollback()
             return False
+
+    def claim_request(self, request_id: int, agent_id: int) -> bool:
+        """
+        Claims one request for an agent. The request row is locked and its
+        status re-read before the flip, so of several agents claiming the same
+        request exactly one wins; the others get False once the winner commits
+        and nothing is written for them. Database errors propagate.
+        """
+        return bool(self.claim_requests(agent_id, 1, [request_id]))
+
+    def claim_requests(self, agent_id: int, count: int = 1, candidates=None):
+        """
+        Claims up to `count` pending requests for an agent in one transaction
+        and returns the ids won, in claim order.
+
+        Without `candidates` the oldest pending requests are taken; otherwise
+        the candidate ids are tried in the given order (e.g. nearest first).
+        Candidates are read without locks, CLAIM_OVERSELECT times as many as
+        needed, and then locked a batch at a time (SELECT ... FOR UPDATE, in id
+        order) to re-read their status: a request another agent took in the
+        meantime is passed over for the next candidate, so an agent comes back
+        short only when the queue runs out. The won requests are flipped with
+        one UPDATE and get their deliveries from one executemany INSERT. Plain
+        FOR UPDATE works on MariaDB 10.4, unlike SKIP LOCKED.
+        """
+        if count <= 0 or (candidates is not None and not candidates):
+            return []
+        track_stats = StatisticsRollup.enabled(self)
+        record_times = self.has_delivery_times()
+        assigned_at = datetime.now()
+
+        with self.transaction() as cursor:
+            queue = []
+            if candidates is not None:
+                candidates = list(dict.fromkeys(candidates))[:self.IN_CLAUSE_CHUNK_SIZE]
+                placeholders = ", ".join(["%s"] * len(candidates))
+                cursor.execute(
+                    f"SELECT id FROM food_requests WHERE id IN ({placeholders}) AND status = 'pending'",
+                    tuple(candidates))
+                pending = {row[0] for row in cursor.fetchall()}
+                queue = [request_id for request_id in candidates if request_id in pending]
+
+            request_ids, tried = [], []
+            while len(request_ids) < count:
+                needed = count - len(request_ids)
+                if not queue and candidates is None:
+                    # Next oldest requests that looked pending, minus the ones other agents won
+                    excluded = ""
+                    if tried:
+                        excluded = f"AND id NOT IN ({', '.join(['%s'] * len(tried))}) "
+                    cursor.execute(
+                        f"SELECT id FROM food_requests WHERE status = 'pending' {excluded}"
+                        "ORDER BY created_at, id LIMIT %s",
+                        tuple(tried) + (needed * self.CLAIM_OVERSELECT,))
+                    queue = [row[0] for row in cursor.fetchall()]
+                if not queue:
+                    break
+                batch, queue = queue[:needed], queue[needed:]
+                tried.extend(batch)
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(
+                    f"SELECT id FROM food_requests WHERE id IN ({placeholders}) AND status = 'pending' "
+                    "ORDER BY id FOR UPDATE", tuple(batch))
+                locked = {row[0] for row in cursor.fetchall()}
+                request_ids.extend(request_id for request_id in batch if request_id in locked)
+            if not request_ids:
+                return []
+
+            placeholders = ", ".join(["%s"] * len(request_ids))
+            cursor.execute(
+                f"UPDATE food_requests SET status = 'in_transit' WHERE id IN ({placeholders}) AND status = 'pending'",
+                tuple(request_ids))
+            if record_times:
+                cursor.executemany("INSERT INTO deliveries (request_id, agent_id, assigned_at) VALUES (%s, %s, %s)",
+                                   [(request_id, agent_id, assigned_at) for request_id in request_ids])
+            else:
+                cursor.executemany("INSERT INTO deliveries (request_id, agent_id) VALUES (%s, %s)",
+                                   [(request_id, agent_id) for request_id in request_ids])
+
+            if track_stats:
+                deltas = {"requests.status.pending": -len(request_ids), "requests.status.in_transit": len(request_ids)}
+                # Every new delivery starts with the column default; read it off one of them
+                cursor.execute("SELECT status FROM deliveries WHERE request_id = %s AND agent_id = %s "
+                               "ORDER BY id DESC LIMIT 1", (request_ids[0], agent_id))
+                for (delivery_status,) in cursor.fetchall():
+                    for metric, value in StatisticsRollup.status_change("deliveries.status", None, delivery_status).items():
+                        deltas[metric] = deltas.get(metric, 0) + value * len(request_ids)
+                StatisticsRollup.record(cursor, deltas)
+        return request_ids
+
     def get_agent_deliveries(self, agent_id: int):
         """
         Επιστρέφει όλες τις παραδόσεις που έχουν ανατεθεί
@@ -548,11 +901,83 @@ class Database:
         """
         return self.execute_query(sql, (agent_id,)) or []
 
+    def get_agent_open_stops(self, agent_id: int):
+        """
+        Οι ανοιχτές (μη ολοκληρωμένες) παραδόσεις του agent μαζί με τη
+        διεύθυνση του αιτήματος: (id, request_id, status, eta, delivery_address).
+        """
+        sql = """
+            SELECT d.id, d.request_id, d.status, d.eta, r.delivery_address
+            FROM deliveries d
+            JOIN food_requests r ON r.id = d.request_id
+            WHERE d.agent_id = %s AND d.status != 'completed'
+            ORDER BY d.id
+        """
+        return self.execute_query(sql, (agent_id,)) or []
+
+    def has_delivery_times(self):
+        """True once deliveries record assigned_at / completed_at (checked once per process)."""
+        if Database._delivery_times is None:
+            columns = set(self.backend.column_names(self, "deliveries"))
+            Database._delivery_times = {"assigned_at", "completed_at"} <= columns
+        return Database._delivery_times
+
+    def get_completed_delivery_times(self, limit: int):
+        """
+        Οι πιο πρόσφατες `limit` ολοκληρωμένες παραδόσεις με χρόνους:
+        (agent_id, delivery_address, assigned_at, completed_at). [] χωρίς τη migration 5.
+        """
+        if not self.has_delivery_times():
+            return []
+        sql = """
+            SELECT d.agent_id, r.delivery_address, d.assigned_at, d.completed_at
+            FROM deliveries d
+            JOIN food_requests r ON r.id = d.request_id
+            WHERE d.status = 'completed' AND d.assigned_at IS NOT NULL AND d.completed_at IS NOT NULL
+            ORDER BY d.id DESC
+            LIMIT %s
+        """
+        return self.execute_query(sql, (limit,)) or []
+
+    def get_delivery_for_eta(self, delivery_id=None, request_id=None):
+        """
+        (id, agent_id, delivery_address, status, assigned_at, eta) της παράδοσης
+        (με id ή με το αίτημά της), ή None.
+        """
+        assigned = "d.assigned_at" if self.has_delivery_times() else "NULL"
+        column, value = ("d.id", delivery_id) if delivery_id is not None else ("d.request_id", request_id)
+        rows = self.execute_query(f"""
+            SELECT d.id, d.agent_id, r.delivery_address, d.status, {assigned}, d.eta
+            FROM deliveries d
+            JOIN food_requests r ON r.id = d.request_id
+            WHERE {column} = %s
+            ORDER BY d.id DESC
+            LIMIT 1
+        """, (value,))
+        return rows[0] if rows else None
+
     def update_delivery_status(self, delivery_id: int, new_status: str, eta=None):
         """
         Ενημερώνει την κατάσταση (status) και προαιρετικά το ETA μίας παράδοσης.
         """
         sql = "UPDATE deliveries SET status=%s, eta=%s WHERE id=%s"
-        self.cursor.execute(sql, (new_status, eta, delivery_id))
-        self.connection.commit()
-        return self.cursor.rowcount == 1
+        params = (new_status, eta, delivery_id)
+        if self.has_delivery_times():
+            # Η πρώτη ολοκλήρωση κρατιέται· αν η παράδοση ξανανοίξει, η ώρα σβήνεται
+            sql = ("UPDATE deliveries SET status=%s, eta=%s, completed_at = CASE WHEN %s = 'completed' "
+                   "THEN COALESCE(completed_at, %s) ELSE NULL END WHERE id=%s")
+            params = (new_status, eta, new_status, datetime.now(), delivery_id)
+        track_stats = StatisticsRollup.enabled(self)
+        with self.transaction() as cursor:
+            old_status = None
+            if track_stats:
+                cursor.execute("SELECT status FROM deliveries WHERE id = %s FOR UPDATE", (delivery_id,))
+                row = cursor.fetchone()
+                old_status = row[0] if row else None
+
+            cursor.execute(sql, params)
+            updated = cursor.rowcount == 1
+
+            if track_stats and updated:
+                StatisticsRollup.record(cursor, StatisticsRollup.status_change("deliveries.status", old_status, new_status))
+            return updated
@@ -0,0 +1,281 @@
+# DatabaseBackend.py
+from __future__ import annotations
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+try:
+    import mysql.connector
+except ImportError:  # Only the MySQL backend needs the driver
+    mysql = None
+
+
+# Exceptions raised by any backend; use in "except DatabaseError" clauses
+DatabaseError: Tuple[type, ...] = ((mysql.connector.Error,) if mysql is not None else ()) + (sqlite3.Error,)
+
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "foodshare_sqlite.sql")
+
+
+class DatabaseBackend:
+    """
+    Connection factory plus the few statements whose SQL differs between engines.
+    Everything else in the app is written once with "%s" placeholders.
+    """
+
+    name = ""
+
+    def connect(self, **overrides) -> Any:
+        raise NotImplementedError
+
+    def table_exists(self, db, table: str) -> bool:
+        raise NotImplementedError
+
+    def index_columns(self, db, table: str) -> Dict[str, Tuple[bool, List[str]]]:
+        """{index_name: (unique, [columns in order])} for the indexes of `table`."""
+        raise NotImplementedError
+
+    def column_names(self, db, table: str) -> List[str]:
+        """Names of the columns of `table` (empty if the table does not exist)."""
+        raise NotImplementedError
+
+    def upsert_increment(self, table: str, keys: Tuple[str, ...], column: str) -> str:
+        """INSERT of keys + column that adds to `column` when the key already exists."""
+        raise NotImplementedError
+
+    def insert_ignore(self, table: str, columns: Tuple[str, ...]) -> str:
+        """INSERT of `columns` that leaves an existing row with the same key untouched."""
+        raise NotImplementedError
+
+    def full_scans(self, cursor, sql: str, params: tuple) -> List[str]:
+        """Tables that `sql` reads in full without a usable index."""
+        raise NotImplementedError
+
+
+class MySQLBackend(DatabaseBackend):
+    name = "mysql"
+
+    def __init__(self, host: str = "localhost", user: str = "root", password: str = "",
+                 database: str = "foodshare") -> None:
+        self.options = {"host": host, "user": user, "password": password, "database": database}
+
+    def connect(self, **overrides) -> Any:
+        if mysql is None:
+            raise ImportError("The MySQL backend needs mysql-connector-python (pip install mysql-connector-python)")
+        return mysql.connector.connect(**{**self.options, **overrides})
+
+    def table_exists(self, db, table: str) -> bool:
+        rows = db.execute_query(
+            "SELECT COUNT(*) FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s", (table,))
+        return bool(rows and rows[0][0])
+
+    def column_names(self, db, table: str) -> List[str]:
+        rows = db.execute_query(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s ORDER BY ordinal_position", (table,)) or []
+        return [row[0] for row in rows]
+
+    def index_columns(self, db, table: str) -> Dict[str, Tuple[bool, List[str]]]:
+        rows = db.execute_query(
+            "SELECT index_name, non_unique, column_name FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s ORDER BY index_name, seq_in_index",
+            (table,)) or []
+        indexes: Dict[str, Tuple[bool, List[str]]] = {}
+        for index_name, non_unique, column_name in rows:
+            indexes.setdefault(index_name, (not non_unique, []))[1].append(column_name)
+        return indexes
+
+    def upsert_increment(self, table: str, keys: Tuple[str, ...], column: str) -> str:
+        columns = keys + (column,)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {column} = {column} + VALUES({column})")
+
+    def insert_ignore(self, table: str, columns: Tuple[str, ...]) -> str:
+        return f"INSERT IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+    def full_scans(self, cursor, sql: str, params: tuple) -> List[str]:
+        cursor.execute("EXPLAIN " + sql, params)
+        columns = [column[0] for column in cursor.description]
+        plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return [row.get("table") for row in plan if row.get("type") == "ALL" and not row.get("possible_keys")]
+
+
+class SQLiteBackend(DatabaseBackend):
+    """
+    Embedded engine for single-node installs, CI and benchmarks. The database
+    file is created from foodshare_sqlite.sql on first use and opened in WAL
+    mode so readers never wait for the writer.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "foodshare.db", schema_path: str = SQLITE_SCHEMA,
+                 busy_timeout: float = 5.0) -> None:
+        self.path = path
+        self.schema_path = schema_path
+        self.busy_timeout = busy_timeout
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def connect(self, **overrides) -> Any:
+        # isolation_level=None: transactions are opened explicitly by SQLiteConnection
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                     check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        self._ensure_schema(connection)
+        return SQLiteConnection(connection)
+
+    def table_exists(self, db, table: str) -> bool:
+        rows = db.execute_query("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+        return bool(rows and rows[0][0])
+
+    def column_names(self, db, table: str) -> List[str]:
+        return [row[1] for row in db.execute_query(f"PRAGMA table_info({table})") or []]
+
+    def index_columns(self, db, table: str) -> Dict[str, Tuple[bool, List[str]]]:
+        indexes: Dict[str, Tuple[bool, List[str]]] = {}
+        # PRAGMA arguments cannot be bound; table names come from the migration list
+        for _, index_name, unique, *_ in db.execute_query(f"PRAGMA index_list({table})") or []:
+            columns = [row[2] for row in sorted(db.execute_query(f"PRAGMA index_info({index_name})") or [])]
+            indexes[index_name] = (bool(unique), columns)
+        return indexes
+
+    def upsert_increment(self, table: str, keys: Tuple[str, ...], column: str) -> str:
+        columns = keys + (column,)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {column} = {column} + excluded.{column}")
+
+    def insert_ignore(self, table: str, columns: Tuple[str, ...]) -> str:
+        return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+    def full_scans(self, cursor, sql: str, params: tuple) -> List[str]:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        scans = []
+        for row in cursor.fetchall():
+            match = re.match(r"SCAN (?:TABLE )?(\w+)$", row[-1])
+            if match:  # "SCAN t USING [COVERING] INDEX ..." still uses an index
+                scans.append(match.group(1))
+        return scans
+
+    def _ensure_schema(self, connection: sqlite3.Connection) -> None:
+        with self._schema_lock:
+            if not self._schema_ready:
+                with open(self.schema_path, encoding="utf-8") as schema:
+                    connection.executescript(schema.read())
+                self._schema_ready = True
+
+
+class SQLiteConnection:
+    """sqlite3 connection with the parts of the mysql.connector API the app relies on."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.raw = connection
+
+    def cursor(self) -> "SQLiteCursor":
+        return SQLiteCursor(self)
+
+    def commit(self) -> None:
+        if self.raw.in_transaction:
+            self.raw.commit()
+
+    def rollback(self) -> None:
+        if self.raw.in_transaction:
+            self.raw.rollback()
+
+    def close(self) -> None:
+        self.raw.close()
+
+    def is_connected(self) -> bool:
+        try:
+            self.raw.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+
+class SQLiteCursor:
+    """
+    Translates the MySQL flavoured statements of the app: "%s" placeholders
+    become "?" and "FOR UPDATE" is dropped. Instead of row locks, the first
+    write or locking read of a unit of work takes the database write lock
+    (BEGIN IMMEDIATE), which gives read-modify-write blocks the same
+    isolation.
+    """
+
+    def __init__(self, connection: SQLiteConnection) -> None:
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+
+    def execute(self, operation: str, params=()):
+        self._begin_if_writing(operation)
+        return self._cursor.execute(_translate(operation), tuple(params or ()))
+
+    def executemany(self, operation: str, seq_params):
+        self._begin_if_writing(operation)
+        return self._cursor.executemany(_translate(operation), [tuple(params) for params in seq_params])
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _begin_if_writing(self, operation: str) -> None:
+        if not self.connection.raw.in_transaction and _is_write(operation):
+            self._cursor.execute("BEGIN IMMEDIATE")
+
+
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH|PRAGMA|EXPLAIN)\b", re.IGNORECASE)
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _translate(operation: str) -> str:
+    return _FOR_UPDATE.sub("", operation).replace("%s", "?")
+
+
+@lru_cache(maxsize=512)
+def _is_write(operation: str) -> bool:
+    return not _READ_ONLY.match(operation) or bool(_FOR_UPDATE.search(operation))
+
+
+# Read DATETIME/TIMESTAMP/DATE columns back as datetime/date, like mysql.connector does
+def _parse_datetime(value: bytes) -> Any:
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+sqlite3.register_converter("DATETIME", _parse_datetime)
+sqlite3.register_converter("TIMESTAMP", _parse_datetime)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()[:10]))
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+
+
+def create_backend(name: str, **options) -> DatabaseBackend:
+    try:
+        return BACKENDS[name.lower()](**options)
+    except KeyError:
+        raise ValueError(f"Unknown database backend {name!r}; expected one of {sorted(BACKENDS)}") from None
+
+
+def backend_from_environment() -> DatabaseBackend:
+    """
+    FOODSHARE_DB_BACKEND selects the engine (mysql by default);
+    FOODSHARE_SQLITE_PATH is the database file of the sqlite engine.
+    """
+    name = os.environ.get("FOODSHARE_DB_BACKEND", "mysql")
+    if name.lower() == "sqlite":
+        return SQLiteBackend(os.environ.get("FOODSHARE_SQLITE_PATH", "foodshare.db"))
+    return create_backend(name)
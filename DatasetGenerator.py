@@ -0,0 +1,208 @@
+# DatasetGenerator.py
+from __future__ import annotations
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+
+STREETS = [
+    "Triwn Navarxwn", "Kanakari", "Maizonos", "Korinthou", "Agiou Nikolaou",
+    "Gounari", "Ermou", "Riga Feraiou", "Votsi", "Patreos", "Karolou",
+    "Agiou Andreou", "Othonos Amalias", "Norman", "Gerokostopoulou", "Zaimi",
+]
+FIRST_NAMES = ["George", "Maria", "Dimitris", "Eleni", "Kwstas", "Sofia", "Nikos", "Katerina",
+               "Anastasis", "Ioanna", "Giannis", "Vasiliki", "Petros", "Despoina"]
+LAST_NAMES = ["Papadopoulos", "Kwstenoglou", "Barlos", "Georgiou", "Nikolaou", "Dimitriou",
+              "Ioannou", "Vasileiou", "Athanasiou", "Christodoulou"]
+CATEGORIES = ["vegetables", "fruits", "dairy", "meat", "beverages", "sweet", "pizzas"]
+
+# Share of each role among generated users
+ROLE_WEIGHTS = {"customer": 0.80, "donor": 0.15, "dropoffagent": 0.04, "admin": 0.01}
+# Share of each request status; requests older than RECENT_DAYS are always delivered
+STATUS_WEIGHTS = {"delivered": 0.70, "in_transit": 0.12, "pending": 0.18}
+RECENT_DAYS = 3
+
+TABLES_IN_DELETE_ORDER = ["food_request_items", "reports", "deliveries", "donations",
+                          "food_requests", "inventory", "users"]
+
+
+class DatasetGenerator:
+    """
+    Fills the FoodShare schema with deterministic synthetic data for load tests.
+    Rows are written with multi-row INSERT statements of `batch_size` rows, and
+    every id is assigned here so related rows never need a read-back.
+    """
+
+    def __init__(self, cursor, placeholder: str = "%s", seed: int = 42,
+                 end_date: datetime = datetime(2025, 6, 1), days: int = 365,
+                 batch_size: int = 1000) -> None:
+        self.cursor = cursor
+        self.placeholder = placeholder
+        self.rng = random.Random(seed)
+        self.end_date = end_date
+        self.days = days
+        self.batch_size = batch_size
+        self.counts: Dict[str, int] = {}
+
+    def generate(self, users: int = 1000, items: int = 200, requests: int = 10000,
+                 donations: int = 2000) -> Dict[str, int]:
+        """Generate every table; returns the number of rows written per table."""
+        roles = self._generate_users(users)
+        item_names = self._generate_inventory(items)
+        self._generate_requests(requests, roles["customer"] or roles["admin"], roles["dropoffagent"], item_names)
+        self._generate_donations(donations, roles["donor"] or roles["admin"], item_names)
+        return dict(self.counts)
+
+    def clear(self) -> None:
+        """Delete every row from the FoodShare tables (children first)."""
+        for table in TABLES_IN_DELETE_ORDER:
+            self.cursor.execute(f"DELETE FROM {table}")
+
+    # ----------  TABLES  ----------
+    def _generate_users(self, count: int) -> Dict[str, List[int]]:
+        roles: Dict[str, List[int]] = {role: [] for role in ROLE_WEIGHTS}
+        role_names = list(ROLE_WEIGHTS)
+        role_weights = list(ROLE_WEIGHTS.values())
+
+        def rows() -> Iterator[tuple]:
+            for user_id in range(1, count + 1):
+                # Guarantee at least one user per role before sampling
+                role = role_names[user_id - 1] if user_id <= len(role_names) else \
+                    self.rng.choices(role_names, role_weights)[0]
+                roles[role].append(user_id)
+                name, surname = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+                yield (user_id, name, surname, f"user{user_id}", f"user{user_id}@example.com",
+                       f"69{self.rng.randrange(10 ** 8):08d}", "Password1!",
+                       self._timestamp(self._random_time()), role)
+
+        self._insert("users", ("id", "name", "surname", "username", "email", "phone", "password",
+                               "created_at", "role"), rows())
+        return roles
+
+    def _generate_inventory(self, count: int) -> List[str]:
+        names = [f"Item {item_id:06d}" for item_id in range(1, count + 1)]
+        rows = ((item_id, name, f"Synthetic {name.lower()}", self.rng.choice(CATEGORIES),
+                 int(self.rng.expovariate(1 / 30)))
+                for item_id, name in enumerate(names, 1))
+        self._insert("inventory", ("item_id", "item_name", "description", "category", "quantity"), rows)
+        return names
+
+    def _generate_requests(self, count: int, customers: Sequence[int], agents: Sequence[int],
+                           item_names: Sequence[str]) -> None:
+        statuses = list(STATUS_WEIGHTS)
+        status_weights = list(STATUS_WEIGHTS.values())
+        recent_cutoff = self.end_date - timedelta(days=RECENT_DAYS)
+        delivery_id = 0
+
+        # Requests are generated one batch at a time so memory stays flat,
+        # and each batch is written before its items and deliveries (foreign keys)
+        for first_id in range(1, count + 1, self.batch_size):
+            requests: List[tuple] = []
+            request_items: List[tuple] = []
+            deliveries: List[tuple] = []
+
+            for request_id in range(first_id, min(first_id + self.batch_size, count + 1)):
+                created = self._random_time()
+                status = self.rng.choices(statuses, status_weights)[0] if created >= recent_cutoff else "delivered"
+
+                requests.append((request_id, self.rng.choice(customers), self._address(),
+                                 self.rng.randint(1, 8), status,
+                                 "Delivered" if status == "delivered" else "Not Delivered/Pending",
+                                 self._timestamp(created)))
+
+                for item_name in self.rng.sample(item_names, min(len(item_names), self.rng.randint(1, 5))):
+                    request_items.append((request_id, item_name, self.rng.randint(1, 4)))
+
+                if status != "pending" and agents:
+                    delivery_id += 1
+                    eta = created + timedelta(minutes=self.rng.randint(20, 180))
+                    deliveries.append((delivery_id, request_id, self.rng.choice(agents),
+                                       "completed" if status == "delivered" else "in_transit",
+                                       self._timestamp(eta)))
+
+            self._insert("food_requests", ("id", "customer_id", "delivery_address", "number_of_people",
+                                           "status", "delivery_status", "created_at"), requests)
+            self._insert("food_request_items", ("request_id", "item_name", "quantity"), request_items)
+            self._insert("deliveries", ("id", "request_id", "agent_id", "status", "eta"), deliveries)
+
+    def _generate_donations(self, count: int, donors: Sequence[int], item_names: Sequence[str]) -> None:
+        rows = ((donation_id, self.rng.choice(donors), self.rng.choice(item_names),
+                 self.rng.randint(1, 50), self._timestamp(self._random_time()))
+                for donation_id in range(1, count + 1))
+        self._insert("donations", ("id", "donor_id", "item_name", "quantity", "donation_date"), rows)
+
+    # ----------  HELPERS  ----------
+    def _insert(self, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> None:
+        """Multi-row INSERT of `rows`, `batch_size` rows per statement."""
+        row_sql = "(" + ", ".join([self.placeholder] * len(columns)) + ")"
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        batch: List[tuple] = []
+
+        def flush() -> None:
+            if batch:
+                params = [value for row in batch for value in row]
+                self.cursor.execute(prefix + ", ".join([row_sql] * len(batch)), params)
+                self.counts[table] = self.counts.get(table, 0) + len(batch)
+                batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                flush()
+        flush()
+
+    def _random_time(self) -> datetime:
+        # Volume grows towards the end of the window (triangular distribution)
+        offset = self.rng.triangular(0, self.days * 86400, self.days * 86400)
+        return self.end_date - timedelta(days=self.days) + timedelta(seconds=int(offset))
+
+    def _address(self) -> str:
+        return f"{self.rng.choice(STREETS)} {self.rng.randint(1, 200)}"
+
+    @staticmethod
+    def _timestamp(value: datetime) -> str:
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Load-test data: python DatasetGenerator.py --sqlite foodshare.db --requests 1000000
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description="Fill the FoodShare schema with synthetic data")
+    parser.add_argument("--sqlite", metavar="PATH", help="SQLite file to create/fill (default: the MySQL database)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--donations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reset", action="store_true", help="Delete existing rows first")
+    args = parser.parse_args()
+
+    volumes = dict(users=args.users, items=args.items, requests=args.requests, donations=args.donations)
+    options = dict(seed=args.seed, days=args.days, batch_size=args.batch_size)
+
+    if args.sqlite:
+        connection = sqlite3.connect(args.sqlite)
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "foodshare_sqlite.sql")
+        with open(schema_path, encoding="utf-8") as schema:
+            connection.executescript(schema.read())
+        generator = DatasetGenerator(connection.cursor(), placeholder="?", **options)
+        if args.reset:
+            generator.clear()
+        counts = generator.generate(**volumes)
+        connection.commit()
+        connection.close()
+    else:
+        from Database import Database
+        with Database().transaction() as cursor:
+            generator = DatasetGenerator(cursor, **options)
+            if args.reset:
+                generator.clear()
+            counts = generator.generate(**volumes)
+
+    for table, rows in counts.items():
+        print(f"{table}: {rows} rows")
@@ -1,6 +1,9 @@
 # DeliveryController.py
 from datetime import datetime
 from Database import Database
+from EtaModel import EtaModel
+from Geocoding import Geocoder, PendingRequestIndex
+from RoutePlanner import TIME_BUDGET, plan_route
 
 class DeliveryController:
 
@@ -8,6 +11,8 @@ class DeliveryController:
 
     def __init__(self):
         self.db = Database()
+        self._geocoder = None # Geocoder, created on first use
+        self._nearby = None # PendingRequestIndex, built on first use
 
     # ----------  QUERY  ----------
     def list_my_deliveries(self, agent_id):
@@ -30,6 +35,11 @@ class DeliveryController:
                 return False, "ETA format must be YYYY-MM-DD HH:MM"
 
         ok = self.db.update_delivery_status(delivery_id, new_status, eta)
+        if ok and eta is None and new_status != "completed":
+            # Η πρόβλεψη μόνο εμφανίζεται· το deliveries.eta κρατά μόνο ό,τι έδωσε ο agent
+            predicted = self.predict_eta(delivery_id)
+            if predicted is not None:
+                return ok, f"Delivery updated (predicted ETA {predicted:%Y-%m-%d %H:%M})."
         return (ok, "Delivery updated." if ok else "Update failed.")
         # ----------  AVAILABLE REQUESTS  ----------
 
@@ -41,8 +51,8 @@ class DeliveryController:
         """Αναθέτει το request στον agent και ενημερώνει την κατάσταση."""
         return self.db.assign_request_to_agent(request_id, agent_id)
 
-    def list_available_requests(self):
-        rows = self.db.list_available_requests()
+    def list_available_requests(self, limit=None):
+        rows = self.db.list_available_requests(limit) or []
         return [
             {"request_id": r_id, "customer_id": c_id,
              "address": addr, "people": ppl}
@@ -50,5 +60,115 @@ class DeliveryController:
         ]
 
     def assign_request(self, request_id, agent_id):
-        ok = self.db.assign_request_to_agent(request_id, agent_id)
-        return (ok, "Assigned successfully." if ok else "Assignment failed.")
\ No newline at end of file
+        try:
+            won = self.db.claim_request(request_id, agent_id)
+        except Exception as err:
+            print(f"DB-error assign_request: {err}")
+            return False, "Assignment failed."
+        return (won, "Assigned successfully." if won else "Request was already taken by another agent.")
+
+    def claim_next(self, agent_id, count=1, candidates=None):
+        """
+        Claims up to `count` pending requests in one transaction: the oldest
+        ones, or the `candidates` ids in the given order (e.g. nearest first).
+        Returns the request ids that were won.
+        """
+        try:
+            return self.db.claim_requests(agent_id, count, candidates)
+        except Exception as err:
+            print(f"DB-error claim_next: {err}")
+            return []
+
+    # ----------  NEARBY  ----------
+    def locate(self, location):
+        """(lat, lon) of an address, or the given (lat, lon) itself; None if the address is unknown."""
+        if isinstance(location, str):
+            return self.geocoder().geocode(location)
+        return location
+
+    def list_requests_near(self, location, radius_km):
+        """
+        Pending requests within `radius_km` of `location` (address or (lat, lon)),
+        nearest first, each with its "distance_km". One query refreshes the
+        pending list; the radius search itself runs on the in-memory grid.
+        """
+        center = self.locate(location)
+        if center is None:
+            return []
+        index = self._nearby_index()
+        index.refresh(self.list_available_requests())
+        return [dict(request, distance_km=distance) for distance, request in index.near(center, radius_km)]
+
+    def claim_nearest(self, agent_id, location, count=1, radius_km=None):
+        """Claims the `count` pending requests nearest to `location` (within `radius_km` if given)."""
+        center = self.locate(location)
+        if center is None:
+            return []
+        index = self._nearby_index()
+        index.refresh(self.list_available_requests())
+        nearest = index.index.nearest(center, count * 3, radius_km) # Spares for requests other agents win first
+        return self.claim_next(agent_id, count, [request_id for _, request_id in nearest])
+
+    def geocoder(self):
+        if self._geocoder is None:
+            self._geocoder = Geocoder(self.db)
+        return self._geocoder
+
+    def _nearby_index(self):
+        if self._nearby is None:
+            self._nearby = PendingRequestIndex(self.geocoder())
+        return self._nearby
+
+    # ----------  ROUTE  ----------
+    def plan_route(self, agent_id, start=None, time_budget=TIME_BUDGET):
+        """
+        Σειρά επίσκεψης των ανοιχτών παραδόσεων του agent (nearest neighbour + 2-opt,
+        το πολύ `time_budget` δευτερόλεπτα). `start`: διεύθυνση ή (lat, lon) αφετηρίας·
+        χωρίς αυτή η διαδρομή ξεκινά από όποια στάση τη συντομεύει.
+        Επιστρέφει {"stops", "unlocated", "km", "initial_km", "ms"}· κάθε στάση έχει
+        "stop" (1, 2, ...) και "leg_km" (απόσταση από την προηγούμενη).
+        """
+        deliveries = [
+            {"delivery_id": d_id, "request_id": r_id, "status": status, "eta": eta, "address": address}
+            for d_id, r_id, status, eta, address in self.db.get_agent_open_stops(agent_id)
+        ]
+        points = self.geocoder().geocode_many(d["address"] or "" for d in deliveries)
+        located = [d for d in deliveries if points.get(d["address"] or "")]
+        unlocated = [d for d in deliveries if not points.get(d["address"] or "")]
+
+        origin = self.locate(start) if start is not None else None
+        plan = plan_route([(d["delivery_id"], points[d["address"]]) for d in located], origin, time_budget)
+        by_id = {d["delivery_id"]: d for d in located}
+        stops = [dict(by_id[d_id], stop=number, leg_km=leg)
+                 for number, (d_id, leg) in enumerate(zip(plan.order, plan.legs), start=1)]
+        return {"stops": stops, "unlocated": unlocated, "km": plan.km,
+                "initial_km": plan.initial_km, "ms": plan.elapsed_ms}
+
+    # ----------  ETA  ----------
+    def predict_eta(self, delivery_id=None, request_id=None):
+        """
+        Προβλεπόμενη ώρα ολοκλήρωσης μιας παράδοσης (με id ή με το αίτημά της)
+        από το EtaModel· None αν δεν υπάρχει παράδοση ή ιστορικό.
+        """
+        delivery = self.db.get_delivery_for_eta(delivery_id, request_id)
+        model = EtaModel.shared(self.db) if delivery else None
+        if model is None:
+            return None
+        _, agent_id, address, _, assigned_at, _ = delivery
+        return model.predict_eta(agent_id, address or "", assigned_at)
+
+    def estimate_request_eta(self, request_id):
+        """
+        (eta, predicted) για το αίτημα ενός πελάτη: το ETA του agent αν έχει
+        δοθεί, αλλιώς η πρόβλεψη· (None, False) για αιτήματα χωρίς παράδοση.
+        """
+        delivery = self.db.get_delivery_for_eta(request_id=request_id)
+        if delivery is None or delivery[3] == "completed":
+            return None, False
+        _, agent_id, address, _, assigned_at, eta = delivery
+        if eta:
+            return eta, False
+        model = EtaModel.shared(self.db)
+        if model is None:
+            return None, False
+        return model.predict_eta(agent_id, address or "", assigned_at), True
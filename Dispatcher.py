@@ -0,0 +1,261 @@
+# Dispatcher.py
+from __future__ import annotations
+import heapq
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from DeliveryController import DeliveryController
+from Geocoding import Geocoder, SpatialIndex
+
+
+class DispatchPolicy:
+    """
+    Decides which agent gets which pending request.
+
+    plan(requests, loads, capacity) receives the pending requests oldest first
+    (dicts from DeliveryController.list_available_requests), the open
+    deliveries per agent and the most open deliveries an agent may have, and
+    returns {agent_id: [request ids in claim order]}. Policies only plan; the
+    Dispatcher claims the result.
+    """
+
+    name = ""
+
+    def plan(self, requests: List[Dict[str, Any]], loads: Dict[int, int],
+             capacity: int) -> Dict[int, List[int]]:
+        raise NotImplementedError
+
+
+class OldestFirstPolicy(DispatchPolicy):
+    """Oldest requests first, dealt round-robin to the agents that still have room."""
+
+    name = "oldest-first"
+
+    def plan(self, requests, loads, capacity):
+        room = {agent_id: capacity - load for agent_id, load in sorted(loads.items()) if load < capacity}
+        plan: Dict[int, List[int]] = {}
+        agents = list(room)
+        turn = 0
+        for request in requests:
+            if not agents:
+                break
+            agent_id = agents[turn % len(agents)]
+            plan.setdefault(agent_id, []).append(request["request_id"])
+            room[agent_id] -= 1
+            if room[agent_id] == 0:
+                agents.remove(agent_id)  # The next agent moves into this turn
+            else:
+                turn += 1
+        return plan
+
+
+class LeastLoadedPolicy(DispatchPolicy):
+    """Oldest requests first, each to the agent with the fewest open deliveries at that moment."""
+
+    name = "least-loaded"
+
+    def plan(self, requests, loads, capacity):
+        heap = [(load, agent_id) for agent_id, load in loads.items() if load < capacity]
+        heapq.heapify(heap)
+        plan: Dict[int, List[int]] = {}
+        for request in requests:
+            if not heap:
+                break
+            load, agent_id = heapq.heappop(heap)
+            plan.setdefault(agent_id, []).append(request["request_id"])
+            if load + 1 < capacity:
+                heapq.heappush(heap, (load + 1, agent_id))
+        return plan
+
+
+class GeographicClusterPolicy(DispatchPolicy):
+    """
+    Keeps an agent's batch in one area: requests are grouped by `area(request)`
+    (by default the 1 km grid cell of the geocoded address, see GridArea), the
+    clusters are taken in the order of their oldest request and each cluster
+    goes to the least loaded agent, spilling over to the next one when that
+    agent is full.
+    """
+
+    name = "geographic"
+
+    def __init__(self, area: Callable[[Dict[str, Any]], Any] | None = None) -> None:
+        self.area = area or GridArea()
+
+    def plan(self, requests, loads, capacity):
+        if hasattr(self.area, "prepare"):
+            self.area.prepare(requests)
+        clusters: Dict[Any, List[int]] = {}
+        for request in requests:  # dicts keep the order of each cluster's oldest request
+            clusters.setdefault(self.area(request), []).append(request["request_id"])
+
+        heap = [(load, agent_id) for agent_id, load in loads.items() if load < capacity]
+        heapq.heapify(heap)
+        plan: Dict[int, List[int]] = {}
+        for request_ids in clusters.values():
+            while request_ids and heap:
+                load, agent_id = heapq.heappop(heap)
+                taken = request_ids[:capacity - load]
+                del request_ids[:len(taken)]
+                plan.setdefault(agent_id, []).extend(taken)
+                if load + len(taken) < capacity:
+                    heapq.heappush(heap, (load + len(taken), agent_id))
+            if not heap:
+                break
+        return plan
+
+
+_HOUSE_NUMBER = re.compile(r"\s*\d+\w*\s*$")
+
+
+def street_of(request: Dict[str, Any]) -> str:
+    """Area key of a request: its address without the trailing house number, lower-cased."""
+    return _HOUSE_NUMBER.sub("", (request.get("address") or "").strip()).lower()
+
+
+class GridArea:
+    """
+    Area key of a request from its geocoded position: the cell of a
+    `cell_km` grid. Addresses that cannot be geocoded fall back to their street.
+    """
+
+    def __init__(self, geocoder: Geocoder | None = None, cell_km: float = 1.0) -> None:
+        self.geocoder = geocoder
+        self.cell_km = cell_km
+        self.grid: SpatialIndex | None = None
+
+    def prepare(self, requests: List[Dict[str, Any]]) -> None:
+        """Geocode a whole batch at once, so the per-request calls hit the memory cache."""
+        if self.geocoder is None:
+            self.geocoder = Geocoder()  # Created on first use: it opens the database and reads the street file
+        self.geocoder.geocode_many(request.get("address") or "" for request in requests)
+
+    def __call__(self, request: Dict[str, Any]) -> Any:
+        if self.geocoder is None:
+            self.prepare([request])
+        point = self.geocoder.geocode(request.get("address") or "")
+        if point is None:
+            return street_of(request)
+        if self.grid is None:
+            self.grid = SpatialIndex(self.cell_km, reference_latitude=point[0])
+        return self.grid.cell_of(point)
+
+
+POLICIES: Dict[str, Callable[[], DispatchPolicy]] = {
+    OldestFirstPolicy.name: OldestFirstPolicy,
+    LeastLoadedPolicy.name: LeastLoadedPolicy,
+    GeographicClusterPolicy.name: GeographicClusterPolicy,
+}
+
+
+class Dispatcher:
+    """
+    Assigns pending requests to drop-off agents automatically.
+
+    Every run reads at most `batch_size` of the oldest pending requests and
+    the open load of every agent (two queries), lets the policy plan, and
+    claims each agent's share in one transaction (DeliveryController.claim_next).
+    Requests an agent took by hand in the meantime are simply not won. The
+    batch bound keeps a run short however long the queue is; start() repeats
+    it every `interval` seconds, immediately again while the queue is not
+    drained, so requests are picked up within seconds.
+    """
+
+    def __init__(self, policy: DispatchPolicy | str = "least-loaded", batch_size: int = 200,
+                 capacity: int = 10, interval: float = 2.0, controller: DeliveryController | None = None,
+                 on_round: Callable[[Dict[str, Any]], None] | None = None) -> None:
+        self.policy = POLICIES[policy]() if isinstance(policy, str) else policy
+        self.batch_size = batch_size
+        self.capacity = capacity  # Most open deliveries one agent is given
+        self.interval = interval
+        self.controller = controller or DeliveryController()
+        self.on_round = on_round  # Called with the result of every background round
+        self.last_run: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> Dict[str, Any]:
+        """One dispatch round. Returns what was pending, planned and assigned, and how long it took."""
+        started = time.perf_counter()
+        requests = self.controller.list_available_requests(self.batch_size)
+        loads = self.controller.db.get_open_delivery_loads() if requests else {}
+        plan = self.policy.plan(requests, loads, self.capacity) if requests else {}
+
+        assigned: Dict[int, List[int]] = {}
+        for agent_id, request_ids in plan.items():
+            won = self.controller.claim_next(agent_id, len(request_ids), request_ids)
+            if won:
+                assigned[agent_id] = won
+
+        self.last_run = {
+            "policy": self.policy.name,
+            "pending": len(requests),
+            "planned": sum(len(request_ids) for request_ids in plan.values()),
+            "assigned": sum(len(request_ids) for request_ids in assigned.values()),
+            "agents": len(assigned),
+            "queue_full": len(requests) == self.batch_size,  # More may be waiting behind this batch
+            "ms": (time.perf_counter() - started) * 1000,
+            "assignments": assigned,
+        }
+        return self.last_run
+
+    # ----------  PERIODIC JOB  ----------
+    def start(self) -> None:
+        """Run in a background thread until stop()."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="Dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                if self.on_round is not None:
+                    self.on_round(result)
+            except Exception as err:
+                print(f"Dispatch round failed: {err}")
+                result = {}
+            # Go again right away while full batches keep being assigned
+            busy = result.get("queue_full") and result.get("assigned")
+            if not busy:
+                self._stop.wait(self.interval)
+
+
+# Dispatch job: python Dispatcher.py [--policy NAME] [--once]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Assign pending requests to drop-off agents")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="least-loaded")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=10, help="Most open deliveries per agent")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between rounds")
+    parser.add_argument("--once", action="store_true", help="Run a single round and exit")
+    args = parser.parse_args()
+
+    def report(result: Dict[str, Any]) -> None:
+        if result["pending"] or args.once:
+            print(f"[{result['policy']}] pending={result['pending']} assigned={result['assigned']} "
+                  f"to {result['agents']} agents in {result['ms']:.1f}ms")
+
+    dispatcher = Dispatcher(args.policy, args.batch_size, args.capacity, args.interval, on_round=report)
+    if args.once:
+        report(dispatcher.run_once())
+    else:
+        print(f"Dispatching every {args.interval}s with the {args.policy} policy (Ctrl+C to stop)")
+        dispatcher.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            dispatcher.stop()
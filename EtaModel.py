@@ -0,0 +1,233 @@
+# EtaModel.py
+from __future__ import annotations
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy no ETA is predicted; agents type it as before
+    np = None
+
+from Geocoding import normalize_address
+
+SLOT_HOURS = 4  # Time of day in six slots of four hours
+SLOTS = 24 // SLOT_HOURS
+SHRINKAGE = 5  # Pseudo-deliveries that pull a rarely seen agent or area toward the average
+MIN_MINUTES, MAX_MINUTES = 1, 24 * 60  # Durations outside are clipped (forgotten status updates)
+TRAINING_LIMIT = 50_000  # Most recent completed deliveries learned from
+RETRAIN_SECONDS = 600
+MIN_REMAINING = timedelta(minutes=5)  # An overdue delivery is still predicted a little in the future
+
+
+def area_of(address: str) -> str:
+    """Area of an address: its normalized street (see Geocoding.normalize_address)."""
+    return normalize_address(address or "")[0]
+
+
+class EtaModel:
+    """
+    Delivery time (assignment -> completion) learned from completed deliveries.
+
+    log(minutes) = time-of-day slot mean + agent effect + area effect. Each
+    term is the mean of what the previous ones leave unexplained, shrunk
+    toward 0 by SHRINKAGE pseudo-deliveries, so a new agent or street gets the
+    average. Fitting is a handful of np.bincount passes over the history;
+    predicting is three dict lookups, memoized per (agent, area, slot).
+    """
+
+    _shared: "EtaModel | None" = None
+    _shared_lock = threading.Lock()
+    _training = False  # A background retrain is running
+
+    def __init__(self, agents: Sequence[int], addresses: Sequence[str], assigned: Sequence[Any],
+                 completed: Sequence[Any], area: Callable[[str], str] = area_of) -> None:
+        if np is None:
+            raise ImportError("EtaModel needs NumPy (pip install numpy)")
+        self.area = area
+        self.trained_at = time.monotonic()
+        self.count = len(agents)
+        self._cache: Dict[Tuple[int, str, int], float] = {}
+        self._areas: Dict[str, str] = {}  # address -> area
+
+        # Seconds since a naive epoch: local wall-clock time, like the stored values
+        assigned_at, completed_at = _seconds(assigned), _seconds(completed)
+        minutes = (completed_at - assigned_at) / 60
+        log_minutes = np.log(np.clip(minutes, MIN_MINUTES, MAX_MINUTES))
+        slots = (assigned_at // 3600 % 24 // SLOT_HOURS).astype(np.int64)
+
+        # Agents and areas get dense codes; the area of each distinct address is worked out once
+        agent_ids, agent_codes = np.unique(np.asarray(agents, dtype=np.int64), return_inverse=True)
+        area_codes_of: Dict[str, int] = {}
+        area_names: List[str] = []
+        address_codes: Dict[str, int] = {}
+        for address in addresses:
+            if address not in address_codes:
+                name = area(address)
+                if name not in area_codes_of:
+                    area_codes_of[name] = len(area_names)
+                    area_names.append(name)
+                address_codes[address] = area_codes_of[name]
+                self._areas[address] = name
+        area_codes = np.fromiter((address_codes[address] for address in addresses), dtype=np.int64,
+                                 count=len(addresses))
+
+        self.average = float(log_minutes.mean()) if self.count else 0.0
+        slot_means = self._effects(slots, log_minutes - self.average, SLOTS) + self.average
+        residuals = log_minutes - slot_means[slots]
+        agent_effects = self._effects(agent_codes, residuals, len(agent_ids))
+        residuals -= agent_effects[agent_codes]
+        area_effects = self._effects(area_codes, residuals, len(area_names))
+
+        self.slot_means: List[float] = slot_means.tolist()
+        self.agent_effects: Dict[int, float] = dict(zip(agent_ids.tolist(), agent_effects.tolist()))
+        self.area_effects: Dict[str, float] = dict(zip(area_names, area_effects.tolist()))
+
+    @staticmethod
+    def _effects(codes: Any, values: Any, size: int) -> Any:
+        """Per-code mean of `values`, shrunk toward 0."""
+        return (np.bincount(codes, weights=values, minlength=size)
+                / (np.bincount(codes, minlength=size) + SHRINKAGE))
+
+    @classmethod
+    def load(cls, db, limit: int = TRAINING_LIMIT, area: Callable[[str], str] = area_of) -> "EtaModel":
+        """Learn from the latest `limit` completed deliveries (one query)."""
+        rows = db.get_completed_delivery_times(limit)
+        columns = tuple(zip(*rows)) if rows else ((), (), (), ())
+        return cls(*columns, area=area)
+
+    @classmethod
+    def shared(cls, db) -> "EtaModel | None":
+        """
+        The process-wide model; None without NumPy or without any history.
+        Training runs on a background thread, first on first use and again
+        once the model is RETRAIN_SECONDS old, so callers (the Tk thread
+        too) never wait for it: until the first model is ready there is no
+        prediction, and while a retrain runs the previous model is served.
+        """
+        if np is None:
+            return None
+        with cls._shared_lock:
+            model = cls._shared
+            stale = model is None or time.monotonic() - model.trained_at > RETRAIN_SECONDS
+            if stale and not cls._training:
+                cls._training = True
+                threading.Thread(target=cls._retrain, args=(db,), name="EtaModel", daemon=True).start()
+        return model if model is not None and model.count else None
+
+    @classmethod
+    def _retrain(cls, db) -> None:
+        try:
+            model = cls.load(db)
+        except Exception as err:  # Keep serving the previous model; the next call tries again
+            print(f"Error training the ETA model: {err}")
+            model = None
+        with cls._shared_lock:
+            if model is not None:
+                cls._shared = model
+            cls._training = False
+
+    # ----------  PREDICTION  ----------
+    def predict_minutes(self, agent_id: int, address: str, assigned_at: datetime | None = None) -> float:
+        """Expected minutes from assignment to completion."""
+        area = self._areas.get(address)
+        if area is None:
+            area = self._areas[address] = self.area(address)
+        slot = (assigned_at or datetime.now()).hour // SLOT_HOURS
+        key = (agent_id, area, slot)
+        minutes = self._cache.get(key)
+        if minutes is None:
+            log_minutes = (self.slot_means[slot] + self.agent_effects.get(agent_id, 0.0)
+                           + self.area_effects.get(area, 0.0))
+            minutes = self._cache[key] = float(np.exp(log_minutes))
+        return minutes
+
+    def predict_eta(self, agent_id: int, address: str, assigned_at: datetime | None = None,
+                    now: datetime | None = None) -> datetime:
+        """Expected completion time; never earlier than MIN_REMAINING from `now`."""
+        now = now or datetime.now()
+        start = assigned_at or now
+        eta = start + timedelta(minutes=self.predict_minutes(agent_id, address, start))
+        return max(eta, now + MIN_REMAINING).replace(second=0, microsecond=0)
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _seconds(values: Sequence[Any]) -> Any:
+    """Seconds since _EPOCH of datetimes (or ISO strings); far faster than converting to datetime64."""
+    def since_epoch(value: Any) -> float:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+        return (moment - _EPOCH).total_seconds()
+
+    return np.fromiter(map(since_epoch, values), dtype=float, count=len(values))
+
+
+def benchmark(deliveries: int = 100_000, seed: int = 42) -> Dict[str, float]:
+    """
+    Fit time, prediction time and accuracy on synthetic deliveries whose
+    duration depends on agent, street and time of day (no database involved).
+    Accuracy is the median absolute error in minutes on held-out deliveries,
+    against always predicting the overall median.
+    """
+    from DatasetGenerator import STREETS
+
+    rng = random.Random(seed)
+    agent_speed = {agent_id: rng.uniform(0.7, 1.4) for agent_id in range(1, 41)}
+    street_distance = {street: rng.uniform(0.6, 1.6) for street in STREETS}
+    rush = [0.9, 0.8, 1.3, 1.1, 1.4, 1.0]  # Per slot
+    start = datetime(2025, 1, 1)
+
+    rows = []
+    for _ in range(int(deliveries * 1.25)):
+        agent_id = rng.choice(list(agent_speed))
+        street = rng.choice(STREETS)
+        assigned = start + timedelta(minutes=rng.randrange(180 * 24 * 60))
+        minutes = 40 * agent_speed[agent_id] * street_distance[street] * rush[assigned.hour // SLOT_HOURS]
+        minutes *= rng.lognormvariate(0, 0.25)
+        rows.append((agent_id, f"{street} {rng.randint(1, 200)}", assigned, assigned + timedelta(minutes=minutes)))
+    train, test = rows[:deliveries], rows[deliveries:]
+
+    began = time.perf_counter()
+    model = EtaModel(*zip(*train))
+    fit_ms = (time.perf_counter() - began) * 1000
+
+    began = time.perf_counter()
+    predicted = [model.predict_minutes(agent_id, address, assigned) for agent_id, address, assigned, _ in test]
+    predict_us = (time.perf_counter() - began) * 1e6 / len(test)
+
+    actual = np.array([(completed - assigned).total_seconds() / 60 for _, _, assigned, completed in test])
+    median = float(np.median([(completed - assigned).total_seconds() / 60 for _, _, assigned, completed in train]))
+    return {"deliveries": deliveries, "fit_ms": fit_ms, "predict_us": predict_us,
+            "model_error": float(np.median(np.abs(np.array(predicted) - actual))),
+            "median_error": float(np.median(np.abs(median - actual)))}
+
+
+# ETA commands: python EtaModel.py train | python EtaModel.py benchmark [--deliveries N]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Delivery time model")
+    parser.add_argument("command", choices=["train", "benchmark"])
+    parser.add_argument("--deliveries", type=int, default=100_000, help="Synthetic deliveries for the benchmark")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        from Database import Database
+
+        began = time.perf_counter()
+        model = EtaModel.load(Database())
+        if not model.count:
+            print("No completed deliveries with assignment and completion times yet "
+                  "(apply migration 5 and complete some deliveries).")
+        else:
+            print(f"Learned from {model.count} deliveries in {(time.perf_counter() - began) * 1000:.0f}ms")
+            for slot, mean in enumerate(model.slot_means):
+                print(f"  {slot * SLOT_HOURS:02d}:00-{(slot + 1) * SLOT_HOURS:02d}:00  {np.exp(mean):5.0f} min")
+    else:
+        result = benchmark(args.deliveries)
+        print(f"{result['deliveries']} deliveries: fit {result['fit_ms']:.0f}ms, "
+              f"predict {result['predict_us']:.1f}us per delivery; median error "
+              f"{result['model_error']:.1f} min (overall median alone: {result['median_error']:.1f} min)")
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from DeliveryController import DeliveryController
+from GUI.KeyedTreeview import KeyedTreeview
 
 class AvailableRequestsScreen:
     """Λίστα τρεχόντων (pending) αιτημάτων και ανάθεση σε Drop-off Agent."""
@@ -12,7 +13,9 @@ class AvailableRequestsScreen:
 
         self.win = tk.Toplevel(parent)
         self.win.title("Available Requests")
-        self.win.geometry("560x420")
+        self.win.geometry("620x460")
+        self.near_address = tk.StringVar()
+        self.near_km = tk.StringVar(value="2")
 
         self._build_ui()
         self.refresh()
@@ -24,13 +27,25 @@ class AvailableRequestsScreen:
         ttk.Label(self.win, text="Pending Food-Requests",
                   font=("Helvetica", 15, "bold")).pack(pady=8)
 
-        cols = ("Request ID", "Customer ID", "Address", "People")
+        # Φίλτρο απόστασης: μόνο τα αιτήματα κοντά σε μια διεύθυνση
+        near = ttk.Frame(self.win)
+        near.pack(fill="x", padx=10, pady=(0, 6))
+        ttk.Label(near, text="Near:").pack(side="left")
+        ttk.Entry(near, textvariable=self.near_address, width=28).pack(side="left", padx=4)
+        ttk.Spinbox(near, from_=0.5, to=50, increment=0.5, width=5,
+                    textvariable=self.near_km).pack(side="left")
+        ttk.Label(near, text="km").pack(side="left", padx=(2, 8))
+        ttk.Button(near, text="Κοντά μου", command=self.refresh).pack(side="left")
+        ttk.Button(near, text="Όλα", command=self.show_all).pack(side="left", padx=4)
+
+        cols = ("Request ID", "Customer ID", "Address", "People", "Km")
         self.tree = ttk.Treeview(self.win, columns=cols,
                                  show="headings", height=12)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, anchor="center")
         self.tree.pack(fill="both", expand=True, padx=10)
+        self.rows = KeyedTreeview(self.tree)  # κλειδί: Request ID
 
         ttk.Button(self.win, text="Assign selected to me",
                    command=self.on_assign).pack(pady=12)
@@ -39,12 +54,30 @@ class AvailableRequestsScreen:
     # Data helpers
     # ------------------------------------------------------------
     def refresh(self):
-        """Ανανεώνει τη λίστα με τα διαθέσιμα αιτήματα."""
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        """Ανανεώνει τη λίστα με τα διαθέσιμα αιτήματα (κοντινότερα πρώτα, αν υπάρχει φίλτρο)."""
+        address = self.near_address.get().strip()
+        if address:
+            try:
+                radius = float(self.near_km.get())
+            except ValueError:
+                messagebox.showwarning("Near", "Η απόσταση πρέπει να είναι αριθμός (km).")
+                return
+            if self.ctrl.locate(address) is None:
+                messagebox.showwarning("Near", f"Η διεύθυνση '{address}' δεν βρέθηκε.")
+                return
+            rows = self.ctrl.list_requests_near(address, radius)
+        else:
+            rows = self.ctrl.list_available_requests()
+
+        # Μόνο οι αλλαγές (νέα / αλλαγμένα / αφαιρεμένα αιτήματα) περνούν στο Treeview
+        self.rows.update(
+            (r["request_id"], r["customer_id"], r["address"], r["people"],
+             f"{r['distance_km']:.1f}" if "distance_km" in r else "")
+            for r in rows)
 
-        for r_id, c_id, addr, ppl in self.ctrl.list_available_requests():
-            self.tree.insert("", "end", values=(r_id, c_id, addr, ppl))
+    def show_all(self):
+        self.near_address.set("")
+        self.refresh()
 
     def on_assign(self):
         sel = self.tree.selection()
@@ -52,10 +85,12 @@ class AvailableRequestsScreen:
             messagebox.showwarning("No selection", "Διάλεξε πρώτα ένα αίτημα.")
             return
 
-        request_id = self.tree.item(sel[0])["values"][0]
-        ok = self.ctrl.assign_request(request_id, self.agent_id)
+        request_id = self.rows.values(sel[0])[0]
+        ok, message = self.ctrl.assign_request(request_id, self.agent_id)
 
-        messagebox.showinfo("Assign",
-                            "Ανάθεση ολοκληρώθηκε!" if ok else "Η ανάθεση απέτυχε.")
         if ok:
-            self.refresh()
+            messagebox.showinfo("Assign", "Ανάθεση ολοκληρώθηκε!")
+        else:
+            messagebox.showwarning("Assign", f"Η ανάθεση απέτυχε: {message}")
+        # Ανανέωση και σε αποτυχία: μπορεί το αίτημα να το πήρε ήδη άλλος agent
+        self.refresh()
@@ -0,0 +1,137 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+_executor_lock = threading.Lock()
+WORKER_THREADS = 4 # Controller calls running at the same time across all screens
+POLL_MS = 25 # How often the Tk thread checks for finished work while some is pending
+
+
+def shared_executor():
+    """Worker threads shared by every screen (created on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="FoodShareWorker")
+        return _executor
+
+
+class TkDispatcher:
+    """
+    Hands callbacks from worker threads to the Tk main loop.
+    Tk widgets must only be touched from the thread running mainloop, so workers
+    put completions on a queue and the main thread drains it with widget.after().
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._queue = queue.Queue()
+        self._pending = 0 # Submitted but not yet delivered (only touched on the Tk thread)
+
+    def expect(self):
+        """Called on the Tk thread for every completion that will be posted."""
+        self._pending += 1
+        if self._pending == 1:
+            self._schedule()
+
+    def post(self, callback, *args):
+        """Thread-safe: run callback(*args) on the Tk thread."""
+        self._queue.put((callback, args))
+
+    def _schedule(self):
+        try:
+            self.widget.after(POLL_MS, self._drain)
+        except Exception:
+            self._pending = 0 # The window was destroyed
+
+    def _drain(self):
+        while True:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            callback(*args)
+        if self._pending > 0:
+            self._schedule()
+
+
+class BackgroundLoader:
+    """
+    Runs controller calls off the UI thread for one screen.
+
+    run(key, work, on_success) calls work() on a worker thread and then
+    on_success(result) on the Tk thread. Starting a new load with the same key
+    makes the previous one stale: it is cancelled if it has not started yet and
+    its result is dropped otherwise, so a second click on "Refresh" never
+    lets an older answer overwrite a newer one.
+    """
+
+    def __init__(self, widget, executor=None):
+        self.widget = widget
+        self.executor = executor or shared_executor()
+        self.dispatcher = TkDispatcher(widget)
+        self._generations = {} # key -> number of the latest load
+        self._futures = {}
+        self._closed = False
+
+    def run(self, key, work, on_success, on_error=None):
+        """Start work() for `key`, superseding any load of the same key still in flight."""
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        previous = self._futures.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+        self.dispatcher.expect()
+
+        def task():
+            try:
+                result, error = work(), None
+            except Exception as err:
+                result, error = None, err
+            self.dispatcher.post(self._complete, key, generation, result, error, on_success, on_error)
+
+        def account_for_cancel(done):
+            # A cancelled task never posts its completion; post an empty one instead
+            if done.cancelled():
+                self.dispatcher.post(lambda: None)
+
+        future = self.executor.submit(task)
+        self._futures[key] = future
+        future.add_done_callback(account_for_cancel)
+        return generation
+
+    def is_loading(self, key):
+        future = self._futures.get(key)
+        return future is not None and not future.done()
+
+    def cancel(self, key):
+        """Forget the current load of `key`; its result will be ignored."""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        """Drop every pending result (call when the screen is destroyed)."""
+        self._closed = True
+        for key in list(self._futures):
+            self.cancel(key)
+
+    def _complete(self, key, generation, result, error, on_success, on_error):
+        if self._closed or self._generations.get(key) != generation:
+            return # Stale: a newer load of the same key was started
+        self._futures.pop(key, None)
+        try:
+            if not self.widget.winfo_exists():
+                return
+        except Exception:
+            return
+        if error is None:
+            on_success(result)
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Background load '{key}' failed: {error}")
@@ -0,0 +1,90 @@
+class KeyedTreeview:
+    """
+    Keeps a flat ttk.Treeview in sync with a result set by primary key.
+
+    update(rows) compares the new rows with the displayed ones and only inserts
+    new keys, rewrites rows whose values changed and deletes keys that are gone,
+    then restores the order in one set_children call. Rows keep their Treeview
+    item id (the key), so the selection survives, and the scroll position is
+    anchored on the row that was at the top of the view.
+    """
+
+    def __init__(self, tree, key=None, row_tags=None):
+        """
+        key(values) returns the primary key of a row (default: the first value);
+        row_tags(index, values) optionally returns the tags of a row.
+        """
+        self.tree = tree
+        self.key = key or (lambda values: values[0])
+        self.row_tags = row_tags
+        self._rows = {} # item id -> (values, tags) as last written to the tree
+
+    def update(self, rows):
+        """
+        Show `rows` (sequences of column values). Returns a dict with the
+        number of "inserted", "updated" and "removed" rows.
+        """
+        tree = self.tree
+        old_order = tree.get_children()
+        anchor = self._top_row(old_order)
+        selection = tree.selection()
+
+        new_order = []
+        inserted = updated = 0
+        for index, values in enumerate(rows):
+            values = tuple(values)
+            item_id = str(self.key(values))
+            tags = tuple(self.row_tags(index, values)) if self.row_tags else ()
+            new_order.append(item_id)
+
+            current = self._rows.get(item_id)
+            if current is None:
+                tree.insert("", "end", iid=item_id, values=values, tags=tags)
+                inserted += 1
+            elif current != (values, tags):
+                tree.item(item_id, values=values, tags=tags)
+                updated += 1
+            self._rows[item_id] = (values, tags)
+
+        kept = set(new_order)
+        removed = [item_id for item_id in old_order if item_id not in kept]
+        if removed:
+            tree.delete(*removed)
+            for item_id in removed:
+                self._rows.pop(item_id, None)
+
+        if tuple(new_order) != tree.get_children():
+            tree.set_children("", *new_order)
+
+        surviving = [item_id for item_id in selection if item_id in kept]
+        if tuple(surviving) != tree.selection():
+            tree.selection_set(surviving)
+        self._restore_scroll(anchor, new_order)
+
+        return {"inserted": inserted, "updated": updated, "removed": len(removed)}
+
+    def clear(self):
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._rows.clear()
+
+    def values(self, item_id):
+        """Values of a row as they were given to update() (not converted to strings by Tk)."""
+        row = self._rows.get(item_id)
+        return row[0] if row else None
+
+    def _top_row(self, order):
+        if not order:
+            return None
+        first = self.tree.yview()[0]
+        return order[min(int(round(first * len(order))), len(order) - 1)]
+
+    def _restore_scroll(self, anchor, order):
+        if anchor is None or not order:
+            return
+        try:
+            index = order.index(anchor)
+        except ValueError:
+            return # The top row was removed; leave the view where Tk put it
+        self.tree.yview_moveto(index / len(order))
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from InventoryDetailController import InventoryDetailController
+from GUI.BackgroundTasks import BackgroundLoader
 import threading
 
 
@@ -32,6 +33,8 @@ class ManageInventoryScreen:
             messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
             root.destroy()
             return
+        self.loader = BackgroundLoader(self.root) # Runs the queries off the UI thread
+        self.category_overview = {} # Category -> summary of the last load (details need no extra query)
         
         # Main container
         main_container = tk.Frame(root, bg='#E8F5E9')
@@ -130,41 +133,43 @@ class ManageInventoryScreen:
         tk.Label(welcome_frame, text="📦", font=('Arial', 48), bg='#F1F8E9').pack(pady=20)
     
     def load_categories(self):
-        """Load all categories from the database"""
-        try:
-            # Clear current list
-            self.categories_listbox.delete(0, tk.END)
-            
-            # Get categories
-            categories = self.controller.get_all_categories()
+        """Load all categories from the database (on a worker thread)"""
+        self.status_var.set("Loading categories...")
+        self.root.config(cursor="watch")
+        self.loader.run("categories", self.fetch_categories, self.show_categories,
+                        on_error=self.show_categories_error)
+    
+    def fetch_categories(self):
+        """Runs on a worker thread: every category with its details, in one query, no widgets touched"""
+        return self.controller.get_inventory_overview(low_stock_threshold=15)
+    
+    def show_categories(self, summaries):
+        """Fill the categories list with the loaded data"""
+        self.root.config(cursor="")
+        self.category_overview = {s['category']: s for s in summaries}
+        
+        # Clear current list
+        self.categories_listbox.delete(0, tk.END)
+        
+        if summaries:
+            # Add to listbox with item count
+            for summary in summaries:
+                self.categories_listbox.insert(tk.END, f"{summary['category']} ({summary['item_count']} items)")
             
-            if categories:
-                # Get summary for each category
-                summaries = self.controller.get_all_categories_summary()
-                category_info = {s['category']: s for s in summaries}
-                
-                # Add to listbox with item count
-                for category in categories:
-                    if category in category_info:
-                        item_count = category_info[category]['item_count']
-                        display_text = f"{category} ({item_count} items)"
-                    else:
-                        display_text = category
-                    self.categories_listbox.insert(tk.END, display_text)
-                
-                # Update summary
-                total_categories = len(categories)
-                total_items = sum(s['item_count'] for s in summaries)
-                self.summary_label.config(text=f"Total: {total_categories} categories, {total_items} items")
-                self.status_var.set(f"Loaded {total_categories} categories")
-            else:
-                self.categories_listbox.insert(tk.END, "No categories found")
-                self.summary_label.config(text="No data available")
-                self.status_var.set("No categories in inventory")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load categories: {str(e)}")
-            self.status_var.set("Error loading categories")
+            # Update summary
+            total_categories = len(summaries)
+            total_items = sum(s['item_count'] for s in summaries)
+            self.summary_label.config(text=f"Total: {total_categories} categories, {total_items} items")
+            self.status_var.set(f"Loaded {total_categories} categories")
+        else:
+            self.categories_listbox.insert(tk.END, "No categories found")
+            self.summary_label.config(text="No data available")
+            self.status_var.set("No categories in inventory")
+    
+    def show_categories_error(self, error):
+        self.root.config(cursor="")
+        messagebox.showerror("Error", f"Failed to load categories: {str(error)}")
+        self.status_var.set("Error loading categories")
     
     def on_category_select(self, event):
         """Handle category selection"""
@@ -183,10 +188,8 @@ class ManageInventoryScreen:
             widget.destroy()
         
         try:
-            # Get category data
-            details = self.controller.get_category_details(category)
-            stats = self.controller.get_category_statistics(category)
-            low_stock = self.controller.get_low_stock_items_by_category(category, threshold=15)
+            # Category data was loaded with the list
+            details = self.category_overview.get(category)
             
             if not details:
                 tk.Label(self.right_panel, text="No data available", 
@@ -226,7 +229,7 @@ class ManageInventoryScreen:
                 ("Total Items:", f"{details['item_count']}"),
                 ("Total Quantity:", f"{details['total_quantity']}"),
                 
-                ("Min/Max Quantity:", f"{stats['min_quantity']} / {stats['max_quantity']}"),
+                ("Min/Max Quantity:", f"{details['min_quantity']} / {details['max_quantity']}"),
                 
             ]
             
@@ -283,11 +286,12 @@ class ManageInventoryScreen:
             # Add items
             for item in details['items']:
                 status_display = self.get_status_display(item['status'])
+                description = item['description'] or ''
                 tree.insert('', tk.END, values=(
                     item['name'],
-                    item['quantity'],
+                    item['quantity'] if item['quantity'] is not None else '',
                     
-                    item['description'][:50] + '...' if len(item['description']) > 50 else item['description']
+                    description[:50] + '...' if len(description) > 50 else description
                 ))
             
             # Add scrollbar to treeview
@@ -328,6 +332,8 @@ class ManageInventoryScreen:
     def on_closing(self):
         """Handle window closing"""
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
+            if hasattr(self, 'loader'):
+                self.loader.close()
             if hasattr(self, 'controller'):
                 self.controller.close()
             self.root.destroy()
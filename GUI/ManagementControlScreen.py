@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from ModificationValidator import ModificationValidator
+from DataVersion import DataVersion
+from GUI.KeyedTreeview import KeyedTreeview
 import threading
 
 
@@ -224,6 +226,8 @@ class ManagementControlScreen:
         
         # Pack everything
         self.inventory_tree.grid(row=0, column=0, sticky='nsew')
+        self.inventory_rows = KeyedTreeview(self.inventory_tree)  # Keyed by item name
+        self.inventory_version = None  # DataVersion of the rows shown
         vsb.grid(row=0, column=1, sticky='ns')
         hsb.grid(row=1, column=0, sticky='ew')
         
@@ -313,22 +317,25 @@ class ManagementControlScreen:
             messagebox.showerror("Error", f"Item '{item_name}' not found in inventory!")
     
     def refresh_inventory_view(self):
-        """Refresh the inventory treeview"""
-        # Clear existing items
-        for item in self.inventory_tree.get_children():
-            self.inventory_tree.delete(item)
-        
+        """Refresh the inventory treeview (only changed rows are touched)"""
         # Get all inventory items
         try:
+            # Skip the reload when the inventory version has not moved since the last one
+            version = DataVersion.current(self.validator.db, DataVersion.INVENTORY)
+            if version is not None and version == self.inventory_version:
+                self.status_var.set("Inventory is up to date")
+                return
+            
             # Direct database query to get all items
             query = "SELECT item_name, description, category, quantity FROM inventory ORDER BY item_name"
             results = self.validator.db.execute_query(query)
+            self.inventory_version = version if results is not None else None
             
             if results:
-                for row in results:
-                    self.inventory_tree.insert('', tk.END, values=row)
+                self.inventory_rows.update(results)
                 self.status_var.set(f"Loaded {len(results)} items")
             else:
+                self.inventory_rows.clear()
                 self.status_var.set("No items in inventory")
                 
         except Exception as e:
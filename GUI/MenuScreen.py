@@ -2,6 +2,10 @@ import tkinter as tk
 from tkinter import messagebox
 from MenuController import MenuController
 from GUI.OrderFormScreen import OrderFormScreen
+from GUI.BackgroundTasks import BackgroundLoader
+from GUI.VirtualList import VirtualList
+
+CARD_HEIGHT = 90 # Height of one menu card including its spacing, in pixels
 
 
 
@@ -10,7 +14,10 @@ class MenuScreen:
         self.parent = parent
         self.menu_controller = MenuController()
         self.window = None
-        self.available_items = []
+        self.loader = None # Created with the window in show()
+        self.available_items = [] # (item_name, quantity) of the loaded menu snapshot, in menu order
+        self.available_count = 0
+        self.on_first_page = None # Optional callback once the first cards are shown
         self.cart = {}
         self.customer_id = customer_id  # Store customer ID if provided
         
@@ -20,6 +27,7 @@ class MenuScreen:
         self.window.title("Food Share - Menu")
         self.window.geometry("800x700")
         self.window.configure(bg="#9AFF9A")
+        self.loader = BackgroundLoader(self.window)
         
         # Title
         title = tk.Label(
@@ -83,24 +91,62 @@ class MenuScreen:
         # Frame for menu items
         self.menu_frame = tk.Frame(self.window, bg="#9AFF9A")
         self.menu_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+        
+        # Only the cards in view exist; they are refilled while scrolling
+        self.menu_list = VirtualList(
+            self.menu_frame,
+            row_height=CARD_HEIGHT,
+            create_row=self.create_food_card,
+            fill_row=self.fill_food_card,
+            bg="#9AFF9A"
+        )
+        self.message_label = None
     
     def load_menu(self):
-        """Load menu items"""
-        # Clear existing items
-        for widget in self.menu_frame.winfo_children():
-            widget.destroy()
+        """Load menu items (the menu snapshot is read on a worker thread)"""
+        self.available_items = []
+        self.available_count = 0
+        self.show_message("Loading menu...")
         
         # Get items from controller
-        self.available_items = self.menu_controller.check_availability()
+        self.loader.run("menu", self.fetch_menu, self.show_menu)
+    
+    def fetch_menu(self):
+        """Runs on a worker thread"""
+        self.menu_controller.revalidate() # An explicit (re)load always checks the inventory version
+        # The count and every card come from this one snapshot, so they cannot disagree
+        return self.menu_controller.menu_snapshot().available
+    
+    def show_menu(self, items):
+        """Show the loaded items"""
+        self.available_items = items
+        self.available_count = len(items)
         
-        if not self.available_items:
+        if not self.available_count:
             self.show_no_items()
         else:
             self.display_items()
     
+    def show_message(self, text):
+        """Replace the menu list with a message (loading / no items)"""
+        self.menu_list.pack_forget()
+        if self.message_label is not None:
+            self.message_label.destroy()
+        self.message_label = tk.Label(
+            self.menu_frame,
+            text=text,
+            font=("Arial", 14),
+            bg="#9AFF9A",
+            fg="#1f2937"
+        )
+        self.message_label.pack(pady=50)
+    
     def show_no_items(self):
         """Show no items message"""
-        no_items = tk.Label(
+        self.menu_list.pack_forget()
+        if self.message_label is not None:
+            self.message_label.destroy()
+        self.message_label = tk.Label(
             self.menu_frame,
             text="🍽️\n\nNo Items Available\n\nCheck back soon!",
             font=("Arial", 16),
@@ -111,59 +157,76 @@ class MenuScreen:
             padx=40,
             pady=40
         )
-        no_items.pack(pady=50)
+        self.message_label.pack(pady=50)
         
         messagebox.showwarning("Notice", "No food items are currently available.")
     
     def display_items(self):
         """Display menu items"""
-        for item_name, quantity in self.available_items:
-            self.create_food_card(item_name)
+        if self.message_label is not None:
+            self.message_label.destroy()
+            self.message_label = None
+        self.menu_list.pack(fill=tk.BOTH, expand=True)
+        self.menu_list.set_items(self.available_count, self.get_loaded_item)
+        
+        if self.on_first_page is not None:
+            self.window.after_idle(self.on_first_page)
+    
+    def get_loaded_item(self, index):
+        return self.available_items[index] if index < len(self.available_items) else None
     
-    def create_food_card(self, item_name):
-        """Create food item card"""
+    def create_food_card(self, parent):
+        """Create one reusable food item card (filled by fill_food_card)"""
+        # Outer frame provides the spacing between cards
+        holder = tk.Frame(parent, bg="#9AFF9A")
+        
         # Card frame
         card = tk.Frame(
-            self.menu_frame,
+            holder,
             bg="white",
             relief=tk.RAISED,
             bd=1,
             cursor="hand2"
         )
-        card.pack(fill=tk.X, pady=10, padx=20)
+        card.pack(fill=tk.BOTH, expand=True, pady=5, padx=20)
         
         # Card content
         content = tk.Frame(card, bg="white")
         content.pack(fill=tk.X, padx=30, pady=20)
         
         # Icon and name
-        tk.Label(
+        icon = tk.Label(
             content,
             text="🍽️",
             font=("Arial", 20),
             bg="white"
-        ).pack(side=tk.LEFT, padx=(0, 15))
+        )
+        icon.pack(side=tk.LEFT, padx=(0, 15))
         
-        tk.Label(
+        holder.name_label = tk.Label(
             content,
-            text=item_name,
+            text="",
             font=("Arial", 16, "bold"),
             bg="white",
             fg="#1f2937"
-        ).pack(side=tk.LEFT)
+        )
+        holder.name_label.pack(side=tk.LEFT)
         
         # Status
-        tk.Label(
+        holder.status_label = tk.Label(
             content,
-            text="● Available",
+            text="",
             font=("Arial", 10, "bold"),
             bg="white",
             fg="#10b981"
-        ).pack(side=tk.RIGHT)
+        )
+        holder.status_label.pack(side=tk.RIGHT)
+        holder.item_name = None
         
-        # Click event
-        def on_click(event, name=item_name):
-            self.show_food_info(name)
+        # Click event (the card shows a different item after every scroll)
+        def on_click(event):
+            if holder.item_name is not None:
+                self.show_food_info(holder.item_name)
         
         card.bind("<Button-1>", on_click)
         content.bind("<Button-1>", on_click)
@@ -179,6 +242,18 @@ class MenuScreen:
         
         card.bind("<Enter>", on_enter)
         card.bind("<Leave>", on_leave)
+        return holder
+    
+    def fill_food_card(self, holder, index, item):
+        """Show the item at `index` in a recycled card"""
+        if item is None:
+            holder.item_name = None
+            holder.name_label.config(text="Loading...")
+            holder.status_label.config(text="")
+        else:
+            holder.item_name = item[0]
+            holder.name_label.config(text=item[0])
+            holder.status_label.config(text="● Available")
     
     def show_food_info(self, item_name):
         """Show food information popup"""
@@ -323,4 +398,19 @@ class MenuScreen:
 
     def refresh_menu(self):
         """Refresh menu"""
-        self.load_menu()
\ No newline at end of file
+        self.load_menu()
+
+
+# Measure how long the menu takes to open: python -m GUI.MenuScreen
+if __name__ == "__main__":
+    import time
+    
+    started = time.perf_counter()
+    screen = MenuScreen()
+    
+    def report_open_time():
+        print(f"Menu with {screen.available_count} items opened in {(time.perf_counter() - started) * 1000:.0f} ms")
+        screen.window.destroy()
+    
+    screen.on_first_page = report_open_time
+    screen.show()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from OrderStatusController import OrderStatusController
+from GUI.BackgroundTasks import BackgroundLoader
 from datetime import datetime
 
 
@@ -26,6 +27,7 @@ class PendingDeliveriesScreen:
         self.white = "#FFFFFF"
         
         self.root.configure(bg=self.bg_color)
+        self.loader = BackgroundLoader(self.root) # Runs the queries off the UI thread
         
         self.setup_ui()
         self.load_pending_orders()
@@ -138,13 +140,19 @@ class PendingDeliveriesScreen:
         close_btn.bind("<Leave>", lambda e: close_btn.config(bg=self.button_color))
     
     def load_pending_orders(self):
+        # Load orders from controller on a worker thread; show_pending_orders fills the table
+        self.info_label.config(text="Loading pending deliveries...")
+        self.root.config(cursor="watch")
+        self.loader.run("orders", self.controller.requestOrdersWithPendingDeliveries,
+                        self.show_pending_orders, on_error=self.show_load_error)
+    
+    def show_pending_orders(self, orders):
+        self.root.config(cursor="")
+        
         # Clear existing items
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Load orders from controller
-        orders = self.controller.requestOrdersWithPendingDeliveries()
-        
         if orders:
             for order in orders:
                 # Format the created_at date
@@ -175,6 +183,11 @@ class PendingDeliveriesScreen:
                 parent=self.root
             )
     
+    def show_load_error(self, error):
+        self.root.config(cursor="")
+        self.info_label.config(text="Could not load pending deliveries")
+        print(f"Error loading pending deliveries: {error}")
+    
     def on_order_click(self, event):
         # Get selected item
         selection = self.tree.selection()
@@ -264,6 +277,7 @@ class PendingDeliveriesScreen:
         ok_btn.bind("<Leave>", lambda e: ok_btn.config(bg=self.button_color))
     
     def close_window(self):
+        self.loader.close()
         self.controller.close()
         self.root.destroy()
     
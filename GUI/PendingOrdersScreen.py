@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PendingOrdersController import PendingOrdersController
+from GUI.BackgroundTasks import BackgroundLoader
+from GUI.KeyedTreeview import KeyedTreeview
 import datetime
 
 
@@ -9,6 +11,7 @@ class PendingOrdersScreen:
         self.root = root
         self.user_role = user_role
         self.controller = PendingOrdersController()
+        self.loader = BackgroundLoader(self.root) # Runs the queries off the UI thread
         
         # Light green theme colors
         self.bg_color = "#E8F5E9"  # Light green background
@@ -157,6 +160,12 @@ class PendingOrdersScreen:
         # Add alternating row colors
         self.tree.tag_configure("oddrow", background="#F1F8E9")
         self.tree.tag_configure("evenrow", background=self.white)
+        
+        # Rows are keyed by order ID so refreshes only apply the differences
+        self.rows = KeyedTreeview(
+            self.tree,
+            row_tags=lambda index, values: ("evenrow" if index % 2 == 0 else "oddrow",)
+        )
     
     def create_buttons(self):
         """Create action buttons at the bottom"""
@@ -229,46 +238,51 @@ class PendingOrdersScreen:
         button.bind("<Leave>", lambda e: button.config(bg=normal_color))
     
     def refresh_orders(self):
-        """Refresh the pending orders list"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Get pending orders
-        has_orders, orders = self.controller.check_pending_orders()
-        
-        if has_orders:
-            # Populate the table
-            for index, order in enumerate(orders):
+        """Refresh the pending orders list (the query runs on a worker thread)"""
+        self.count_label.config(text="Loading orders...")
+        self.root.config(cursor="watch")
+        self.loader.run("orders", self.controller.get_all_pending_orders, self.show_orders,
+                        on_error=self.show_load_error)
+    
+    def show_orders(self, orders):
+        """Populate the table with the loaded orders (runs on the UI thread)"""
+        self.root.config(cursor="")
+        
+        if orders:
+            print(f"Found {len(orders)} pending orders")
+            rows = []
+            for order in orders:
                 # Format date and time
                 if isinstance(order.made, datetime.datetime):
                     date_time = order.made.strftime("%Y-%m-%d %H:%M:%S")
                 else:
                     date_time = str(order.made)
                 
-                # Determine row tag for alternating colors
-                tag = "evenrow" if index % 2 == 0 else "oddrow"
-                
-                # Insert order into table
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        order.request_id,
-                        order.customer_id,
-                        order.delivery_address,
-                        order.number_of_people,
-                        order.status,
-                        date_time
-                    ),
-                    tags=(tag,)
-                )
+                rows.append((
+                    order.request_id,
+                    order.customer_id,
+                    order.delivery_address,
+                    order.number_of_people,
+                    order.status,
+                    date_time
+                ))
+            
+            # Only new, changed or removed orders touch the table
+            self.rows.update(rows)
             
             # Update count label
             self.count_label.config(text=f"Total: {len(orders)} orders")
         else:
+            self.rows.clear()
             # Update count label
             self.count_label.config(text="Total: 0 orders")
+            self.controller.show_no_pending_orders_warning()
+    
+    def show_load_error(self, error):
+        """Show a failed load without freezing the table"""
+        self.root.config(cursor="")
+        self.count_label.config(text="Could not load orders")
+        print(f"Error loading pending orders: {error}")
     
     def on_select(self, event):
         """Handle row selection"""
@@ -297,10 +311,9 @@ class PendingOrdersScreen:
         values = self.tree.item(item)['values']
         order_id = values[0]
         
-        # Get full order details
-        _, orders = self.controller.check_pending_orders()
+        # Get full order details from the orders loaded by the last refresh
         selected_order = None
-        for order in orders:
+        for order in self.controller.pending_orders:
             if order.request_id == order_id:
                 selected_order = order
                 break
@@ -446,7 +459,8 @@ class PendingOrdersScreen:
     
     def close_screen(self):
         """Close the screen"""
-        self.controller.close_connection()
+        self.loader.close()
+        self.controller.close()
         self.root.destroy()
 
 
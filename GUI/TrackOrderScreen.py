@@ -1,4 +1,5 @@
 import tkinter as tk
+from datetime import datetime
 from tkinter import font as tkFont
 
 class TrackOrderScreen:
@@ -23,6 +24,11 @@ class TrackOrderScreen:
         status_label.config(font=tkFont.Font(size=14), fg="blue")
         status_label.pack(pady=(0, 10))
 
+        # Estimated delivery: the agent's ETA, or a prediction from past deliveries
+        eta_text = self.eta_text(food_request)
+        if eta_text:
+            tk.Label(self.root, text=eta_text, bg="#9AFF9A", font=tkFont.Font(size=12)).pack(pady=(0, 10))
+
         # Summary
         summary = f"Address: {food_request.delivery_address}\n" \
                   f"People: {food_request.number_of_people}\n"
@@ -42,6 +48,17 @@ class TrackOrderScreen:
         #Return to main menu button
         tk.Button(self.root, text="Back to Main Menu", command=self.back_to_main).pack(pady=20)
 
+    def eta_text(self, food_request):
+        if food_request.request_id is None:
+            return ""
+        from DeliveryController import DeliveryController
+        eta, predicted = DeliveryController().estimate_request_eta(food_request.request_id)
+        if eta is None:
+            return ""
+        if isinstance(eta, str):  # Stored values may come back as text
+            eta = datetime.fromisoformat(eta)
+        return f"{'Estimated' if predicted else 'Expected'} delivery: {eta:%d/%m %H:%M}"
+
     def back_to_main(self):
         # Clear the root window
         for widget in self.root.winfo_children():
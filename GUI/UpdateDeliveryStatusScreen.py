@@ -11,7 +11,8 @@ class UpdateDeliveryStatusScreen:
 
         self.window = tk.Toplevel(parent)
         self.window.title("Update Delivery Status")
-        self.window.geometry("450x400")
+        self.window.geometry("560x480")
+        self.route = {}  # delivery_id -> (stop number, km from the previous stop)
 
         self.build_ui()
         self.refresh_list()
@@ -20,7 +21,17 @@ class UpdateDeliveryStatusScreen:
         ttk.Label(self.window, text="My Deliveries",
                   font=("Helvetica", 14, "bold")).pack(pady=10)
 
-        cols = ("Delivery ID", "Request ID", "Status", "ETA")
+        # Route: visiting order of the open deliveries, from an optional start address
+        route_bar = ttk.Frame(self.window)
+        route_bar.pack(fill="x", padx=10, pady=(0, 6))
+        ttk.Label(route_bar, text="Start from").pack(side="left")
+        self.start_entry = ttk.Entry(route_bar, width=26)
+        self.start_entry.pack(side="left", padx=5)
+        ttk.Button(route_bar, text="Plan Route", command=self.on_plan_route).pack(side="left")
+        self.route_label = ttk.Label(self.window, text="")
+        self.route_label.pack()
+
+        cols = ("Stop", "Delivery ID", "Request ID", "Status", "ETA")
         self.tree = ttk.Treeview(self.window, columns=cols, show="headings", height=8)
         for c in cols:
             self.tree.heading(c, text=c)
@@ -46,18 +57,38 @@ class UpdateDeliveryStatusScreen:
     def refresh_list(self):
         for row in self.tree.get_children():
             self.tree.delete(row)
-        for rec in self.controller.list_my_deliveries(self.agent_id):
+        deliveries = self.controller.list_my_deliveries(self.agent_id)
+        if self.route:
+            # Planned stops first, in route order; the rest keep their order below
+            unplanned = len(self.route) + 1
+            deliveries.sort(key=lambda rec: self.route.get(rec["delivery_id"], (unplanned,))[0])
+        for rec in deliveries:
             eta_fmt = rec["eta"].strftime("%Y-%m-%d %H:%M") if rec["eta"] else "-"
+            stop = self.route.get(rec["delivery_id"])
+            stop_fmt = f"{stop[0]} ({stop[1]:.1f} km)" if stop else "-"
             self.tree.insert("", "end",
-                             values=(rec["delivery_id"], rec["request_id"],
+                             values=(stop_fmt, rec["delivery_id"], rec["request_id"],
                                      rec["status"], eta_fmt))
 
+    def on_plan_route(self):
+        start = self.start_entry.get().strip() or None
+        if start and self.controller.locate(start) is None:
+            messagebox.showwarning("Route", f"Address not found: {start}")
+            return
+        route = self.controller.plan_route(self.agent_id, start)
+        self.route = {stop["delivery_id"]: (stop["stop"], stop["leg_km"]) for stop in route["stops"]}
+        summary = f"{len(route['stops'])} stops, {route['km']:.1f} km"
+        if route["unlocated"]:
+            summary += f" ({len(route['unlocated'])} addresses not found)"
+        self.route_label.config(text=summary)
+        self.refresh_list()
+
     def on_update(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showwarning("No selection", "Please select a delivery.")
             return
-        delivery_id = self.tree.item(sel[0])["values"][0]
+        delivery_id = self.tree.item(sel[0])["values"][1]
 
         ok, msg = self.controller.update_status(
             delivery_id,
@@ -0,0 +1,99 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualList:
+    """
+    Scrollable list of fixed-height rows that only creates widgets for the rows
+    in the viewport. A small pool of row widgets is placed on a Canvas and
+    refilled with other items as the view scrolls, so the widget count depends
+    on the window height and not on the number of items.
+
+    create_row(parent) builds one reusable row widget; fill_row(row, index, item)
+    shows `item` in it (item is None while its page is still loading).
+    on_range(first, last), if given, is called with the visible index range so
+    the owner can fetch the pages it needs.
+    """
+
+    def __init__(self, parent, row_height, create_row, fill_row, on_range=None, bg="white"):
+        self.row_height = row_height
+        self.create_row = create_row
+        self.fill_row = fill_row
+        self.on_range = on_range
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0, yscrollincrement=row_height)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.count = 0
+        self.get_item = lambda index: None
+        self._slots = [] # [row widget, canvas window id, index shown, item shown]
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Enter>", lambda e: self.canvas.bind_all("<MouseWheel>", self._on_mousewheel))
+        self.canvas.bind("<Leave>", lambda e: self.canvas.unbind_all("<MouseWheel>"))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def pack_forget(self):
+        self.frame.pack_forget()
+
+    def set_items(self, count, get_item):
+        """Show `count` rows; get_item(index) returns the item or None if not loaded yet."""
+        self.count = count
+        self.get_item = get_item
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), count * self.row_height))
+        self.canvas.yview_moveto(0)
+        for slot in self._slots:
+            slot[2] = slot[3] = None
+        self.render()
+
+    def render(self):
+        """Refill the visible rows (rows whose index and item did not change are left alone)."""
+        first, last = self.visible_range()
+        for offset, slot in enumerate(self._slots):
+            row, window, shown_index, shown_item = slot
+            index = first + offset
+            if index >= self.count:
+                self.canvas.itemconfigure(window, state="hidden")
+                slot[2] = None
+                continue
+            item = self.get_item(index)
+            if index != shown_index or item is not shown_item:
+                self.canvas.coords(window, 0, index * self.row_height)
+                self.canvas.itemconfigure(window, state="normal")
+                self.fill_row(row, index, item)
+                slot[2], slot[3] = index, item
+
+        if self.on_range is not None and self.count and self._slots:
+            self.on_range(first, min(last, self.count - 1))
+
+    def visible_range(self):
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // self.row_height))
+        return first, first + len(self._slots) - 1
+
+    def _on_resize(self, event):
+        # One extra row covers the partly visible row at the bottom
+        needed = math.ceil(event.height / self.row_height) + 1
+        while len(self._slots) < needed:
+            row = self.create_row(self.canvas)
+            window = self.canvas.create_window(0, 0, window=row, anchor="nw",
+                                               height=self.row_height, state="hidden")
+            self._slots.append([row, window, None, None])
+        for _, window, _, _ in self._slots:
+            self.canvas.itemconfigure(window, width=event.width)
+        self.canvas.configure(scrollregion=(0, 0, event.width, self.count * self.row_height))
+        self.render()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render()
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(int(-event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
@@ -0,0 +1,331 @@
+# Geocoding.py
+from __future__ import annotations
+import csv
+import math
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from Database import Database
+
+Point = Tuple[float, float]  # (latitude, longitude) in degrees
+
+STREETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geocode_streets.csv")
+EARTH_RADIUS_KM = 6371.0088
+
+# Greek letters as they are usually written in Greeklish addresses ("Triwn Navarxwn")
+_GREEKLISH = {
+    "α": "a", "β": "v", "γ": "g", "δ": "d", "ε": "e", "ζ": "z", "η": "i", "θ": "th", "ι": "i",
+    "κ": "k", "λ": "l", "μ": "m", "ν": "n", "ξ": "ks", "ο": "o", "π": "p", "ρ": "r", "σ": "s",
+    "ς": "s", "τ": "t", "υ": "y", "φ": "f", "χ": "x", "ψ": "ps", "ω": "w",
+}
+_GREEK_DIGRAPHS = [("αυ", "av"), ("ευ", "ev"), ("ου", "ou"), ("μπ", "b"), ("ντ", "d")]
+# Spelling variants that sound the same are folded together (w/o, y/i/ei/oi, ...)
+_FOLD = [(re.compile(pattern), replacement) for pattern, replacement in [
+    (r"au", "av"), (r"eu", "ev"), (r"ou", "u"), (r"w", "o"), (r"(ei|oi|y)", "i"), (r"ch", "x"), (r"(.)\1+", r"\1"),
+]]
+_NOISE_WORDS = {"odos", "odo", "od", "str", "street", "st", "leoforos", "leof", "plateia", "pl"}
+
+
+def normalize_address(address: str) -> Tuple[str, Optional[int]]:
+    """
+    (street key, house number) of a free-text address, e.g.
+    "Τριών Ναυάρχων 23, Πάτρα" and "triwn navarxon 23" both give ("trion navarxon", 23).
+    Accents, case, punctuation, the city after a comma and words like "odos"
+    are dropped and Greek is written in Greeklish.
+    """
+    text = unicodedata.normalize("NFKD", address or "")
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    text = text.split(",")[0]
+    for digraph, latin in _GREEK_DIGRAPHS:
+        text = text.replace(digraph, latin)
+    text = "".join(_GREEKLISH.get(char, char) for char in text)
+
+    number = None
+    words = []
+    for word in re.findall(r"[a-z]+|\d+", text):
+        if word.isdigit():
+            number = int(word)  # The last number is the house number
+        elif word not in _NOISE_WORDS:
+            for pattern, replacement in _FOLD:
+                word = pattern.sub(replacement, word)
+            words.append(word)
+    return " ".join(words), number
+
+
+def distance_km(a: Point, b: Point) -> float:
+    """Great-circle (haversine) distance between two points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+class StreetDirectory:
+    """
+    Offline address lookup from a CSV file of street segments
+    (street, lat_from, lon_from, lat_to, lon_to, last_number): a house number
+    is placed along its street in proportion to last_number. The bundled
+    geocode_streets.csv is an approximate stand-in for the streets of the demo
+    data; point `path` at a real export of the service area for production.
+    """
+
+    def __init__(self, path: str = STREETS_FILE) -> None:
+        self.streets: Dict[str, Tuple[float, float, float, float, int]] = {}
+        with open(path, encoding="utf-8", newline="") as streets:
+            for row in csv.DictReader(streets):
+                key, _ = normalize_address(row["street"])
+                self.streets[key] = (float(row["lat_from"]), float(row["lon_from"]),
+                                     float(row["lat_to"]), float(row["lon_to"]),
+                                     max(1, int(row.get("last_number") or 1)))
+
+    def locate(self, street: str, number: Optional[int]) -> Optional[Point]:
+        segment = self.streets.get(street)
+        if segment is None:
+            return None
+        lat_from, lon_from, lat_to, lon_to, last_number = segment
+        share = min(max((number or 1) - 1, 0) / last_number, 1.0)
+        return lat_from + (lat_to - lat_from) * share, lon_from + (lon_to - lon_from) * share
+
+
+class Geocoder:
+    """
+    Address -> coordinates with a persistent cache.
+
+    Addresses are normalized first, so spelling variants share one entry.
+    Lookups go memory -> `geocode_cache` table -> directory; directory hits
+    are written to the table, so a slower or paid directory is asked once per
+    address. Unresolved addresses are only remembered in memory, so they are
+    retried once the directory knows them.
+    """
+
+    TABLE = "geocode_cache"
+    _enabled: bool | None = None  # Cached "does the table exist" check
+
+    def __init__(self, db: Database | None = None, directory: Any = None) -> None:
+        self.db = db or Database()
+        self.directory = directory if directory is not None else StreetDirectory()
+        self._memory: Dict[str, Optional[Point]] = {}
+
+    @classmethod
+    def enabled(cls, db) -> bool:
+        """True once the cache table exists (checked once per process)."""
+        if cls._enabled is None:
+            cls._enabled = db.backend.table_exists(db, cls.TABLE)
+        return cls._enabled
+
+    def geocode(self, address: str) -> Optional[Point]:
+        return self.geocode_many([address]).get(address)
+
+    def geocode_many(self, addresses: Iterable[str]) -> Dict[str, Optional[Point]]:
+        """{address: point or None}; at most one cache query per IN-clause chunk of new addresses."""
+        keys = {address: self.key(address) for address in set(addresses)}
+        missing = [key for key in set(keys.values()) if key not in self._memory]
+        if missing:
+            self._load(missing)
+        return {address: self._memory.get(key) for address, key in keys.items()}
+
+    @staticmethod
+    def key(address: str) -> str:
+        street, number = normalize_address(address)
+        return f"{street} {number}" if number is not None else street
+
+    def _load(self, keys: List[str]) -> None:
+        use_table = self.enabled(self.db)
+        if use_table:
+            for start in range(0, len(keys), self.db.IN_CLAUSE_CHUNK_SIZE):
+                chunk = keys[start:start + self.db.IN_CLAUSE_CHUNK_SIZE]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                for key, latitude, longitude in self.db.execute_query(
+                        f"SELECT address_key, latitude, longitude FROM {self.TABLE} "
+                        f"WHERE address_key IN ({placeholders})", tuple(chunk)) or []:
+                    self._memory[key] = (float(latitude), float(longitude))
+
+        resolved = []
+        for key in keys:
+            if key in self._memory:
+                continue
+            street, _, number = key.rpartition(" ")
+            if not number.isdigit():
+                street, number = key, ""
+            point = self.directory.locate(street, int(number) if number else None)
+            self._memory[key] = point
+            if point is not None:
+                resolved.append((key, point[0], point[1]))
+
+        if resolved and use_table:
+            try:
+                with self.db.transaction() as cursor:
+                    # Another process may have stored the same address meanwhile; its row wins
+                    cursor.executemany(self.db.backend.insert_ignore(
+                        self.TABLE, ("address_key", "latitude", "longitude")), resolved)
+            except Exception as err:
+                print(f"Could not store geocoded addresses: {err}")
+
+
+class SpatialIndex:
+    """
+    Uniform grid over points for radius and nearest queries. Points are
+    bucketed into square cells of `cell_km`; a query only measures the points
+    of the cells that overlap its circle, so it costs microseconds for a
+    city's worth of points instead of a scan of all of them.
+    """
+
+    def __init__(self, cell_km: float = 0.5, reference_latitude: float | None = None) -> None:
+        self.cell_km = cell_km
+        self._km_per_lon: float | None = None
+        if reference_latitude is not None:
+            self._set_reference(reference_latitude)
+        self._km_per_lat = math.pi * EARTH_RADIUS_KM / 180
+        self._cells: Dict[Tuple[int, int], Dict[Any, Point]] = {}
+        self._points: Dict[Any, Tuple[Point, Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._points
+
+    def insert(self, key: Any, point: Point) -> None:
+        self.remove(key)
+        if self._km_per_lon is None:
+            self._set_reference(point[0])
+        cell = self.cell_of(point)
+        self._cells.setdefault(cell, {})[key] = point
+        self._points[key] = (point, cell)
+
+    def remove(self, key: Any) -> None:
+        entry = self._points.pop(key, None)
+        if entry is not None:
+            cell = self._cells[entry[1]]
+            del cell[key]
+            if not cell:
+                del self._cells[entry[1]]
+
+    def cell_of(self, point: Point) -> Tuple[int, int]:
+        return (math.floor(point[0] * self._km_per_lat / self.cell_km),
+                math.floor(point[1] * self._km_per_lon / self.cell_km))
+
+    def within(self, center: Point, radius_km: float) -> List[Tuple[float, Any]]:
+        """(distance_km, key) of every point within `radius_km`, nearest first."""
+        if not self._points:
+            return []
+        row, column = self.cell_of(center)
+        reach_rows = math.ceil(radius_km / self.cell_km)
+        # Columns are cut at the reference latitude; nearer the pole a km spans more of them
+        farthest_latitude = min(abs(center[0]) + radius_km / self._km_per_lat, 89.0)
+        km_per_lon_there = self._km_per_lat * math.cos(math.radians(farthest_latitude))
+        reach_columns = math.ceil(radius_km * self._km_per_lon / km_per_lon_there / self.cell_km)
+        found = []
+        for cell_row in range(row - reach_rows, row + reach_rows + 1):
+            for cell_column in range(column - reach_columns, column + reach_columns + 1):
+                for key, point in self._cells.get((cell_row, cell_column), {}).items():
+                    distance = distance_km(center, point)
+                    if distance <= radius_km:
+                        found.append((distance, key))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, center: Point, count: int, max_km: float | None = None) -> List[Tuple[float, Any]]:
+        """The `count` nearest points (optionally only up to `max_km`), nearest first."""
+        radius = self.cell_km
+        while True:
+            found = self.within(center, radius)
+            done = len(found) >= count or len(found) == len(self._points) or (max_km is not None and radius >= max_km)
+            if done:
+                limit = max_km if max_km is not None else float("inf")
+                return [item for item in found if item[0] <= limit][:count]
+            radius *= 2
+
+    def _set_reference(self, latitude: float) -> None:
+        self._km_per_lon = math.pi * EARTH_RADIUS_KM / 180 * max(math.cos(math.radians(latitude)), 0.01)
+
+
+class PendingRequestIndex:
+    """
+    Spatial index over the pending requests. refresh(requests) takes the rows
+    of DeliveryController.list_available_requests and only geocodes and
+    inserts the new ones, so keeping it current is cheap; near() then answers
+    "requests within X km" from the grid.
+    """
+
+    def __init__(self, geocoder: Geocoder, cell_km: float = 0.5) -> None:
+        self.geocoder = geocoder
+        self.index = SpatialIndex(cell_km)
+        self.requests: Dict[int, Dict[str, Any]] = {}
+        self.unlocated: set = set()  # Pending requests whose address could not be geocoded
+
+    def refresh(self, requests: List[Dict[str, Any]]) -> None:
+        current = {request["request_id"]: request for request in requests}
+        for request_id in list(self.requests):
+            if request_id not in current:
+                self.index.remove(request_id)
+                del self.requests[request_id]
+        new = [request for request_id, request in current.items() if request_id not in self.requests]
+        points = self.geocoder.geocode_many(request["address"] for request in new)
+        self.unlocated = {request_id for request_id in self.unlocated if request_id in current}
+        for request in new:
+            self.requests[request["request_id"]] = request
+            point = points.get(request["address"])
+            if point is None:
+                self.unlocated.add(request["request_id"])
+            else:
+                self.index.insert(request["request_id"], point)
+
+    def near(self, center: Point, radius_km: float) -> List[Tuple[float, Dict[str, Any]]]:
+        """(distance_km, request) within `radius_km` of `center`, nearest first."""
+        return [(distance, self.requests[request_id]) for distance, request_id in self.index.within(center, radius_km)]
+
+
+# Geocoding commands: python Geocoding.py build | near ADDRESS [--km N] | bench [--points N]
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description="Geocode pending requests and query them by distance")
+    parser.add_argument("command", choices=["build", "near", "bench"])
+    parser.add_argument("address", nargs="?", help="Center of the 'near' search")
+    parser.add_argument("--km", type=float, default=2.0, help="Search radius")
+    parser.add_argument("--points", type=int, default=10_000, help="Synthetic points for the benchmark")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        # Points scattered over ~10 x 10 km around Patras; no database involved
+        rng = random.Random(42)
+        index = SpatialIndex()
+        points = [(38.20 + rng.random() * 0.09, 21.68 + rng.random() * 0.115) for _ in range(args.points)]
+        for key, point in enumerate(points):
+            index.insert(key, point)
+        centers = [(38.20 + rng.random() * 0.09, 21.68 + rng.random() * 0.115) for _ in range(200)]
+
+        start = time.perf_counter()
+        found = [index.within(center, args.km) for center in centers]
+        grid_ms = (time.perf_counter() - start) * 1000 / len(centers)
+        start = time.perf_counter()
+        scanned = [sorted((distance_km(center, point), key) for key, point in enumerate(points)
+                          if distance_km(center, point) <= args.km) for center in centers]
+        scan_ms = (time.perf_counter() - start) * 1000 / len(centers)
+        if [[key for _, key in hits] for hits in found] != [[key for _, key in hits] for hits in scanned]:
+            raise AssertionError("Grid and full scan found different points")
+        print(f"{args.points} points, {args.km} km radius, {sum(map(len, found)) / len(found):.0f} hits per query: "
+              f"grid {grid_ms:.3f}ms, full scan {scan_ms:.3f}ms per query")
+    else:
+        from DeliveryController import DeliveryController
+
+        controller = DeliveryController()
+        if args.command == "build":
+            start = time.perf_counter()
+            nearby = controller._nearby_index()
+            nearby.refresh(controller.list_available_requests())
+            print(f"Geocoded {len(nearby.index)} pending requests in {time.perf_counter() - start:.2f}s; "
+                  f"{len(nearby.unlocated)} addresses not found")
+        else:
+            if not args.address:
+                parser.error("near needs an ADDRESS")
+            start = time.perf_counter()
+            found = controller.list_requests_near(args.address, args.km)
+            elapsed = (time.perf_counter() - start) * 1000
+            for request in found[:20]:
+                print(f"#{request['request_id']:<6} {request['distance_km']:5.2f} km  {request['address']}")
+            print(f"{len(found)} pending requests within {args.km} km ({elapsed:.1f}ms)")
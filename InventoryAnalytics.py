@@ -0,0 +1,239 @@
+# InventoryAnalytics.py
+from __future__ import annotations
+import random
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Only the analytics need NumPy; the controllers work without it
+    np = None
+
+
+# Same classes as InventoryDetailController._get_quantity_status: a quantity
+# belongs to the first status whose upper bound it does not exceed
+STATUSES = ("critical", "low", "medium", "good", "excellent")
+STATUS_LIMITS = (5, 10, 25, 50)
+
+# Same levels as InventoryDetailController._calculate_inventory_health: an
+# average quantity reaches a level once it is at least its lower bound
+HEALTH_LEVELS = ("Needs attention", "Fair", "Good", "Excellent")
+HEALTH_LIMITS = (10, 20, 30)
+
+
+class InventoryAnalytics:
+    """
+    Inventory statistics computed on NumPy arrays instead of one Python call
+    per item. Quantities are loaded once; every figure is then a vectorized
+    classification (np.digitize) or a grouped reduction over category codes
+    (np.bincount; one sort, done on first use, for min/max/percentiles).
+    """
+
+    def __init__(self, categories: Sequence[str], quantities: Sequence[Any]) -> None:
+        if np is None:
+            raise ImportError("InventoryAnalytics needs NumPy (pip install numpy)")
+
+        # Codes are assigned per distinct spelling (a handful), so the only
+        # per-item Python work is one dict lookup. Categories compare
+        # case-insensitively, as in the database; the first spelling is shown.
+        spellings: Dict[str, int] = {}
+        spelling_codes = np.fromiter((spellings.setdefault(category, len(spellings)) for category in categories),
+                                     dtype=np.int64, count=len(categories))
+        code_of: Dict[str, int] = {}
+        self.categories: List[str] = []
+        merged = np.zeros(len(spellings), dtype=np.int64)
+        for spelling, index in spellings.items():
+            merged[index] = code_of.setdefault(spelling.lower(), len(code_of))
+            if merged[index] == len(self.categories):
+                self.categories.append(spelling)
+
+        self.codes = merged[spelling_codes]
+        # Missing quantities (NULL) count as 0 here (get_inventory_overview leaves them out of the totals)
+        self.quantities = np.nan_to_num(np.asarray(quantities, dtype=float)).astype(np.int64)
+        self.counts = np.bincount(self.codes, minlength=len(self.categories))
+        self._sorted = None
+
+    def _sorted_runs(self) -> Tuple[Any, Any]:
+        """Quantities sorted by category, then quantity (each category is one run), and the run starts."""
+        if self._sorted is None:
+            self._sorted = self.quantities[np.lexsort((self.quantities, self.codes))]
+            self._starts = np.concatenate(([0], np.cumsum(self.counts)[:-1])).astype(np.int64)
+        return self._sorted, self._starts
+
+    @classmethod
+    def load(cls, db, category: str | None = None) -> "InventoryAnalytics":
+        """Read the categories and quantities of the inventory in one query."""
+        query = "SELECT category, quantity FROM inventory WHERE category IS NOT NULL"
+        params: Tuple = ()
+        if category is not None:
+            query += " AND category = %s"
+            params = (category,)
+        rows = db.execute_query(query, params) or []
+        categories, quantities = zip(*rows) if rows else ((), ())
+        return cls(categories, quantities)
+
+    # ----------  PER ITEM  ----------
+    def status_codes(self) -> Any:
+        """Index into STATUSES of every item."""
+        return np.digitize(self.quantities, STATUS_LIMITS, right=True)
+
+    # ----------  PER CATEGORY  ----------
+    def totals(self) -> Any:
+        return np.bincount(self.codes, weights=self.quantities, minlength=len(self.categories)).astype(np.int64)
+
+    def averages(self) -> Any:
+        return self.totals() / np.maximum(self.counts, 1)
+
+    def minimums(self) -> Any:
+        ordered, starts = self._sorted_runs()
+        return ordered[starts] if len(ordered) else np.zeros(0, dtype=np.int64)
+
+    def maximums(self) -> Any:
+        ordered, starts = self._sorted_runs()
+        return ordered[starts + self.counts - 1] if len(ordered) else np.zeros(0, dtype=np.int64)
+
+    def status_counts(self) -> Any:
+        """(categories x STATUSES) matrix of item counts."""
+        cells = self.codes * len(STATUSES) + self.status_codes()
+        return np.bincount(cells, minlength=len(self.categories) * len(STATUSES)).reshape(-1, len(STATUSES))
+
+    def histogram(self, edges: Sequence[int]) -> Any:
+        """
+        (categories x len(edges) + 1) matrix of item counts: column i counts the
+        quantities below edges[i] and not below edges[i - 1].
+        """
+        columns = len(edges) + 1
+        cells = self.codes * columns + np.digitize(self.quantities, edges)
+        return np.bincount(cells, minlength=len(self.categories) * columns).reshape(-1, columns)
+
+    def percentiles(self, pcts: Sequence[float] = (25, 50, 75, 90)) -> Any:
+        """(categories x pcts) matrix of nearest-rank percentiles (as QueryInstrumentation.percentile)."""
+        ordered, starts = self._sorted_runs()
+        if not len(ordered):
+            return np.zeros((0, len(pcts)), dtype=np.int64)
+        ranks = np.maximum(1, np.ceil(np.outer(self.counts, pcts) / 100)).astype(np.int64)
+        return ordered[starts[:, None] + ranks - 1]
+
+    def health(self) -> List[str]:
+        """Health level of every category from its average quantity."""
+        averages = self.averages()
+        levels = np.digitize(averages, HEALTH_LIMITS)
+        return ["No data" if average == 0 else HEALTH_LEVELS[level] for average, level in zip(averages, levels)]
+
+    # ----------  RESULT SHAPES OF THE CONTROLLER  ----------
+    def categories_summary(self) -> List[Dict[str, Any]]:
+        """Same list of dicts as InventoryDetailController.get_all_categories_summary."""
+        totals, averages = self.totals(), self.averages()
+        summaries = [{
+            'category': category,
+            'item_count': int(self.counts[index]),
+            'total_quantity': int(totals[index]),
+            'average_quantity': float(averages[index]),
+            'health': health
+        } for index, (category, health) in enumerate(zip(self.categories, self.health()))]
+        return sorted(summaries, key=lambda summary: summary['category'].lower())
+
+    def categories_statistics(self, pcts: Sequence[float] = (25, 50, 75, 90)) -> List[Dict[str, Any]]:
+        """The summary plus min/max, status buckets and percentiles of every category."""
+        minimums, maximums = self.minimums(), self.maximums()
+        buckets, percentiles = self.status_counts(), self.percentiles(pcts)
+        index_of = {category: index for index, category in enumerate(self.categories)}
+        statistics = []
+        for summary in self.categories_summary():
+            index = index_of[summary['category']]
+            summary.update({
+                'min_quantity': int(minimums[index]),
+                'max_quantity': int(maximums[index]),
+                'status_counts': dict(zip(STATUSES, buckets[index].tolist())),
+                'percentiles': dict(zip(pcts, percentiles[index].tolist()))
+            })
+            statistics.append(summary)
+        return statistics
+
+
+# Per-row path of the controller, kept here as the benchmark reference
+def summarize_per_row(rows: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+    from InventoryDetailController import InventoryDetailController
+    classify = InventoryDetailController.__new__(InventoryDetailController)  # The classifiers need no database
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for category, quantity in rows:
+        quantity = quantity or 0
+        group = groups.setdefault(category.lower(), {
+            'category': category, 'item_count': 0, 'total_quantity': 0,
+            'status_counts': dict.fromkeys(STATUSES, 0)})
+        group['item_count'] += 1
+        group['total_quantity'] += quantity
+        group['status_counts'][classify._get_quantity_status(quantity)] += 1
+
+    summaries = []
+    for group in groups.values():
+        average = group['total_quantity'] / group['item_count']
+        summaries.append({
+            'category': group['category'],
+            'item_count': group['item_count'],
+            'total_quantity': group['total_quantity'],
+            'average_quantity': average,
+            'health': classify._calculate_inventory_health(average, None),
+            'status_counts': group['status_counts']
+        })
+    return sorted(summaries, key=lambda summary: summary['category'].lower())
+
+
+def benchmark(items: int = 100_000, repeat: int = 5, seed: int = 42) -> Dict[str, float]:
+    """Best-of-`repeat` milliseconds of both paths on `items` synthetic rows (no database involved)."""
+    from DatasetGenerator import CATEGORIES
+
+    rng = random.Random(seed)
+    rows = [(rng.choice(CATEGORIES), int(rng.paretovariate(1.5) * 5)) for _ in range(items)]
+
+    def best(function):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings), result
+
+    def vectorized():
+        analytics = InventoryAnalytics(*zip(*rows))
+        buckets = analytics.status_counts()
+        summaries = analytics.categories_summary()
+        for summary in summaries:
+            index = analytics.categories.index(summary['category'])
+            summary['status_counts'] = dict(zip(STATUSES, buckets[index].tolist()))
+        return summaries
+
+    per_row_ms, expected = best(lambda: summarize_per_row(rows))
+    vectorized_ms, actual = best(vectorized)
+    for want, got in zip(expected, actual):
+        if want.keys() != got.keys() or any(
+                abs(want[key] - got[key]) > 1e-9 if key == 'average_quantity' else want[key] != got[key]
+                for key in want):
+            raise AssertionError(f"Vectorized summary differs: {got} != {want}")
+    return {"items": items, "per_row_ms": per_row_ms, "vectorized_ms": vectorized_ms}
+
+
+# Analytics commands: python InventoryAnalytics.py summary|benchmark
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vectorized inventory analytics")
+    parser.add_argument("command", choices=["summary", "benchmark"])
+    parser.add_argument("--items", type=int, default=100_000, help="Synthetic items for the benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        from Database import Database
+
+        for stats in InventoryAnalytics.load(Database()).categories_statistics():
+            print(f"{stats['category']}: {stats['item_count']} items, total {stats['total_quantity']}, "
+                  f"avg {stats['average_quantity']:.1f}, min/max {stats['min_quantity']}/{stats['max_quantity']}, "
+                  f"p50 {stats['percentiles'][50]}, health {stats['health']}")
+            print("    " + ", ".join(f"{status}: {count}" for status, count in stats['status_counts'].items()))
+    else:
+        result = benchmark(args.items, args.repeat)
+        print(f"{result['items']} items: per-row {result['per_row_ms']:.1f}ms, "
+              f"vectorized {result['vectorized_ms']:.1f}ms "
+              f"({result['per_row_ms'] / max(result['vectorized_ms'], 1e-9):.1f}x)")
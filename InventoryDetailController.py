@@ -1,5 +1,7 @@
 from Database import Database
+from DataExporter import DataExporter
 from datetime import datetime
+import gzip
 import json
 
 
@@ -12,6 +14,90 @@ class InventoryDetailController:
     def __init__(self):
         self.db = Database()
     
+    def get_inventory_overview(self, low_stock_threshold=10, category=None):
+        """
+        Everything the inventory screens and reports show, for all categories
+        (or just `category`), computed from a single scan of the inventory.
+        
+        Args:
+            low_stock_threshold (int): Quantity at or below which an item is listed as low stock
+            category (str, optional): Only summarize this category
+            
+        Returns:
+            list: One dict per category, ordered by category name, with the item
+                  count, total/average/min/max quantity, the number of items per
+                  quantity status, the health, the items and the low stock items.
+                  As in the per-category queries, a NULL quantity or description
+                  stays None and such an item only counts towards item_count.
+        """
+        try:
+            query = "SELECT category, item_name, description, quantity FROM inventory"
+            params = ()
+            if category is not None:
+                query += " WHERE category = %s"
+                params = (category,)
+            results = self.db.execute_query(query + " ORDER BY category, item_name", params)
+            
+            overview = {}
+            quantified = {} # category key -> items with a quantity (AVG() leaves NULLs out)
+            for row_category, item_name, description, quantity in results or []:
+                if row_category is None:
+                    continue
+                # Categories compare case-insensitively, like GROUP BY in the database
+                key = row_category.lower()
+                summary = overview.get(key)
+                if summary is None:
+                    summary = overview[key] = {
+                        'category': row_category,
+                        'item_count': 0,
+                        'total_quantity': 0,
+                        'min_quantity': None,
+                        'max_quantity': None,
+                        'status_counts': {'critical': 0, 'low': 0, 'medium': 0, 'good': 0, 'excellent': 0},
+                        'items': [],
+                        'low_stock': []
+                    }
+                    quantified[key] = 0
+                
+                summary['item_count'] += 1
+                status = None
+                # A NULL quantity counts as an item but, as in SUM/MIN/MAX, not in the totals or the stock checks
+                if quantity is not None:
+                    status = self._get_quantity_status(quantity)
+                    quantified[key] += 1
+                    summary['total_quantity'] += quantity
+                    if summary['min_quantity'] is None or quantity < summary['min_quantity']:
+                        summary['min_quantity'] = quantity
+                    if summary['max_quantity'] is None or quantity > summary['max_quantity']:
+                        summary['max_quantity'] = quantity
+                    summary['status_counts'][status] += 1
+                    if quantity <= low_stock_threshold:
+                        summary['low_stock'].append({
+                            'item_name': item_name,
+                            'quantity': quantity,
+                            'status': 'critical' if quantity <= 5 else 'low'
+                        })
+                summary['items'].append({
+                    'name': item_name,
+                    'description': description,
+                    'quantity': quantity,
+                    'status': status
+                })
+            
+            summaries = list(overview.values())
+            for key, summary in overview.items():
+                average = summary['total_quantity'] / quantified[key] if quantified[key] else None
+                summary['average_quantity'] = average or 0
+                summary['health'] = self._calculate_inventory_health(average, summary['min_quantity'])
+                summary['min_quantity'] = summary['min_quantity'] or 0
+                summary['max_quantity'] = summary['max_quantity'] or 0
+                summary['low_stock'].sort(key=lambda item: item['quantity'])
+            return summaries
+            
+        except Exception as e:
+            print(f"Error getting inventory overview: {e}")
+            return []
+    
     def get_all_categories(self):
         """
         Retrieves all unique categories from the inventory.
@@ -289,37 +375,33 @@ class InventoryDetailController:
             category (str): The category name
             
         Returns:
-            dict: Comprehensive category report
+            dict: Comprehensive category report, or None if the category has no items
         """
         try:
-            # Get basic details
-            details = self.get_category_details(category)
-            if not details:
+            # Details, statistics and low stock items come from the same single query
+            summaries = self.get_inventory_overview(category=category)
+            if not summaries:
                 return None
-            
-            # Get statistics
-            stats = self.get_category_statistics(category)
-            
-            # Get low stock items
-            low_stock = self.get_low_stock_items_by_category(category)
+            summary = summaries[0]
             
             # Build report
             report = {
                 'category': category,
                 'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'summary': {
-                    'total_items': details['item_count'],
-                    'total_quantity': details['total_quantity'],
-                    'average_quantity': stats['average_quantity'] if stats else 0,
-                    'min_quantity': stats['min_quantity'] if stats else 0,
-                    'max_quantity': stats['max_quantity'] if stats else 0
+                    'total_items': summary['item_count'],
+                    'total_quantity': summary['total_quantity'],
+                    'average_quantity': summary['average_quantity'],
+                    'min_quantity': summary['min_quantity'],
+                    'max_quantity': summary['max_quantity']
                 },
-                'inventory_health': stats['inventory_health'] if stats else 'Unknown',
+                'inventory_health': summary['health'],
+                'status_counts': summary['status_counts'],
                 'low_stock_alert': {
-                    'count': len(low_stock),
-                    'items': low_stock
+                    'count': len(summary['low_stock']),
+                    'items': summary['low_stock']
                 },
-                'items': details['items']
+                'items': summary['items']
             }
             
             return report
@@ -374,31 +456,62 @@ class InventoryDetailController:
         else:
             return 'Needs attention'
     
-    def export_category_data(self, category):
+    def export_category_data(self, category, path):
         """
-        Exports category data in a format suitable for reporting.
+        Streams a category report to a JSON Lines file (gzip compressed when
+        the name ends in .gz). The first line holds the export date and the
+        category statistics; every following line is one item with its status.
+        Items are read chunk by chunk through DataExporter.chunks, so memory
+        does not grow with the category.
         
         Args:
             category (str): The category name
+            path (str): Output file (.jsonl or .jsonl.gz)
             
         Returns:
-            dict: Exportable category data
+            int: Number of exported items, or None if the category has no items or on error
         """
         try:
-            report = self.get_category_report(category)
-            if report:
-                # Format for export (could be JSON, CSV, etc.)
-                export_data = {
-                    'export_date': datetime.now().isoformat(),
-                    'category_report': report
-                }
-                return export_data
-            return None
+            stats = self.get_category_statistics(category)
+            if not stats or not stats['item_count']:
+                return None
+            
+            opener = gzip.open if path.endswith('.gz') else open
+            count = 0
+            with opener(path, 'wt', encoding='utf-8') as stream:
+                header = {'export_date': datetime.now().isoformat(), 'category_report': stats}
+                stream.write(json.dumps(header, default=str, ensure_ascii=False) + '\n')
+                for chunk in DataExporter(self.db).chunks('inventory', category=category):
+                    for item in chunk:
+                        quantity = item['quantity']
+                        item['status'] = self._get_quantity_status(quantity) if quantity is not None else None
+                        stream.write(json.dumps(item, default=str, ensure_ascii=False) + '\n')
+                    count += len(chunk)
+            return count
             
         except Exception as e:
             print(f"Error exporting category data: {e}")
             return None
     
+    def export_inventory(self, path, category=None):
+        """
+        Streams the inventory (or one category) to a CSV / JSON Lines file
+        chunk by chunk, see DataExporter.
+        
+        Args:
+            path (str): Output file (.csv or .jsonl, optionally followed by .gz)
+            category (str, optional): Only export this category
+            
+        Returns:
+            int: Number of exported items, or None on error
+        """
+        try:
+            filters = {'category': category} if category is not None else {}
+            return DataExporter(self.db).export('inventory', path, **filters)
+        except Exception as e:
+            print(f"Error exporting inventory: {e}")
+            return None
+    
     def close(self):
         """
         Closes the database connection.
@@ -436,9 +549,10 @@ if __name__ == "__main__":
 
     # Get all categories summary
     print("\nAll Categories Summary:")
-    summaries = controller.get_all_categories_summary()
+    summaries = controller.get_inventory_overview()
     for summary in summaries:
         print(f"  {summary['category']}: {summary['item_count']} items, "
-              f"Total: {summary['total_quantity']}, Health: {summary['health']}")
+              f"Total: {summary['total_quantity']}, Health: {summary['health']}, "
+              f"Low stock: {len(summary['low_stock'])}")
     
     controller.close()
\ No newline at end of file
@@ -1,24 +1,97 @@
+import threading
+import time
+from bisect import bisect_right
 from Database import Database
+from DataVersion import DataVersion
+
+PAGE_SIZE = 100 # Menu rows fetched per query
+REVALIDATE_SECONDS = 2.0 # How long a checked snapshot is served without asking the database again
+
+
+class MenuSnapshot:
+    """The whole menu in memory, as loaded by one query."""
+    
+    def __init__(self, rows, version):
+        self.version = version
+        # Keys are lower-cased: item names compare case-insensitively in the database
+        self.items = {}
+        for item_name, category, description, quantity in rows:
+            self.items[item_name.lower()] = {
+                'item_name': item_name,
+                'category': category,
+                'description': description,
+                'quantity': quantity
+            }
+        # Available items in menu order, with their sort keys for paging
+        self.available = sorted(
+            ((item['item_name'], item['quantity']) for item in self.items.values() if (item['quantity'] or 0) > 0),
+            key=lambda row: row[0].lower())
+        self.available_keys = [item_name.lower() for item_name, _ in self.available]
+    
+    def get(self, item_name):
+        return self.items.get(item_name.lower()) if item_name else None
 
 
 class MenuController:
     
     def __init__(self):
         self.database = Database()
+        self._snapshot = None
+        self._checked_at = 0.0 # time.monotonic() of the last version check
+        self._snapshot_lock = threading.Lock() # Screens call in from worker threads too
+    
+    # ----------  SNAPSHOT  ----------
+    def inventory_version(self):
+        """
+        Marker that changes whenever the inventory changes: the inventory
+        counter of DataVersion (a one-row lookup). Without the counter table,
+        row count, total quantity and newest id are read in one aggregate query.
+        """
+        version = DataVersion.current(self.database, DataVersion.INVENTORY)
+        if version is not None:
+            return version
+        result = self.database.execute_query(
+            "SELECT COUNT(*), COALESCE(SUM(quantity), 0), COALESCE(MAX(item_id), 0) FROM inventory")
+        return tuple(result[0]) if result else None
+    
+    def menu_snapshot(self):
+        """
+        The in-memory menu, loaded with one query. It is served without any query
+        for REVALIDATE_SECONDS after each check; after that one version probe
+        decides whether it is still current or has to be reloaded.
+        """
+        with self._snapshot_lock:
+            now = time.monotonic()
+            if self._snapshot is not None and now - self._checked_at < REVALIDATE_SECONDS:
+                return self._snapshot
+            
+            version = self.inventory_version()
+            if self._snapshot is None or version is None or version != self._snapshot.version:
+                # Version first: a change made while the rows are read shows up at the next check
+                rows = self.database.execute_query(
+                    "SELECT item_name, category, description, quantity FROM inventory") or []
+                self._snapshot = MenuSnapshot(rows, version)
+            self._checked_at = now
+            return self._snapshot
+    
+    def revalidate(self):
+        """Check the version at the next access instead of waiting for REVALIDATE_SECONDS."""
+        self._checked_at = 0.0
     
+    def invalidate(self):
+        """Drop the snapshot (e.g. after this process changed the inventory)."""
+        with self._snapshot_lock:
+            self._snapshot = None
+    
+    # ----------  MENU  ----------
     def check_availability(self):
         """Check inventory table for available items and return the data"""
         try:
-            # Query to get all items from inventory table
-            query = "SELECT item_name, quantity FROM inventory WHERE quantity > 0"
-            available_items = self.database.execute_query(query)
+            available_items = self.menu_snapshot().available
             
             if available_items:
-                print("Available items found:")
-                for item in available_items:
-                    item_name, quantity = item
-                    print(f"- {item_name}: {quantity} available")
-                return available_items
+                print(f"Available items found: {len(available_items)}")
+                return list(available_items)
             else:
                 print("No items currently available in inventory.")
                 return []
@@ -27,6 +100,30 @@ class MenuController:
             print(f"Error checking inventory availability: {e}")
             return []
     
+    def count_available(self):
+        """Number of items with quantity > 0 (the rows get_available_page pages through)"""
+        try:
+            return len(self.menu_snapshot().available)
+        except Exception as e:
+            print(f"Error counting available items: {e}")
+            return 0
+    
+    def get_available_page(self, after_item=None, limit=PAGE_SIZE):
+        """
+        One page of available items ordered by item_name, as (item_name, quantity) rows.
+        Pass the last item_name of the previous page as after_item. Pages and
+        count_available come from the same snapshot and its order (names
+        compared lower-cased), so a key from one page always finds its place
+        in the next; the database collation is not involved.
+        """
+        try:
+            snapshot = self.menu_snapshot()
+            start = bisect_right(snapshot.available_keys, after_item.lower()) if after_item is not None else 0
+            return snapshot.available[start:start + limit]
+        except Exception as e:
+            print(f"Error loading menu page: {e}")
+            return []
+    
     def get_all_inventory_items(self):
         """Get all items from inventory table regardless of availability"""
         try:
@@ -46,11 +143,10 @@ class MenuController:
     def get_item_quantity(self, item_name):
         """Get the quantity of a specific item from inventory"""
         try:
-            query = "SELECT quantity FROM inventory WHERE item_name = %s"
-            result = self.database.execute_query(query, (item_name,))
+            item = self.menu_snapshot().get(item_name)
             
-            if result:
-                return result[0][0]  # Return the quantity
+            if item:
+                return item['quantity'] or 0  # Return the quantity
             else:
                 print(f"Item '{item_name}' not found in inventory.")
                 return 0
@@ -78,15 +174,13 @@ class MenuController:
     def get_item_details(self, item_name):
         """Get detailed information about a specific item from inventory (category, description)"""
         try:
-            query = "SELECT item_name, category, description FROM inventory WHERE item_name = %s"
-            result = self.database.execute_query(query, (item_name,))
+            item = self.menu_snapshot().get(item_name)
             
-            if result:
-                item_name, category, description = result[0]
+            if item:
                 return {
-                    'item_name': item_name,
-                    'category': category,
-                    'description': description
+                    'item_name': item['item_name'],
+                    'category': item['category'],
+                    'description': item['description']
                 }
             else:
                 print(f"Item '{item_name}' not found in inventory.")
@@ -117,5 +211,5 @@ class MenuController:
         
     def close(self):
         """Close database connection"""
-        if hasattr(self.db, 'close'):
-            self.db.close()   
\ No newline at end of file
+        if hasattr(self.database, 'close'):
+            self.database.close()   
\ No newline at end of file
@@ -0,0 +1,326 @@
+# Migrations.py
+from __future__ import annotations
+import contextlib
+import io
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from DataVersion import DataVersion
+from Database import Database
+from Geocoding import Geocoder
+from QueryInstrumentation import QueryInstrumentation, fingerprint
+
+
+# Versioned schema changes, applied in order and recorded in `schema_migrations`.
+# Each step is ("index", table, index_name, columns, unique),
+# ("table", table, None, column definitions, False) or
+# ("column", table, column_name, column definition, False).
+MIGRATIONS: List[Tuple[int, str, List[Tuple]]] = [
+    (1, "Indexes for the hot request/delivery lookups", [
+        ("index", "food_requests", "idx_food_requests_customer_status", ("customer_id", "status"), False),
+        ("index", "food_requests", "idx_food_requests_status_created", ("status", "created_at"), False),
+        ("index", "food_requests", "idx_food_requests_delivery_status", ("delivery_status",), False),
+        ("index", "food_request_items", "idx_food_request_items_request", ("request_id",), False),
+        ("index", "donations", "idx_donations_donor", ("donor_id",), False),
+        ("index", "deliveries", "idx_deliveries_agent", ("agent_id",), False),
+        ("index", "deliveries", "idx_deliveries_request", ("request_id",), False),
+    ]),
+    (2, "Unique keys on inventory item names and user emails", [
+        ("index", "inventory", "uq_inventory_item_name", ("item_name",), True),
+        ("index", "users", "uq_users_email", ("email",), True),
+    ]),
+    (3, "Change counters for cache revalidation", [
+        ("table", DataVersion.TABLE, None,
+         ("name VARCHAR(64) NOT NULL PRIMARY KEY", "version BIGINT NOT NULL DEFAULT 0"), False),
+    ]),
+    (4, "Persistent geocoding cache", [
+        ("table", "geocode_cache", None,
+         ("address_key VARCHAR(255) NOT NULL PRIMARY KEY", "latitude DOUBLE NOT NULL",
+          "longitude DOUBLE NOT NULL"), False),
+    ]),
+    (5, "Assignment and completion times of deliveries", [
+        ("column", "deliveries", "assigned_at", "DATETIME NULL", False),
+        ("column", "deliveries", "completed_at", "DATETIME NULL", False),
+    ]),
+    (6, "Indexes for the category and role lookups", [
+        ("index", "inventory", "idx_inventory_category_quantity", ("category", "quantity"), False),
+        ("index", "users", "idx_users_role", ("role",), False),
+    ]),
+]
+
+# Full scans that are expected: the query reads (nearly) every row of the table
+# by design, so an index could not help. Keyed by (workload entry, table).
+ALLOWED_FULL_SCANS: Dict[Tuple[str, str], str] = {
+    ("MenuController.menu_snapshot", "inventory"): "snapshot of the whole menu",
+    ("MenuController.get_all_inventory_items", "inventory"): "lists every item",
+    ("Database.get_completed_delivery_times", "d"): "newest deliveries by primary key, stops at the LIMIT",
+}
+
+
+def query_workload(db) -> Dict[str, Callable[[], Any]]:
+    """
+    Calls of the Database and controller methods that run SQL, keyed by
+    "Class.method", with arguments sampled from the seeded database. Some of
+    them write (the claim takes a pending request, update_quantity bumps the
+    inventory version); run them inside Database.rolled_back(), as
+    check_query_plans does, to keep the database unchanged.
+    """
+    from DeliveryController import DeliveryController
+    from FoodRequest import FoodRequest
+    from InventoryDetailController import InventoryDetailController
+    from MenuController import MenuController
+    from ModificationValidator import ModificationValidator
+    from OrderStatusController import OrderStatusController
+    from PendingOrdersController import PendingOrdersController
+    from PersonalDonationsController import PersonalDonationsController
+    from StatisticsReportController import StatisticsReportController
+    from CredentialController import CredentialController
+
+    def first(sql, default=None):
+        rows = db.execute_query(sql) or []
+        return rows[0] if rows else default
+
+    customer_id, email, password = first(
+        "SELECT id, email, password FROM users WHERE role = 'customer' ORDER BY id LIMIT 1", (0, "", ""))
+    agent_id = first("SELECT id FROM users WHERE role = 'dropoffagent' ORDER BY id LIMIT 1", (0,))[0]
+    item_name, category, quantity = first(
+        "SELECT item_name, category, quantity FROM inventory ORDER BY item_id LIMIT 1", ("", "", 0))
+    request_id, request_status = first("SELECT id, status FROM food_requests ORDER BY id LIMIT 1", (0, "pending"))
+    delivery_id, delivery_status, eta = first(
+        "SELECT id, status, eta FROM deliveries ORDER BY id LIMIT 1", (0, "pending", None))
+    donor_id, donation_id = first("SELECT donor_id, id FROM donations ORDER BY id LIMIT 1", (0, 0))
+
+    deliveries = DeliveryController()
+    inventory = InventoryDetailController()
+    menu = MenuController()
+    validator = ModificationValidator()
+    pending_orders = PendingOrdersController()
+    order_status = OrderStatusController()
+    donations = PersonalDonationsController()
+
+    return {
+        "Database.check_availability": lambda: db.check_availability({item_name: 1}),
+        "Database.reserve_order": lambda: db.reserve_order(
+            FoodRequest(customer_id, "Explain street 1", 1, None, {item_name: (quantity or 0) + 10 ** 6})),
+        "Database.update_request_status": lambda: db.update_request_status(request_id, request_status),
+        "Database.query_order": lambda: db.query_order(customer_id),
+        "Database.query_order_history": lambda: db.query_order_history(customer_id),
+        "Database.get_items_for_requests": lambda: db.get_items_for_requests([request_id, request_id + 1]),
+        "Database.get_users_by_ids": lambda: db.get_users_by_ids([customer_id, agent_id]),
+        "Database.get_user_by_email": lambda: db.get_user_by_email(email),
+        "Database.get_user_by_id": lambda: db.get_user_by_id(customer_id),
+        "Database.email_exists": lambda: db.email_exists(email),
+        "Database.get_donation_by_id": lambda: db.get_donation_by_id(donation_id),
+        "Database.get_donations_by_donor": lambda: db.get_donations_by_donor(donor_id),
+        "Database.get_all_donations": lambda: db.get_all_donations(),
+        "Database.list_available_requests": lambda: db.list_available_requests(50),
+        "Database.get_open_delivery_loads": lambda: db.get_open_delivery_loads(),
+        "Database.get_agent_deliveries": lambda: db.get_agent_deliveries(agent_id),
+        "Database.get_agent_open_stops": lambda: db.get_agent_open_stops(agent_id),
+        "Database.get_completed_delivery_times": lambda: db.get_completed_delivery_times(100),
+        "Database.get_delivery_for_eta": lambda: (db.get_delivery_for_eta(delivery_id),
+                                                  db.get_delivery_for_eta(request_id=request_id)),
+        "Database.update_delivery_status": lambda: db.update_delivery_status(delivery_id, delivery_status, eta),
+        "DeliveryController.claim_next": lambda: deliveries.claim_next(agent_id),
+        "DeliveryController.list_my_deliveries": lambda: deliveries.list_my_deliveries(agent_id),
+        "DeliveryController.plan_route": lambda: deliveries.plan_route(agent_id),
+        "DeliveryController.estimate_request_eta": lambda: deliveries.estimate_request_eta(request_id),
+        "InventoryDetailController.get_inventory_overview": lambda: inventory.get_inventory_overview(),
+        "InventoryDetailController.get_all_categories": lambda: inventory.get_all_categories(),
+        "InventoryDetailController.get_category_details": lambda: inventory.get_category_details(category),
+        "InventoryDetailController.get_items_by_category": lambda: inventory.get_items_by_category(category),
+        "InventoryDetailController.get_category_statistics": lambda: inventory.get_category_statistics(category),
+        "InventoryDetailController.get_low_stock_items_by_category":
+            lambda: inventory.get_low_stock_items_by_category(category),
+        "InventoryDetailController.get_all_categories_summary": lambda: inventory.get_all_categories_summary(),
+        "InventoryDetailController.search_items_in_category":
+            lambda: inventory.search_items_in_category(category, item_name[:3]),
+        "InventoryDetailController.get_category_report": lambda: inventory.get_category_report(category),
+        "MenuController.menu_snapshot": lambda: (menu.invalidate(), menu.menu_snapshot()),
+        "MenuController.inventory_version": lambda: menu.inventory_version(),
+        "MenuController.get_all_inventory_items": lambda: menu.get_all_inventory_items(),
+        "ModificationValidator.check_item_exists": lambda: validator.check_item_exists(item_name),
+        "ModificationValidator.get_item_details": lambda: validator.get_item_details(item_name),
+        "ModificationValidator.update_quantity": lambda: validator.update_quantity(item_name, quantity),
+        "PendingOrdersController.get_all_pending_orders": lambda: pending_orders.get_all_pending_orders(),
+        "PendingOrdersController.get_pending_orders_count": lambda: pending_orders.get_pending_orders_count(),
+        "PendingOrdersController.get_pending_orders_by_filter":
+            lambda: pending_orders.get_pending_orders_by_filter("customer", customer_id),
+        "OrderStatusController.requestOrdersWithPendingDeliveries":
+            lambda: order_status.requestOrdersWithPendingDeliveries(),
+        "OrderStatusController.getPendingDeliveriesCount": lambda: order_status.getPendingDeliveriesCount(),
+        "PersonalDonationsController.find_personal_donations": lambda: donations.find_personal_donations(donor_id),
+        "PersonalDonationsController.get_donation_details": lambda: donations.get_donation_details(donation_id),
+        "StatisticsReportController.collect_kpis": lambda: StatisticsReportController(db).collect_kpis(),
+        "CredentialController.login": lambda: CredentialController().login(email, password),
+    }
+
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE)\b", re.IGNORECASE)
+_CATALOG = re.compile(r"\b(information_schema|sqlite_master)\b", re.IGNORECASE)
+
+
+class MigrationRunner:
+    """Applies the pending entries of MIGRATIONS and checks query plans."""
+
+    TABLE = "schema_migrations"
+
+    def __init__(self, db) -> None:
+        self.db = db
+        self.statements_checked = 0  # Set by check_query_plans
+
+    def current_version(self) -> int:
+        self._create_table()
+        rows = self.db.execute_query(f"SELECT MAX(version) FROM {self.TABLE}")
+        return int(rows[0][0]) if rows and rows[0][0] is not None else 0
+
+    def pending(self) -> List[Tuple[int, str, List[Tuple]]]:
+        version = self.current_version()
+        return [migration for migration in MIGRATIONS if migration[0] > version]
+
+    def apply(self) -> List[int]:
+        """Run every pending migration; returns the versions that were applied."""
+        applied = []
+        for version, description, steps in self.pending():
+            try:
+                for step in steps:
+                    self._apply_step(step)
+            except Exception as err:
+                # Leave the version unrecorded so the migration is retried next time
+                print(f"Migration {version} failed: {err}")
+                break
+            self.db.execute_query(
+                f"INSERT INTO {self.TABLE} (version, description) VALUES (%s, %s)", (version, description))
+            print(f"Applied migration {version}: {description}")
+            applied.append(version)
+        if applied:
+            DataVersion._enabled = None  # New tables have to be looked up again
+            Geocoder._enabled = None
+            Database._delivery_times = None
+        return applied
+
+    def check_query_plans(self) -> List[Dict[str, Any]]:
+        """
+        Runs query_workload, records every statement it sends through
+        QueryInstrumentation, and EXPLAINs each distinct SELECT / UPDATE /
+        DELETE with the parameters it ran with. Returns the full scans not in
+        ALLOWED_FULL_SCANS (on MySQL: type ALL and no possible keys), each as
+        {"query": workload entry, "table", "sql"}. Calls that fail and
+        statements that cannot be EXPLAINed are reported with table None, as
+        they could not be checked. Everything runs inside
+        Database.rolled_back(), so the database is left unchanged.
+        """
+        statements: Dict[str, Tuple[str, str, Any]] = {}  # fingerprint -> (entry, sql, params)
+        current: List[str] = []
+
+        def on_query(event: Dict[str, Any]) -> None:
+            if current and _EXPLAINABLE.match(event["sql"]) and not _CATALOG.search(event["sql"]):
+                statements.setdefault(event["fingerprint"], (current[0], event["sql"], event["params"]))
+
+        problems: List[Dict[str, Any]] = []
+        with Database.rolled_back():
+            workload = query_workload(self.db)
+            QueryInstrumentation.add_listener(on_query)
+            try:
+                for name, call in workload.items():
+                    current[:] = [name]
+                    try:
+                        with contextlib.redirect_stdout(io.StringIO()):  # The controllers print debug output
+                            call()
+                    except Exception as err:
+                        problems.append({"query": name, "table": None, "sql": f"call failed: {err}"})
+            finally:
+                current.clear()
+                QueryInstrumentation.remove_listener(on_query)
+
+            self.statements_checked = len(statements)
+            for name, sql, params in statements.values():
+                try:
+                    with self.db.transaction() as cursor:
+                        tables = self.db.backend.full_scans(cursor, sql, tuple(params or ()))
+                except Exception as err:  # The statement itself is broken, e.g. a column the schema lacks
+                    problems.append({"query": name, "table": None, "sql": f"EXPLAIN failed: {err}: {sql}"})
+                    continue
+                problems.extend({"query": name, "table": table, "sql": sql}
+                                for table in tables if (name, table) not in ALLOWED_FULL_SCANS)
+        return problems
+
+    # ----------  HELPERS  ----------
+    def _create_table(self) -> None:
+        self.db.execute_query(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                version INT NOT NULL PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _apply_step(self, step: Tuple) -> None:
+        kind, table, name, columns, unique = step
+        if kind == "table":
+            with self.db.transaction() as cursor:
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+            return
+        if kind == "column":
+            if not self._table_exists(table):
+                print(f"Skipping {table}.{name}: table {table} does not exist")
+                return
+            if name not in self.db.backend.column_names(self.db, table):
+                with self.db.transaction() as cursor:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {columns}")
+            return
+        if kind != "index":
+            raise ValueError(f"Unknown migration step: {kind}")
+
+        if not self._table_exists(table):
+            print(f"Skipping {name}: table {table} does not exist")
+            return
+        if self._has_index(table, columns, unique):
+            return  # The dump may already declare an equivalent key
+
+        keyword = "UNIQUE INDEX" if unique else "INDEX"
+        with self.db.transaction() as cursor:  # Raises instead of printing, unlike execute_query
+            cursor.execute(f"CREATE {keyword} {name} ON {table} ({', '.join(columns)})")
+
+    def _table_exists(self, table: str) -> bool:
+        return self.db.backend.table_exists(self.db, table)
+
+    def _has_index(self, table: str, columns: Tuple[str, ...], unique: bool) -> bool:
+        """True if some index starts with exactly these columns (and is unique when required)."""
+        for is_unique, index_columns in self.db.backend.index_columns(self.db, table).values():
+            if tuple(index_columns[:len(columns)]) == tuple(columns) and (is_unique or not unique):
+                if not unique or len(index_columns) == len(columns):
+                    return True
+        return False
+
+
+# Schema commands: python Migrations.py status|apply|explain
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="FoodShare schema migrations")
+    parser.add_argument("command", choices=["status", "apply", "explain"])
+    args = parser.parse_args()
+
+    runner = MigrationRunner(Database())
+    if args.command == "status":
+        print(f"Schema version: {runner.current_version()}")
+        for version, description, _ in runner.pending():
+            print(f"  pending {version}: {description}")
+    elif args.command == "apply":
+        applied = runner.apply()
+        print(f"Schema version: {runner.current_version()} ({len(applied)} applied)")
+    else:
+        problems = runner.check_query_plans()
+        for problem in problems:
+            if problem["table"] is None:
+                print(f"Not checked: {problem['query']} {' '.join(problem['sql'].split())[:200]}")
+            else:
+                print(f"Full scan: {problem['query']} reads all of {problem['table']}")
+                print(f"    {fingerprint(problem['sql'])[:160]}")
+        # Failing calls and statements are bugs of their own; only full scans fail the check
+        full_scans = [problem for problem in problems if problem["table"] is not None]
+        print(f"{runner.statements_checked} distinct statements EXPLAINed. " +
+              ("Every query uses an index." if not full_scans else f"{len(full_scans)} full scan(s) found."))
+        sys.exit(1 if full_scans else 0)
@@ -1,5 +1,6 @@
 import re
 from Database import Database
+from DataVersion import DataVersion
 
 
 class ModificationValidator:
@@ -210,13 +211,11 @@ class ModificationValidator:
             # Insert new item into inventory
             query = "INSERT INTO inventory (item_name, description, category, quantity) VALUES (%s, %s, %s, %s)"
             params = (item_name, description, category, quantity)
-            self.db.execute_query(query, params)
-            self.db.connection.commit()
+            self._write_inventory(query, params)
             
             return True, f"Item '{item_name}' added successfully to inventory"
             
         except Exception as e:
-            self.db.connection.rollback()
             return False, f"Database error while adding item: {str(e)}"
     
     def update_item(self, item_name, new_description=None, new_category=None, new_quantity=None):
@@ -278,13 +277,11 @@ class ModificationValidator:
             query = f"UPDATE inventory SET {', '.join(update_fields)} WHERE item_name = %s"
             params.append(item_name.strip())
             
-            self.db.execute_query(query, tuple(params))
-            self.db.connection.commit()
+            self._write_inventory(query, tuple(params))
             
             return True, f"Item '{item_name}' updated successfully"
             
         except Exception as e:
-            self.db.connection.rollback()
             return False, f"Database error while updating item: {str(e)}"
     
     def update_quantity(self, item_name, new_quantity):
@@ -300,6 +297,17 @@ class ModificationValidator:
         """
         return self.update_item(item_name, new_quantity=new_quantity)
     
+    def _write_inventory(self, query, params):
+        """
+        Runs one inventory change and bumps the inventory version in the same
+        transaction, so cached menus and views notice it. Errors are raised.
+        """
+        track_version = DataVersion.enabled(self.db)
+        with self.db.transaction() as cursor:
+            cursor.execute(query, params)
+            if track_version:
+                DataVersion.bump(cursor, DataVersion.INVENTORY)
+    
     def get_item_details(self, item_name):
         """
         Retrieves details of a specific item from inventory.
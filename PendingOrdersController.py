@@ -27,50 +27,11 @@ class PendingOrdersController:
             orders_data = self.db.execute_query(query)
             
             if not orders_data:
+                self.pending_orders = []
                 return []
             
-            # Clear previous pending orders
-            self.pending_orders = []
-            
-            # Process each pending order
-            for order in orders_data:
-                request_id, customer_id, delivery_address, number_of_people, status, created_at = order
-                
-                # Get items for this order
-                items_query = "SELECT item_name, quantity FROM food_request_items WHERE request_id = %s"
-                items_data = self.db.execute_query(items_query, (request_id,))
-                
-                # Convert items to dictionary
-                items = {}
-                if items_data:
-                    for item_name, quantity in items_data:
-                        items[item_name] = quantity
-                
-                # Get customer information
-                customer_info = self.db.get_user_by_id(customer_id)
-                
-                # Create FoodRequest object with additional customer info
-                food_request = FoodRequest(
-                    request_id=request_id,
-                    customer_id=customer_id,
-                    delivery_address=delivery_address,
-                    number_of_people=number_of_people,
-                    items=items,
-                    status=status,
-                    made=created_at
-                )
-                
-                # Add customer info as attributes for display purposes
-                if customer_info:
-                    food_request.customer_name = f"{customer_info['name']} {customer_info['surname']}"
-                    food_request.customer_email = customer_info['email']
-                    food_request.customer_phone = customer_info['phone']
-                else:
-                    food_request.customer_name = "Unknown Customer"
-                    food_request.customer_email = ""
-                    food_request.customer_phone = ""
-                
-                self.pending_orders.append(food_request)
+            # Items and customers are loaded for all orders at once
+            self.pending_orders = self.process_orders_data(orders_data)
             
             return self.pending_orders
             
@@ -129,10 +90,7 @@ class PendingOrdersController:
             new_status: The new status (e.g., 'Processing', 'Ready', 'Delivered')
         """
         try:
-            query = "UPDATE food_requests SET status = %s WHERE id = %s"
-            params = (new_status, request_id)
-            self.db.execute_query(query, params)
-            self.db.connection.commit()
+            self.db.update_request_status(request_id, new_status)
             
             print(f"Order {request_id} status updated to {new_status}")
             return True
@@ -175,46 +133,45 @@ class PendingOrdersController:
             else:
                 orders_data = self.db.execute_query(base_query)
             
-            return self._process_orders_data(orders_data)
+            return self.process_orders_data(orders_data)
             
         except Exception as e:
             print(f"Error filtering pending orders: {e}")
             return []
     
     def process_orders_data(self, orders_data):
-        """Helper method to process raw order data into FoodRequest objects"""
+        """
+        Helper method to process raw order data into FoodRequest objects.
+        Items and customer details are fetched in batches, so the number of
+        queries does not grow with the number of orders.
+        """
         if not orders_data:
             return []
         
+        # Get items for all orders
+        items_by_request = self.db.get_items_for_requests([order[0] for order in orders_data])
+        
+        # Customers are cached by ID for the lifetime of this refresh
+        customers = self.db.get_users_by_ids([order[1] for order in orders_data])
+        
         processed_orders = []
         
         for order in orders_data:
             request_id, customer_id, delivery_address, number_of_people, status, created_at = order
             
-            # Get items for this order
-            items_query = "SELECT item_name, quantity FROM food_request_items WHERE request_id = %s"
-            items_data = self.db.execute_query(items_query, (request_id,))
-            
-            items = {}
-            if items_data:
-                for item_name, quantity in items_data:
-                    items[item_name] = quantity
-            
-            # Get customer information
-            customer_info = self.db.get_user_by_id(customer_id)
-            
             # Create FoodRequest object
             food_request = FoodRequest(
                 request_id=request_id,
                 customer_id=customer_id,
                 delivery_address=delivery_address,
                 number_of_people=number_of_people,
-                items=items,
+                items=items_by_request.get(request_id, {}),
                 status=status,
                 made=created_at
             )
             
-            # Add customer info
+            # Add customer info as attributes for display purposes
+            customer_info = customers.get(customer_id)
             if customer_info:
                 food_request.customer_name = f"{customer_info['name']} {customer_info['surname']}"
                 food_request.customer_email = customer_info['email']
@@ -0,0 +1,340 @@
+# QueryInstrumentation.py
+from __future__ import annotations
+import atexit
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+
+# Frames from these files are skipped when looking for the code that issued a query
+_INTERNAL_FILES = {"Database.py", "StatisticsRollup.py", "DataVersion.py", "QueryInstrumentation.py", "contextlib.py"}
+# Durations kept per fingerprint for the percentiles (reservoir sample beyond that)
+MAX_SAMPLES = 2048
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACES = re.compile(r"\s+")
+
+slow_query_logger = logging.getLogger("foodshare.slow_queries")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalized form of a statement: literals and placeholders become "?",
+    IN lists and multi-row VALUES collapse to one entry, whitespace is folded.
+    """
+    sql = sql.replace("%s", "?")
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (?+)", sql)
+    sql = _VALUES_LIST.sub(r"\1+", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def calling_site() -> str:
+    """"Class.method" (or "module.function") of the first frame outside the database layer."""
+    frame = sys._getframe(1)
+    while frame is not None and os.path.basename(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        scope = type(owner).__name__
+    else:
+        scope = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{scope}.{frame.f_code.co_name}"
+
+
+class _FingerprintStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.samples: List[float] = []
+        self.callers: Dict[str, int] = {}
+
+    def add(self, duration_ms: float, rows: int, caller: str, rng: random.Random) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.rows += rows
+        self.callers[caller] = self.callers.get(caller, 0) + 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(duration_ms)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self.samples[slot] = duration_ms
+
+
+class QueryInstrumentation:
+    """
+    Optional per-statement instrumentation of the database layer.
+
+    When enabled, Database hands out cursors wrapped in InstrumentedCursor and
+    every statement is timed (execute plus fetch), attributed to its calling
+    controller and aggregated by SQL fingerprint. Statements slower than
+    `slow_query_ms` also go to the "foodshare.slow_queries" logger, and any
+    listener added with add_listener() receives every event. While disabled
+    the only cost is one attribute check per unit of work.
+    """
+
+    enabled = False
+    _collect = False
+    _slow_query_ms: float | None = None
+    _listeners: List[Callable[[Dict[str, Any]], None]] = []
+    _stats: Dict[str, _FingerprintStats] = {}
+    _lock = threading.Lock()
+    _rng = random.Random(0)
+
+    # ----------  CONFIGURATION  ----------
+    @classmethod
+    def enable(cls, collect: bool = True, slow_query_ms: float | None = None,
+               slow_query_log: str | None = None) -> None:
+        """
+        collect aggregates stats in-process; slow_query_ms logs statements at or
+        above the threshold, to slow_query_log (a file) when given.
+        """
+        cls._collect = collect
+        cls._slow_query_ms = slow_query_ms
+        if slow_query_log and not any(getattr(handler, "baseFilename", None) == os.path.abspath(slow_query_log)
+                                      for handler in slow_query_logger.handlers):
+            handler = logging.FileHandler(slow_query_log, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            slow_query_logger.addHandler(handler)
+            slow_query_logger.setLevel(logging.INFO)
+        cls._refresh()
+
+    @classmethod
+    def disable(cls) -> None:
+        cls._collect = False
+        cls._slow_query_ms = None
+        cls._refresh()
+
+    @classmethod
+    def add_listener(cls, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """`listener(event)` is called for every statement while it is registered."""
+        with cls._lock:
+            cls._listeners = cls._listeners + [listener]
+        cls._refresh()
+
+    @classmethod
+    def remove_listener(cls, listener: Callable[[Dict[str, Any]], None]) -> None:
+        with cls._lock:
+            cls._listeners = [registered for registered in cls._listeners if registered is not listener]
+        cls._refresh()
+
+    @classmethod
+    def enable_from_environment(cls) -> None:
+        """
+        FOODSHARE_QUERY_STATS=<file> collects stats and dumps them to the file at exit;
+        FOODSHARE_SLOW_QUERY_MS=<ms> (and FOODSHARE_SLOW_QUERY_LOG=<file>) turns on the slow-query log.
+        """
+        stats_path = os.environ.get("FOODSHARE_QUERY_STATS")
+        slow_query_ms = os.environ.get("FOODSHARE_SLOW_QUERY_MS")
+        if not stats_path and not slow_query_ms:
+            return
+        cls.enable(collect=bool(stats_path),
+                   slow_query_ms=float(slow_query_ms) if slow_query_ms else None,
+                   slow_query_log=os.environ.get("FOODSHARE_SLOW_QUERY_LOG"))
+        if stats_path:
+            atexit.register(cls.dump, stats_path)
+
+    @classmethod
+    def _refresh(cls) -> None:
+        cls.enabled = cls._collect or cls._slow_query_ms is not None or bool(cls._listeners)
+
+    # ----------  RECORDING  ----------
+    @classmethod
+    def wrap(cls, cursor) -> "InstrumentedCursor":
+        return InstrumentedCursor(cursor)
+
+    @classmethod
+    def record(cls, sql: str, duration_ms: float, rows: int, statements: int = 1, params: Any = None) -> None:
+        caller = calling_site()
+        key = fingerprint(sql)
+
+        if cls._collect:
+            with cls._lock:
+                stats = cls._stats.get(key)
+                if stats is None:
+                    stats = cls._stats[key] = _FingerprintStats()
+                stats.add(duration_ms, rows, caller, cls._rng)
+
+        if cls._slow_query_ms is not None and duration_ms >= cls._slow_query_ms:
+            # Parameters are left out on purpose: they may hold passwords and e-mails
+            slow_query_logger.warning(f"{duration_ms:.1f}ms rows={rows} caller={caller} sql={key}")
+
+        if cls._listeners:
+            # Listeners run in-process (e.g. Migrations.py explain), so they also get the parameters
+            event = {"sql": sql, "params": params, "fingerprint": key, "duration_ms": duration_ms, "rows": rows,
+                     "statements": statements, "caller": caller}
+            for listener in cls._listeners:
+                listener(event)
+
+    # ----------  REPORTING  ----------
+    @classmethod
+    def stats(cls) -> List[Dict[str, Any]]:
+        """Aggregated stats per fingerprint, most total time first."""
+        with cls._lock:
+            snapshot = list(cls._stats.items())
+            result = []
+            for key, stats in snapshot:
+                result.append({
+                    "fingerprint": key,
+                    "count": stats.count,
+                    "total_ms": stats.total_ms,
+                    "mean_ms": stats.total_ms / stats.count,
+                    "p50_ms": percentile(stats.samples, 50),
+                    "p95_ms": percentile(stats.samples, 95),
+                    "p99_ms": percentile(stats.samples, 99),
+                    "max_ms": stats.max_ms,
+                    "rows": stats.rows,
+                    "callers": dict(stats.callers),
+                })
+        return sorted(result, key=lambda row: row["total_ms"], reverse=True)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._stats = {}
+
+    @classmethod
+    def dump(cls, path: str | None = None) -> None:
+        """Writes the stats as JSON to `path`, or prints them as a table."""
+        stats = cls.stats()
+        if path:
+            with open(path, "w", encoding="utf-8") as output:
+                json.dump(stats, output, indent=2)
+        else:
+            print_stats(stats)
+
+
+class InstrumentedCursor:
+    """
+    Cursor wrapper that times each statement together with its fetches.
+    A statement is recorded when the next one starts or the cursor closes.
+    """
+
+    def __init__(self, cursor) -> None:
+        self._cursor = cursor
+        self._sql: str | None = None
+        self._params: Any = None
+        self._elapsed = 0.0
+        self._rows = 0
+        self._fetched = False
+        self._statements = 1
+
+    def execute(self, operation, params=(), *args, **kwargs):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._start(operation, params, time.perf_counter() - started, 1)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._finish()
+        seq_params = list(seq_params)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._start(operation, seq_params[0] if seq_params else None, time.perf_counter() - started,
+                        len(seq_params))
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        self._rows += row is not None
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._timed(self._cursor.fetchmany, *args, **kwargs)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    # ----------  HELPERS  ----------
+    def _start(self, operation: str, params: Any, elapsed: float, statements: int) -> None:
+        self._sql = operation
+        self._params = params  # The first parameter set of an executemany
+        self._elapsed = elapsed
+        self._rows = 0
+        self._fetched = False
+        self._statements = statements
+
+    def _timed(self, fetch, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fetch(*args, **kwargs)
+        finally:
+            self._elapsed += time.perf_counter() - started
+            self._fetched = True
+
+    def _finish(self) -> None:
+        if self._sql is None:
+            return
+        rows = self._rows if self._fetched else max(getattr(self._cursor, "rowcount", 0) or 0, 0)
+        QueryInstrumentation.record(self._sql, self._elapsed * 1000, rows, self._statements, self._params)
+        self._sql = None
+
+
+def print_stats(stats: List[Dict[str, Any]], top: int | None = None) -> None:
+    for row in stats[:top]:
+        callers = ", ".join(f"{caller} x{count}" for caller, count in
+                            sorted(row["callers"].items(), key=lambda item: -item[1]))
+        print(f"{row['count']:>7} calls  total={row['total_ms']:.1f}ms  p50={row['p50_ms']:.2f}ms  "
+              f"p95={row['p95_ms']:.2f}ms  p99={row['p99_ms']:.2f}ms  rows={row['rows']}")
+        print(f"        {row['fingerprint'][:160]}")
+        print(f"        from: {callers}")
+
+
+# Print a dump written with FOODSHARE_QUERY_STATS: python QueryInstrumentation.py dump stats.json
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show query statistics dumped by QueryInstrumentation")
+    parser.add_argument("command", choices=["dump"])
+    parser.add_argument("path", help="JSON file written by QueryInstrumentation.dump()")
+    parser.add_argument("--sort", choices=["total_ms", "p95_ms", "p99_ms", "count", "rows"], default="total_ms")
+    parser.add_argument("--top", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8") as source:
+        dumped = json.load(source)
+    print_stats(sorted(dumped, key=lambda row: row[args.sort], reverse=True), args.top)
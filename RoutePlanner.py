@@ -0,0 +1,171 @@
+# RoutePlanner.py
+from __future__ import annotations
+import math
+import random
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from Geocoding import EARTH_RADIUS_KM, Point
+
+TIME_BUDGET = 0.05  # Seconds 2-opt may spend improving a route
+
+
+class RoutePlan:
+    """Visiting order of the stops (their keys), the length of every leg and the total, in km."""
+
+    def __init__(self, order: List[Any], legs: List[float], initial_km: float, elapsed_ms: float,
+                 improved: bool) -> None:
+        self.order = order
+        self.legs = legs  # legs[i] leads to order[i] (from the start, or the previous stop)
+        self.km = sum(legs)
+        self.initial_km = initial_km  # Length of the nearest-neighbour route before 2-opt
+        self.elapsed_ms = elapsed_ms
+        self.improved = improved  # False when the time budget ran out before 2-opt converged
+
+
+def plan_route(stops: Sequence[Tuple[Any, Point]], start: Point | None = None,
+               time_budget: float = TIME_BUDGET) -> RoutePlan:
+    """
+    Order in which to visit `stops` ((key, (lat, lon)) pairs), beginning at
+    `start` if given, otherwise at whichever stop makes the route shortest.
+    The route is open: it ends at the last stop.
+
+    A nearest-neighbour tour is improved with 2-opt (reverse a stretch of the
+    route whenever that shortens it) until no reversal helps or `time_budget`
+    seconds are spent, so the answer always comes back in time, as good as
+    the budget allowed.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    points = [point for _, point in stops]
+    if not points:
+        return RoutePlan([], [], 0.0, 0.0, True)
+
+    # Node 0 is the start; without one it is a virtual node 0 km from every
+    # stop, so the route may begin anywhere
+    distance = _distance_matrix(([start] if start is not None else []) + points)
+    if start is None:
+        size = len(points) + 1
+        distance = [[0.0] * size] + [[0.0] + row for row in distance]
+
+    route = _nearest_neighbour(distance)
+    initial_km = _length(distance, route)
+    improved = _two_opt(distance, route, deadline)
+
+    order = [stops[node - 1][0] for node in route[1:]]
+    legs = [distance[a][b] for a, b in zip(route, route[1:])]
+    return RoutePlan(order, legs, initial_km, (time.perf_counter() - started) * 1000, improved)
+
+
+def _distance_matrix(points: List[Point]) -> List[List[float]]:
+    """
+    Km between every pair of points. Points are projected onto a flat plane
+    around their mean latitude, which is accurate to well under 1% across a
+    city and much cheaper than the haversine formula for n^2 pairs.
+    """
+    km_per_lat = math.pi * EARTH_RADIUS_KM / 180
+    km_per_lon = km_per_lat * math.cos(math.radians(sum(point[0] for point in points) / len(points)))
+    plane = [(point[0] * km_per_lat, point[1] * km_per_lon) for point in points]
+    return [[math.dist(a, b) for b in plane] for a in plane]
+
+
+def _nearest_neighbour(distance: List[List[float]]) -> List[int]:
+    """From node 0, always go to the closest stop not visited yet."""
+    route = [0]
+    unvisited = set(range(1, len(distance)))
+    while unvisited:
+        row = distance[route[-1]]
+        closest = min(unvisited, key=row.__getitem__)
+        unvisited.remove(closest)
+        route.append(closest)
+    return route
+
+
+def _two_opt(distance: List[List[float]], route: List[int], deadline: float) -> bool:
+    """
+    Improve `route` in place by reversing route[i:j + 1] while that shortens
+    it; node 0 stays first. Returns True when no reversal helps any more,
+    False when the deadline stopped the search first.
+    """
+    size = len(route)
+    improving = True
+    while improving:
+        improving = False
+        for i in range(1, size - 1):
+            if time.perf_counter() > deadline:
+                return False
+            a, b = route[i - 1], route[i]
+            row_a, row_b = distance[a], distance[b]
+            for j in range(i + 1, size):
+                c = route[j]
+                # The route is open: reversing up to the last stop drops no outgoing edge
+                if j + 1 < size:
+                    d = route[j + 1]
+                    delta = row_a[c] + row_b[d] - row_a[b] - distance[c][d]
+                else:
+                    delta = row_a[c] - row_a[b]
+                if delta < -1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    a, b = route[i - 1], route[i]
+                    row_a, row_b = distance[a], distance[b]
+                    improving = True
+    return True
+
+
+def _length(distance: List[List[float]], route: List[int]) -> float:
+    return sum(distance[a][b] for a, b in zip(route, route[1:]))
+
+
+def benchmark(sizes: Sequence[int] = (10, 25, 50, 100, 200), repeat: int = 3, time_budget: float = TIME_BUDGET,
+              seed: int = 42) -> List[Dict[str, float]]:
+    """
+    Route length and planning time for random stops over ~10 x 10 km, per
+    number of stops: in the given order, nearest neighbour only, and after 2-opt.
+    """
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        for _ in range(repeat):
+            stops = [(key, (38.20 + rng.random() * 0.09, 21.68 + rng.random() * 0.115)) for key in range(size)]
+            start = (38.2466, 21.7346)
+            plan = plan_route(stops, start, time_budget)
+            as_given = sum(_distance_matrix([a, b])[0][1] for a, b in zip([start] + [p for _, p in stops],
+                                                                           [p for _, p in stops]))
+            results.append({"stops": size, "given_km": as_given, "nearest_km": plan.initial_km,
+                            "two_opt_km": plan.km, "ms": plan.elapsed_ms, "converged": plan.improved})
+    return results
+
+
+# Route commands: python RoutePlanner.py bench [--budget S] | python RoutePlanner.py route AGENT_ID [--start ADDRESS]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Plan the visiting order of an agent's deliveries")
+    parser.add_argument("command", choices=["bench", "route"])
+    parser.add_argument("agent_id", nargs="?", type=int)
+    parser.add_argument("--start", help="Address (or 'lat,lon') the agent starts from")
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET, help="Seconds 2-opt may spend")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(f"{'stops':>5} {'given km':>9} {'NN km':>8} {'2-opt km':>9} {'ms':>8}  converged")
+        for result in benchmark(repeat=args.repeat, time_budget=args.budget):
+            print(f"{result['stops']:>5} {result['given_km']:>9.1f} {result['nearest_km']:>8.1f} "
+                  f"{result['two_opt_km']:>9.1f} {result['ms']:>8.1f}  {result['converged']}")
+    else:
+        from DeliveryController import DeliveryController
+
+        if args.agent_id is None:
+            parser.error("route needs an AGENT_ID")
+        start: Any = args.start
+        if start and "," in start and all(part.strip().replace(".", "", 1).lstrip("-").isdigit()
+                                          for part in start.split(",")):
+            start = tuple(float(part) for part in start.split(","))
+        route = DeliveryController().plan_route(args.agent_id, start, args.budget)
+        for stop in route["stops"]:
+            print(f"{stop['stop']:>3}. delivery #{stop['delivery_id']:<6} {stop['leg_km']:5.2f} km  {stop['address']}")
+        for stop in route["unlocated"]:
+            print(f"  ?  delivery #{stop['delivery_id']:<6} address not found: {stop['address']}")
+        print(f"{route['km']:.2f} km in total (nearest neighbour alone: {route['initial_km']:.2f} km), "
+              f"planned in {route['ms']:.1f}ms")
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Dict, Any
 from Database import Database
 from Report import Report
+from StatisticsRollup import StatisticsRollup
 
 
 class StatisticsReportController:
@@ -23,16 +24,42 @@ class StatisticsReportController:
             q += " WHERE " + where
         return self._single_value(q)
 
+    def _grouped_counts(self, table: str, column: str) -> Dict[Any, int]:
+        """Μία σάρωση του πίνακα: {τιμή στήλης: πλήθος γραμμών}."""
+        rows = self.db.execute_query(
+            f"SELECT {column}, COUNT(*) FROM {table} GROUP BY {column}") or []
+        counts: Dict[Any, int] = {}
+        for value, count in rows:
+            # The WHERE filters compared case-insensitively ('Pending' == 'pending')
+            key = value.lower() if isinstance(value, str) else value
+            counts[key] = counts.get(key, 0) + int(count)
+        return counts
+
+    def _rollup_counts(self) -> tuple:
+        """(ρόλοι, καταστάσεις αιτημάτων, δωρεές) από τον πίνακα stats_daily."""
+        totals = StatisticsRollup(self.db).totals()
+        roles = {m[len("users.role."):]: v for m, v in totals.items() if m.startswith("users.role.")}
+        statuses = {m[len("requests.status."):]: v for m, v in totals.items() if m.startswith("requests.status.")}
+        return roles, statuses, totals.get("donations", 0)
+
     def collect_kpis(self) -> Dict[str, Any]:
+        if StatisticsRollup.enabled(self.db):
+            # Incrementally maintained counters: O(days) instead of table scans
+            roles, statuses, donations = self._rollup_counts()
+        else:
+            # One grouped scan per table instead of one COUNT(*) per KPI
+            roles = self._grouped_counts("users", "role")
+            statuses = self._grouped_counts("food_requests", "status")
+            donations = self._count("donations")
         return {
-            "users_total":        self._count("users"),
-            "customers":          self._count("users", "role='customer'"),
-            "donors":             self._count("users", "role='donor'"),
-            "dropoff_agents":     self._count("users", "role='drop_off_agent'"),
-            "pending_requests":   self._count("food_requests", "status='pending'"),
-            "in_transit_requests":self._count("food_requests", "status='in_transit'"),
-            "completed_requests": self._count("food_requests", "status='completed'"),
-            "donations":          self._count("donations"),
+            "users_total":        sum(roles.values()),
+            "customers":          roles.get("customer", 0),
+            "donors":             roles.get("donor", 0),
+            "dropoff_agents":     roles.get("dropoffagent", 0),
+            "pending_requests":   statuses.get("pending", 0),
+            "in_transit_requests":statuses.get("in_transit", 0),
+            "completed_requests": statuses.get("completed", 0),
+            "donations":          donations,
         }
 
     def build_report(self, admin_id: int) -> Report | None:
@@ -81,7 +108,6 @@ class StatisticsReportController:
         params = (report.author, report.description, report.content, report.date_created)
         try:
             self.db.execute_query(sql, params)
-            self.db.connection.commit()
             return True
         except Exception as err:
             print("[StatisticsReportController] save_report failed:", err)
@@ -0,0 +1,156 @@
+# StatisticsRollup.py
+from __future__ import annotations
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Tuple
+
+
+class StatisticsRollup:
+    """
+    Per-day counters kept in the `stats_daily` table.
+
+    Status and role metrics are stored as flows: a request that moves from
+    pending to in_transit adds -1 to `requests.status.pending` and +1 to
+    `requests.status.in_transit` on the day of the change, so summing a metric
+    over all days gives the current count. The write paths in Database keep
+    the table up to date once `backfill()` has created it.
+    """
+
+    TABLE = "stats_daily"
+    _enabled: bool | None = None  # Cached "does the table exist" check
+
+    def __init__(self, db) -> None:
+        self.db = db
+
+    # ----------  WRITE PATH  ----------
+    @classmethod
+    def enabled(cls, db) -> bool:
+        """True once the rollup table exists (checked once per process)."""
+        if cls._enabled is None:
+            cls._enabled = db.backend.table_exists(db, cls.TABLE)
+        return cls._enabled
+
+    @classmethod
+    def record(cls, cursor, deltas: Dict[str, int], day: Any = None) -> None:
+        """Add `deltas` ({metric: change}) to the counters of `day` (default: today)."""
+        day = cls._day(day)
+        cls._upsert(cursor, [(day, metric, value) for metric, value in deltas.items() if value])
+
+    @classmethod
+    def _upsert(cls, cursor, rows) -> None:
+        if rows:
+            from Database import Database  # Imported here because Database imports this module
+            cursor.executemany(Database.backend.upsert_increment(cls.TABLE, ("day", "metric"), "value"), rows)
+
+    @staticmethod
+    def status_change(prefix: str, old: str | None, new: str | None) -> Dict[str, int]:
+        """Deltas for one row moving from status `old` to `new`."""
+        deltas: Dict[str, int] = {}
+        if old is not None:
+            deltas[f"{prefix}.{old.lower()}"] = -1
+        if new is not None:
+            key = f"{prefix}.{new.lower()}"
+            deltas[key] = deltas.get(key, 0) + 1
+        return deltas
+
+    # ----------  READ PATH  ----------
+    def totals(self) -> Dict[str, int]:
+        """Current value of every metric (one row per day and metric is read)."""
+        rows = self.db.execute_query(
+            f"SELECT metric, SUM(value) FROM {self.TABLE} GROUP BY metric") or []
+        return {metric: int(value) for metric, value in rows}
+
+    def daily(self, start: Any, end: Any) -> Dict[date, Dict[str, int]]:
+        """{day: {metric: value}} for the days between `start` and `end` inclusive."""
+        rows = self.db.execute_query(
+            f"SELECT day, metric, value FROM {self.TABLE} WHERE day BETWEEN %s AND %s ORDER BY day",
+            (self._day(start), self._day(end))) or []
+        result: Dict[date, Dict[str, int]] = {}
+        for day, metric, value in rows:
+            result.setdefault(day, {})[metric] = int(value)
+        return result
+
+    # ----------  MAINTENANCE  ----------
+    def create_table(self) -> None:
+        self.db.execute_query(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                day DATE NOT NULL,
+                metric VARCHAR(64) NOT NULL,
+                value INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, metric)
+            )
+        """)
+
+    def backfill(self) -> int:
+        """Rebuild the whole table from the base tables. Returns the number of rows written."""
+        self.create_table()
+        rows = list(self._base_rows())
+        with self.db.transaction() as cursor:
+            cursor.execute(f"DELETE FROM {self.TABLE}")
+            self._upsert(cursor, rows)
+        StatisticsRollup._enabled = True
+        return len(rows)
+
+    def check_consistency(self) -> Dict[str, Tuple[int, int]]:
+        """Metrics whose rollup total differs from the base tables: {metric: (rollup, base)}."""
+        expected: Dict[str, int] = {}
+        for _, metric, value in self._base_rows():
+            expected[metric] = expected.get(metric, 0) + value
+
+        actual = {metric: value for metric, value in self.totals().items() if value}
+        return {
+            metric: (actual.get(metric, 0), expected.get(metric, 0))
+            for metric in set(expected) | set(actual)
+            if actual.get(metric, 0) != expected.get(metric, 0)
+        }
+
+    def _base_rows(self) -> Iterable[Tuple[date, str, int]]:
+        """(day, metric, value) rows recomputed from the base tables."""
+        queries = (
+            ("requests.status", "SELECT DATE(created_at), LOWER(status), COUNT(*) FROM food_requests "
+                                "GROUP BY DATE(created_at), LOWER(status)"),
+            ("users.role", "SELECT DATE(created_at), role, COUNT(*) FROM users GROUP BY DATE(created_at), role"),
+            # deliveries has no timestamp column, so current counts land on the backfill day
+            ("deliveries.status", "SELECT NULL, LOWER(status), COUNT(*) FROM deliveries GROUP BY LOWER(status)"),
+        )
+        for prefix, sql in queries:
+            for day, key, count in self.db.execute_query(sql) or []:
+                yield self._day(day), f"{prefix}.{key or 'unknown'}", int(count)
+
+        for day, count in self.db.execute_query(
+                "SELECT DATE(created_at), COUNT(*) FROM food_requests GROUP BY DATE(created_at)") or []:
+            yield self._day(day), "requests.created", int(count)
+
+        for day, count in self.db.execute_query(
+                "SELECT DATE(donation_date), COUNT(*) FROM donations GROUP BY DATE(donation_date)") or []:
+            yield self._day(day), "donations", int(count)
+
+    @staticmethod
+    def _day(value: Any) -> date:
+        if value is None:
+            return date.today()
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+# Maintenance commands: python StatisticsRollup.py backfill|check
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from Database import Database
+
+    parser = argparse.ArgumentParser(description="Maintain the daily statistics rollup")
+    parser.add_argument("command", choices=["backfill", "check"])
+    args = parser.parse_args()
+
+    rollup = StatisticsRollup(Database())
+    if args.command == "backfill":
+        print(f"Rollup rebuilt: {rollup.backfill()} rows")
+    else:
+        mismatches = rollup.check_consistency()
+        for metric, (actual, expected) in sorted(mismatches.items()):
+            print(f"{metric}: rollup={actual} base={expected}")
+        print("Rollup is consistent." if not mismatches else f"{len(mismatches)} metric(s) drifted.")
+        sys.exit(1 if mismatches else 0)
@@ -23,6 +23,20 @@ SET time_zone = "+00:00";
 
 -- --------------------------------------------------------
 
+--
+-- Δομή πίνακα για τον πίνακα `deliveries`
+--
+
+CREATE TABLE `deliveries` (
+  `id` int(11) NOT NULL,
+  `request_id` int(11) NOT NULL,
+  `agent_id` int(11) NOT NULL,
+  `status` varchar(20) NOT NULL DEFAULT 'pending',
+  `eta` datetime DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Δομή πίνακα για τον πίνακα `donations`
 --
@@ -163,6 +177,12 @@ INSERT INTO `users` (`id`, `name`, `surname`, `username`, `email`, `phone`, `pas
 -- Ευρετήρια για άχρηστους πίνακες
 --
 
+--
+-- Ευρετήρια για πίνακα `deliveries`
+--
+ALTER TABLE `deliveries`
+  ADD PRIMARY KEY (`id`);
+
 --
 -- Ευρετήρια για πίνακα `donations`
 --
@@ -207,6 +227,12 @@ ALTER TABLE `users`
 -- AUTO_INCREMENT για άχρηστους πίνακες
 --
 
+--
+-- AUTO_INCREMENT για πίνακα `deliveries`
+--
+ALTER TABLE `deliveries`
+  MODIFY `id` int(11) NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT για πίνακα `donations`
 --
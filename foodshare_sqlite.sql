@@ -0,0 +1,74 @@
+-- FoodShare schema for the embedded SQLite engine.
+-- Mirrors foodshare.sql; text columns compared in queries use NOCASE to
+-- match the case-insensitive utf8mb4_general_ci collation of the MySQL dump.
+
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(50) NOT NULL,
+  surname VARCHAR(50) NOT NULL,
+  username VARCHAR(255) DEFAULT NULL,
+  email VARCHAR(100) NOT NULL COLLATE NOCASE UNIQUE,
+  phone VARCHAR(255) DEFAULT NULL,
+  password VARCHAR(255) NOT NULL,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  role VARCHAR(20) NOT NULL DEFAULT 'customer' COLLATE NOCASE
+    CHECK (role IN ('admin', 'customer', 'donor', 'dropoffagent'))
+);
+
+CREATE TABLE IF NOT EXISTS inventory (
+  item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  item_name VARCHAR(40) NOT NULL COLLATE NOCASE UNIQUE,
+  description TEXT DEFAULT NULL,
+  category VARCHAR(20) DEFAULT NULL COLLATE NOCASE,
+  quantity INTEGER DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS food_requests (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  customer_id INTEGER DEFAULT NULL,
+  delivery_address VARCHAR(255) DEFAULT NULL,
+  number_of_people INTEGER DEFAULT NULL,
+  status VARCHAR(50) DEFAULT NULL COLLATE NOCASE,
+  delivery_status VARCHAR(50) DEFAULT 'Not Delivered/Pending' COLLATE NOCASE,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS food_request_items (
+  request_id INTEGER DEFAULT NULL REFERENCES food_requests (id),
+  item_name VARCHAR(100) DEFAULT NULL COLLATE NOCASE,
+  quantity INTEGER DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS donations (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  donor_id INTEGER NOT NULL REFERENCES users (id),
+  item_name VARCHAR(100) NOT NULL,
+  quantity INTEGER NOT NULL,
+  donation_date DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reports (
+  report_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  request_id INTEGER NOT NULL REFERENCES food_requests (id) ON DELETE CASCADE,
+  customer_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  description TEXT NOT NULL,
+  reported_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS deliveries (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  request_id INTEGER NOT NULL,
+  agent_id INTEGER NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'pending' COLLATE NOCASE,
+  eta DATETIME DEFAULT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_food_requests_customer_status ON food_requests (customer_id, status);
+CREATE INDEX IF NOT EXISTS idx_food_requests_status_created ON food_requests (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_food_requests_delivery_status ON food_requests (delivery_status);
+CREATE INDEX IF NOT EXISTS idx_food_request_items_request ON food_request_items (request_id);
+CREATE INDEX IF NOT EXISTS idx_donations_donor ON donations (donor_id);
+CREATE INDEX IF NOT EXISTS idx_deliveries_agent ON deliveries (agent_id);
+CREATE INDEX IF NOT EXISTS idx_deliveries_request ON deliveries (request_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_category_quantity ON inventory (category, quantity);
+CREATE INDEX IF NOT EXISTS idx_users_role ON users (role);
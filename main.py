@@ -1,5 +1,13 @@
+from Database import Database
+from Migrations import MigrationRunner
+from QueryInstrumentation import QueryInstrumentation
 from GUI.LoginScreen import LoginScreen
 
 if __name__ == "__main__":
+    QueryInstrumentation.enable_from_environment() # Off unless FOODSHARE_QUERY_STATS / FOODSHARE_SLOW_QUERY_MS are set
+    MigrationRunner(Database()).apply() # Bring the schema up to date before the GUI starts
     login_screen = LoginScreen()
-    login_screen.display()
\ No newline at end of file
+    try:
+        login_screen.display()
+    finally:
+        Database.shutdown() # Screens share one connection; it is closed only once the GUI has exited
\ No newline at end of file
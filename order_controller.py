@@ -15,15 +15,13 @@ class OrderController:
     # Submit an order to the database
     def submit_order(self, customer_id, number_of_people, delivery_address, items):
         if(self.validate_info(number_of_people, delivery_address, items)):
-            # Check availability of items via Database
-            # If items are available, create a new order
-            if self.db.check_availability(items):
-                # Create a new Food Request
-                food_request = FoodRequest(customer_id, delivery_address, number_of_people, None, items)
-                self.db.save_order(food_request) # Save the order to the database
+            # Create a new Food Request
+            food_request = FoodRequest(customer_id, delivery_address, number_of_people, None, items)
+            # Reserve the items and save the order in one transaction
+            if self.db.reserve_order(food_request) is not None:
                 success_screen = ConfirmedOrderScreen(self.root) # Create a new Confirmed Order screen
                 success_screen.show_confirmed_order(food_request) # Show the order confirmation screen
-                self.db.update_quantities(items) # Update the inventory in the database
+                items.clear() # Clear the cart
             else:
                 print("Items not available")
                 # Show a warning screen if items are not available